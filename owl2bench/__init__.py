@@ -4,14 +4,28 @@ Public API:
 - InstanceConfig, Range
 - InstanceGenerator
 - Loader: WorldLoader, OntologyLoadError, MappingError
+- Verification: WorldVerifier, ParallelWorldVerifier, IncrementalWorldVerifier,
+  SampledWorldVerifier, SampleReport, Problem, ProblemKind, RelationshipError
 - Models: University, College, Department, Program, Course, Publication,
-  Person, Student, Employee, ResearchGroup, World
+  Person, Student, Employee, ResearchGroup, World, WorldObserver, WorldIndex
+- Indexes: PartOfClosure, TypeIndex, UnknownClassError, EntityNumbering, EntitySet,
+  HometownIndex, StatisticsCatalog
+- Reasoning: Materializer, MaterializationReport
 """
 
 from .config import InstanceConfig, Range
 from .generator import InstanceGenerator
 from .loader import WorldLoader, OntologyLoadError, MappingError
-from .verifier import WorldVerifier, RelationshipError
+from .verifier import (
+    WorldVerifier,
+    ParallelWorldVerifier,
+    IncrementalWorldVerifier,
+    SampledWorldVerifier,
+    SampleReport,
+    RelationshipError,
+    Problem,
+    ProblemKind,
+)
 from .models import (
     University,
     College,
@@ -24,7 +38,15 @@ from .models import (
     Employee,
     ResearchGroup,
     World,
+    WorldObserver,
+    WorldIndex,
 )
+from .closure import PartOfClosure
+from .type_index import TypeIndex, UnknownClassError
+from .entity_set import EntityNumbering, EntitySet, NumberingMismatchError
+from .hometown_index import HometownIndex
+from .catalog import StatisticsCatalog
+from .materializer import Materializer, MaterializationReport
 
 __all__ = [
     "InstanceConfig",
@@ -34,6 +56,12 @@ __all__ = [
     "OntologyLoadError",
     "MappingError",
     "WorldVerifier",
+    "ParallelWorldVerifier",
+    "IncrementalWorldVerifier",
+    "SampledWorldVerifier",
+    "SampleReport",
+    "Problem",
+    "ProblemKind",
     "RelationshipError",
     "University",
     "College",
@@ -46,4 +74,16 @@ __all__ = [
     "Employee",
     "ResearchGroup",
     "World",
+    "WorldObserver",
+    "WorldIndex",
+    "PartOfClosure",
+    "TypeIndex",
+    "UnknownClassError",
+    "EntityNumbering",
+    "EntitySet",
+    "NumberingMismatchError",
+    "HometownIndex",
+    "StatisticsCatalog",
+    "Materializer",
+    "MaterializationReport",
 ]
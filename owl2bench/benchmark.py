@@ -0,0 +1,641 @@
+from __future__ import annotations
+import argparse
+import json
+import math
+import multiprocessing
+import resource
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from enum import Enum
+from multiprocessing.connection import Connection as PipeConnection
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from krrood.ormatic.dao import to_dao
+from rdflib import Graph
+from sqlalchemy import Connection, Engine, create_engine, inspect
+from sqlalchemy.orm import Session
+
+from . import eql_queries, sql_queries
+from .catalog import StatisticsCatalog
+from .config import ConfigurationError
+from .eql_queries import EQLQuery, PreparedQuery
+from .forked_pool import forked_pool, with_worker_state
+from .loader import WorldLoader, load_graph
+from .materializer import MaterializationReport, Materializer
+from .models import World
+from .orm.ormatic_interface import Base
+from .partitioned import PartitionedEvaluation
+from .query_profile import OperatorProfile, profile
+from .results import ResultMode, write_chunked
+from .sparql_queries import OWLProfile, SPARQLQuery, all_queries, suite
+from .sql_queries import SQLQuery
+
+
+class ExistingSchemaError(Exception):
+    """
+    Raised when a world would be stored into a database that already holds ORMatic tables.
+    """
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """
+    Returns the nearest-rank percentile of the values.
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_memory_bytes(who: int = resource.RUSAGE_SELF) -> int:
+    """
+    Returns the peak resident set size of the current process, or with ``RUSAGE_CHILDREN`` the
+    largest one of its terminated child processes.
+    """
+    peak = resource.getrusage(who).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def peak_memory_of_run() -> int:
+    """
+    Returns the peak resident set size of the current process and the worker processes it ran
+    queries in, whichever is larger.
+    """
+    return max(peak_memory_bytes(), peak_memory_bytes(resource.RUSAGE_CHILDREN))
+
+
+class Outcome(Enum):
+    """
+    How the executions of a benchmark query ended.
+    """
+
+    COMPLETED = "completed"
+    TIMEOUT = "timeout"
+    """
+    The query exceeded its wall-clock budget and its worker was killed.
+    """
+    OUT_OF_MEMORY = "out_of_memory"
+    """
+    The query exceeded its memory budget.
+    """
+    FAILED = "failed"
+    """
+    The worker of the query ended without a result for another reason.
+    """
+
+
+@dataclass
+class QueryMeasurement:
+    """
+    The latencies and result count of one benchmark query.
+
+    :param number: The number of the query
+    :param result_count: Number of distinct answers returned by the last iteration, None if the
+        engine streamed answers without removing duplicates
+    :param latencies: Seconds taken by each measured iteration, empty unless the query completed
+    :param preparation_seconds: Seconds taken once to prepare the query before the first execution
+    :param outcome: How the executions ended
+    :param peak_memory_bytes: Peak resident set size of the process that executed the query, taken
+        after its executions. A worker process inherits the dataset, so its peak includes it. Zero if
+        the worker was lost before reporting.
+    :param produced: Number of answers the engine streamed in the last iteration including
+        duplicates, set instead of ``result_count`` when it differs in meaning
+    """
+
+    number: int
+    result_count: Optional[int]
+    latencies: List[float]
+    preparation_seconds: float = 0.0
+    outcome: Outcome = Outcome.COMPLETED
+    peak_memory_bytes: int = 0
+    produced: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "number": self.number,
+            "outcome": self.outcome.name,
+            "result_count": self.result_count,
+            "preparation_seconds": self.preparation_seconds,
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "latencies": self.latencies,
+        }
+        if self.result_count is None:
+            del result["result_count"]
+        if self.produced is not None:
+            result["produced"] = self.produced
+        if self.latencies:
+            result.update(
+                {
+                    "min": min(self.latencies),
+                    "mean": sum(self.latencies) / len(self.latencies),
+                    "p50": percentile(self.latencies, 50),
+                    "p90": percentile(self.latencies, 90),
+                    "p99": percentile(self.latencies, 99),
+                    "max": max(self.latencies),
+                }
+            )
+        return result
+
+
+@dataclass
+class BenchmarkReport:
+    """
+    The measurements of one benchmark run over an ontology.
+    """
+
+    ontology: str
+    load_seconds: float
+    warmup: int
+    iterations: int
+    queries: List[QueryMeasurement] = field(default_factory=list)
+    peak_memory_bytes: int = 0
+    """
+    Peak resident set size of the benchmark process and of the worker processes queries ran in.
+    """
+    catalog: Optional[StatisticsCatalog] = None
+    """
+    Statistics of the queried dataset, if they were collected.
+    """
+    materialization: Optional[MaterializationReport] = None
+    """
+    The cost of materializing the inferences over the dataset, if it was measured.
+    """
+    profiles: List[OperatorProfile] = field(default_factory=list)
+    """
+    The operator profiles of the EQL queries, if they were explained.
+    """
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "ontology": self.ontology,
+            "load_seconds": self.load_seconds,
+            "warmup": self.warmup,
+            "iterations": self.iterations,
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "queries": [measurement.to_dict() for measurement in self.queries],
+        }
+        if self.catalog is not None:
+            result["catalog"] = self.catalog.to_dict()
+        if self.materialization is not None:
+            result["materialization"] = self.materialization.to_dict()
+        if self.profiles:
+            result["profiles"] = [operator_profile.to_dict() for operator_profile in self.profiles]
+        return result
+
+
+def measure(
+    number: int, run: Callable[[], int], warmup: int, iterations: int, isolation: Optional[Isolation] = None
+) -> QueryMeasurement:
+    """
+    Runs a query ``warmup`` times unmeasured and ``iterations`` times measured.
+
+    :param run: Executes the query and returns the number of results
+    :param isolation: The budget of a worker process to run the query in, or None to run it in this process
+    """
+    if iterations < 1:
+        raise ConfigurationError("A benchmark needs at least one measured iteration.")
+    if isolation is not None:
+        return isolation.measure(number, run, warmup, iterations)
+    for _ in range(warmup):
+        run()
+    latencies = []
+    result_count = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result_count = run()
+        latencies.append(time.perf_counter() - start)
+    return QueryMeasurement(number, result_count, latencies, peak_memory_bytes=peak_memory_bytes())
+
+
+@dataclass(frozen=True)
+class Isolation:
+    """
+    Measures every query in its own forked worker process with a wall-clock and memory budget, so
+    a runaway query is recorded as an outcome instead of stalling the whole run. The worker
+    inherits the loaded dataset and the prepared queries from the benchmark process, so isolation
+    does not reload them.
+
+    :param timeout: Seconds a query may take for its warmup and measured executions together, unlimited if None
+    :param memory_bytes: Address space limit of a worker including the inherited dataset, unlimited if None
+    """
+
+    timeout: Optional[float] = None
+    memory_bytes: Optional[int] = None
+
+    def measure(self, number: int, run: Callable[[], int], warmup: int, iterations: int) -> QueryMeasurement:
+        """
+        Like ``measure``, but in a worker that is killed when it exceeds the timeout and that fails
+        to allocate memory beyond the limit.
+        """
+        context = multiprocessing.get_context("fork")
+        receiver, sender = context.Pipe(duplex=False)
+        worker = context.Process(target=self._work, args=(sender, number, run, warmup, iterations))
+        worker.start()
+        sender.close()
+        with receiver:
+            if not receiver.poll(self.timeout):
+                worker.kill()
+                worker.join()
+                return QueryMeasurement(number, 0, [], outcome=Outcome.TIMEOUT)
+            try:
+                measurement = receiver.recv()
+            except EOFError:
+                measurement = QueryMeasurement(number, 0, [], outcome=self._outcome_of_loss(worker))
+        worker.join()
+        return measurement
+
+    def _work(self, sender: PipeConnection, number: int, run: Callable[[], int], warmup: int, iterations: int) -> None:
+        if self.memory_bytes is not None:
+            resource.setrlimit(resource.RLIMIT_AS, (self.memory_bytes, self.memory_bytes))
+        try:
+            measurement = measure(number, run, warmup, iterations)
+        except MemoryError:
+            measurement = QueryMeasurement(number, 0, [], outcome=Outcome.OUT_OF_MEMORY)
+        sender.send(measurement)
+        sender.close()
+
+    @staticmethod
+    def _outcome_of_loss(worker: BaseProcess) -> Outcome:
+        """
+        Returns the outcome of a worker that ended without sending a measurement. A worker killed
+        with SIGKILL was most likely stopped by the kernel's out of memory killer.
+        """
+        worker.join()
+        return Outcome.OUT_OF_MEMORY if worker.exitcode == -signal.SIGKILL else Outcome.FAILED
+
+
+def check_result_directory(mode: ResultMode, result_directory: Optional[Path]) -> None:
+    if mode is ResultMode.WRITE and result_directory is None:
+        raise ConfigurationError("Writing the answers needs a result directory.")
+
+
+def check_partitioning(
+    partitioned: Optional[PartitionedEvaluation], isolation: Optional[Isolation], processes: int
+) -> None:
+    """
+    Checks that the workers of a partitioned evaluation, which belong to the benchmark process,
+    are used by the benchmark process only.
+    """
+    if partitioned is not None and (isolation is not None or processes > 1):
+        raise ConfigurationError("Partitioned evaluation needs the queries to be measured in the benchmark process.")
+
+
+def measure_in_worker(measure_query: Callable[[int], QueryMeasurement], index: int) -> QueryMeasurement:
+    return measure_query(index)
+
+
+def schedule(measure_query: Callable[[int], QueryMeasurement], count: int, processes: int) -> List[QueryMeasurement]:
+    """
+    Measures the queries of a suite, spreading them over forked worker processes if there is more
+    than one. The workers inherit the dataset the function closes over instead of receiving a copy,
+    and the measurements are returned in query order.
+
+    :param measure_query: Measures the query with the given index in the suite
+    :param count: Number of queries in the suite
+    :param processes: Number of worker processes, 1 to measure in this process
+    """
+    if processes == 1:
+        return [measure_query(index) for index in range(count)]
+    with forked_pool(processes, measure_query) as pool:
+        return list(pool.map(with_worker_state(measure_in_worker), range(count)))
+
+
+@dataclass(frozen=True)
+class SPARQLBenchmark:
+    """
+    Executes the OWL2Bench SPARQL queries with RDFLib over an ontology that is loaded once.
+
+    :param warmup: Number of unmeasured executions per query
+    :param iterations: Number of measured executions per query
+    :param queries: The queries to execute
+    :param isolation: The budget of a worker process per query, or None to measure in this process
+    :param processes: Number of processes measuring queries concurrently against the loaded ontology.
+        Latencies stay comparable to a sequential run only while every process has a core of its own.
+    :param mode: How the answers are consumed
+    :param result_directory: The directory the answers are written to in ``ResultMode.WRITE``
+    """
+
+    warmup: int = 1
+    iterations: int = 5
+    queries: Sequence[SPARQLQuery] = tuple(all_queries)
+    isolation: Optional[Isolation] = None
+    processes: int = 1
+    mode: ResultMode = ResultMode.SET
+    result_directory: Optional[Path] = None
+
+    def run(self, ontology: str | Path) -> BenchmarkReport:
+        """
+        Loads the ontology and measures the queries over it. Every query is parsed once before it
+        is measured and the parsing is reported as its preparation time.
+        """
+        check_result_directory(self.mode, self.result_directory)
+        start = time.perf_counter()
+        graph = load_graph(ontology)
+        report = BenchmarkReport(str(ontology), time.perf_counter() - start, self.warmup, self.iterations)
+        for query in self.queries:
+            query.prepare()
+        report.queries = schedule(partial(self.measure, graph), len(self.queries), self.processes)
+        report.peak_memory_bytes = peak_memory_of_run()
+        return report
+
+    def measure(self, graph: Graph, index: int) -> QueryMeasurement:
+        query = self.queries[index]
+        measurement = measure(
+            query.number, lambda: self.execute(graph, query), self.warmup, self.iterations, self.isolation
+        )
+        measurement.preparation_seconds = query.prepare().preparation_seconds
+        return measurement
+
+    def execute(self, graph: Graph, query: SPARQLQuery) -> int:
+        if self.mode is ResultMode.SET:
+            return len(graph.query(query.prepare().query))
+        if self.mode is ResultMode.ITERATE:
+            return sum(1 for _ in query.rows(graph))
+        if self.mode is ResultMode.COUNT:
+            return query.count(graph)
+        return write_chunked(query.rows(graph), self.result_directory / f"q{query.number}.tsv")
+
+
+@dataclass(frozen=True)
+class EQLBenchmark:
+    """
+    Executes the EQL counterparts of the benchmark queries over a world. Every query is prepared
+    once, so the iterations measure evaluation only and the construction of the query is
+    reported as its preparation time.
+
+    :param warmup: Number of unmeasured executions per query
+    :param iterations: Number of measured executions per query
+    :param queries: The queries to execute
+    :param use_joins: Whether to evaluate relation memberships by following the relations
+    :param isolation: The budget of a worker process per query, or None to measure in this process
+    :param processes: Number of processes measuring queries concurrently against the world.
+        Latencies stay comparable to a sequential run only while every process has a core of its own.
+    :param mode: How the answers are consumed
+    :param result_directory: The directory the answers are written to in ``ResultMode.WRITE``
+    :param explain: Whether to profile the operators of every query in one more, unmeasured evaluation
+    :param partitioned: Evaluates every query in worker processes on slices of its outer variable, or
+        None to evaluate it in the measuring process. The workers are started once per run and
+        need the queries to be measured in this process. Counting answers is never partitioned.
+    """
+
+    warmup: int = 1
+    iterations: int = 5
+    queries: Sequence[EQLQuery] = tuple(eql_queries.all_queries)
+    use_joins: bool = True
+    isolation: Optional[Isolation] = None
+    processes: int = 1
+    mode: ResultMode = ResultMode.SET
+    result_directory: Optional[Path] = None
+    explain: bool = False
+    partitioned: Optional[PartitionedEvaluation] = None
+
+    def run(self, world: World) -> BenchmarkReport:
+        check_result_directory(self.mode, self.result_directory)
+        check_partitioning(self.partitioned, self.isolation, self.processes)
+        report = BenchmarkReport("world", 0.0, self.warmup, self.iterations)
+        prepared_queries = [query.prepare(world) for query in self.queries]
+        with nullcontext() if self.partitioned is None else self.partitioned.pool(prepared_queries) as pool:
+            report.queries = schedule(partial(self.measure, world, pool), len(self.queries), self.processes)
+        if self.explain:
+            report.profiles = [profile(query.prepare(world), self.use_joins) for query in self.queries]
+        report.peak_memory_bytes = peak_memory_of_run()
+        return report
+
+    def measure(self, world: World, pool: Optional[ProcessPoolExecutor], index: int) -> QueryMeasurement:
+        """
+        :param pool: The workers of the partitioned evaluation, if there is one
+        """
+        query = self.queries[index]
+        prepared = query.prepare(world)
+        measurement = measure(
+            query.sparql_query.number,
+            lambda: self.execute(prepared, pool),
+            self.warmup,
+            self.iterations,
+            self.isolation,
+        )
+        measurement.preparation_seconds = prepared.construction_seconds
+        if self.mode is not ResultMode.SET:
+            measurement.produced, measurement.result_count = measurement.result_count, None
+        return measurement
+
+    def execute(self, prepared: PreparedQuery, pool: Optional[ProcessPoolExecutor] = None) -> int:
+        if self.mode is ResultMode.SET:
+            return len(set(self.answers(prepared, pool)))
+        if self.mode is ResultMode.ITERATE:
+            return sum(1 for _ in self.answers(prepared, pool))
+        if self.mode is ResultMode.COUNT:
+            return prepared.count(self.use_joins)
+        path = self.result_directory / f"q{prepared.query.sparql_query.number}.tsv"
+        return write_chunked(self.answers(prepared, pool), path)
+
+    def answers(self, prepared: PreparedQuery, pool: Optional[ProcessPoolExecutor] = None) -> Iterator[Tuple[str, ...]]:
+        if self.partitioned is None:
+            return prepared.answers(self.use_joins)
+        return self.partitioned.answers(prepared, self.use_joins, pool)
+
+
+@dataclass(frozen=True)
+class SQLBenchmark:
+    """
+    Executes the SQL translations of the benchmark queries over a world stored in a database
+    through the ORMatic schema. Works with every database SQLAlchemy supports recursive common
+    table expressions for, such as SQLite and PostgreSQL.
+
+    :param warmup: Number of unmeasured executions per query
+    :param iterations: Number of measured executions per query
+    :param queries: The queries to execute
+    :param reset: Whether to drop existing ORMatic tables of the database before storing the world
+    """
+
+    warmup: int = 1
+    iterations: int = 5
+    queries: Sequence[SQLQuery] = tuple(sql_queries.all_queries)
+    reset: bool = False
+
+    def run(self, world: World, engine: Engine) -> BenchmarkReport:
+        """
+        Stores the world in the database of the engine and measures the queries over it.
+        The time taken to store the world is reported as load time.
+        """
+        start = time.perf_counter()
+        self.store(world, engine, self.reset)
+        report = BenchmarkReport(
+            engine.url.render_as_string(hide_password=True),
+            time.perf_counter() - start,
+            self.warmup,
+            self.iterations,
+            catalog=world.index(StatisticsCatalog),
+        )
+        with engine.connect() as connection:
+            for query in self.queries:
+                report.queries.append(
+                    measure(
+                        query.sparql_query.number,
+                        lambda: self.execute(connection, query),
+                        self.warmup,
+                        self.iterations,
+                    )
+                )
+        report.peak_memory_bytes = peak_memory_of_run()
+        return report
+
+    @staticmethod
+    def store(world: World, engine: Engine, reset: bool = False) -> None:
+        """
+        Creates the ORMatic tables and inserts the world.
+
+        :param reset: Whether to drop the ORMatic tables first if they exist
+        """
+        if reset:
+            Base.metadata.drop_all(engine)
+        existing = set(inspect(engine).get_table_names()) & set(Base.metadata.tables)
+        if existing:
+            raise ExistingSchemaError(
+                f"The database already contains the tables {sorted(existing)}, pass reset to drop them."
+            )
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(to_dao(world))
+            session.commit()
+
+    @staticmethod
+    def execute(connection: Connection, query: SQLQuery) -> int:
+        return sum(1 for _ in connection.execute(query.statement))
+
+
+def positive_integer(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"{text} is not a positive integer")
+    return value
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Runs the OWL2Bench queries and reports latencies as JSON.")
+    parser.add_argument("ontology", type=Path, help="The OWL/RDF file to query.")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--iterations", type=positive_integer, default=5)
+    parser.add_argument("--queries", type=int, nargs="+", help="Numbers of the queries to run, all by default.")
+    parser.add_argument(
+        "--profile",
+        choices=[profile.name for profile in OWLProfile],
+        help="Run only the queries applicable to this OWL 2 profile.",
+    )
+    parser.add_argument(
+        "--processes", type=positive_integer, default=1, help="Number of processes measuring queries concurrently."
+    )
+    parser.add_argument(
+        "--query-processes",
+        type=positive_integer,
+        default=1,
+        help="Number of processes evaluating each --eql query on slices of its outer variable.",
+    )
+    parser.add_argument("--output", type=Path, help="File to write the JSON report to, stdout by default.")
+    parser.add_argument(
+        "--result-mode",
+        choices=[mode.value for mode in ResultMode],
+        default=ResultMode.SET.value,
+        help="How the answers of the RDFLib and EQL queries are consumed.",
+    )
+    parser.add_argument(
+        "--result-directory", type=Path, help="Directory to write the answers to with --result-mode write."
+    )
+    parser.add_argument(
+        "--timeout", type=float, help="Seconds each query may take in its own worker process before it is killed."
+    )
+    parser.add_argument(
+        "--memory-limit", type=positive_integer, help="Bytes of address space each query may use in its worker process."
+    )
+    parser.add_argument(
+        "--catalog", action="store_true", help="Include the statistics catalog of the ontology in the report."
+    )
+    parser.add_argument(
+        "--materialize",
+        choices=[profile.name for profile in OWLProfile],
+        help="Materialize the inferences the queries of this profile need and report their cost per rule.",
+    )
+    parser.add_argument(
+        "--database-uri",
+        help="Run the SQL translations over the ontology stored in this database instead of querying it with RDFLib.",
+    )
+    parser.add_argument(
+        "--eql",
+        action="store_true",
+        help="Run the EQL counterparts over the ontology loaded as a world instead of querying it with RDFLib.",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Include the operator profile of every --eql query, taken in one more evaluation, in the report.",
+    )
+    parser.add_argument(
+        "--reset-database",
+        action="store_true",
+        help="Drop the ORMatic tables of the --database-uri database before storing the ontology.",
+    )
+    parsed = parser.parse_args(arguments)
+    if parsed.explain and not parsed.eql:
+        parser.error("--explain requires --eql")
+    if parsed.query_processes > 1 and (
+        parsed.processes > 1 or parsed.timeout is not None or parsed.memory_limit is not None
+    ):
+        parser.error("--query-processes cannot be combined with --processes, --timeout or --memory-limit")
+    isolation = None
+    if parsed.timeout is not None or parsed.memory_limit is not None:
+        isolation = Isolation(parsed.timeout, parsed.memory_limit)
+    profile = None if parsed.profile is None else OWLProfile[parsed.profile]
+    numbers = {query.number for query in suite(profile, parsed.queries)}
+    mode = ResultMode(parsed.result_mode)
+
+    if parsed.eql:
+        queries = [query for query in eql_queries.all_queries if query.sparql_query.number in numbers]
+        start = time.perf_counter()
+        world = WorldLoader().load(parsed.ontology)
+        load_seconds = time.perf_counter() - start
+        benchmark = EQLBenchmark(
+            parsed.warmup,
+            parsed.iterations,
+            queries,
+            isolation=isolation,
+            processes=parsed.processes,
+            mode=mode,
+            result_directory=parsed.result_directory,
+            explain=parsed.explain,
+            partitioned=None if parsed.query_processes == 1 else PartitionedEvaluation(parsed.query_processes),
+        )
+        report = benchmark.run(world)
+        report.ontology, report.load_seconds = str(parsed.ontology), load_seconds
+    elif parsed.database_uri is None:
+        queries = suite(profile, parsed.queries)
+        benchmark = SPARQLBenchmark(
+            parsed.warmup, parsed.iterations, queries, isolation, parsed.processes, mode, parsed.result_directory
+        )
+        report = benchmark.run(parsed.ontology)
+        world = None
+    else:
+        queries = [query for query in sql_queries.all_queries if query.sparql_query.number in numbers]
+        world = WorldLoader().load(parsed.ontology)
+        benchmark = SQLBenchmark(parsed.warmup, parsed.iterations, queries, parsed.reset_database)
+        report = benchmark.run(world, create_engine(parsed.database_uri))
+    if world is None and (parsed.catalog or parsed.materialize is not None):
+        world = WorldLoader().load(parsed.ontology)
+    if parsed.catalog:
+        report.catalog = world.index(StatisticsCatalog)
+    if parsed.materialize is not None:
+        report.materialization = Materializer.for_profile(OWLProfile[parsed.materialize]).materialize(world)[1]
+    text = json.dumps(report.to_dict(), indent=2)
+    if parsed.output is None:
+        print(text)
+    else:
+        parsed.output.write_text(text, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
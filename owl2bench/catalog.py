@@ -0,0 +1,174 @@
+from __future__ import annotations
+from collections import Counter
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Any, Dict, Optional, Set, Tuple, Type
+
+from krrood.entity_query_language.predicate import Symbol
+
+from .models import (
+    World,
+    WorldIndex,
+    University,
+    College,
+    Department,
+    Course,
+    Person,
+    PERSON_RELATIONS,
+)
+
+PERSON_VALUES: Tuple[str, ...] = ("hometown", "first_name", "last_name")
+"""
+The person attributes whose distinct values are counted.
+"""
+
+
+@dataclass(frozen=True)
+class FanOut:
+    """
+    A containment relation whose number of children per parent is tracked.
+
+    :param parent_type: The containing type
+    :param child_type: The contained type
+    :param relation: The list attribute of the parent holding the children
+    """
+
+    parent_type: Type[Symbol]
+    child_type: Type[Symbol]
+    relation: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.parent_type.__name__}.{self.relation}"
+
+    def count(self, parent: Symbol) -> int:
+        return len(attrgetter(self.relation)(parent))
+
+
+FAN_OUTS: Tuple[FanOut, ...] = (
+    FanOut(University, College, "colleges"),
+    FanOut(College, Department, "departments"),
+    FanOut(Department, Course, "courses"),
+)
+
+
+@dataclass
+class StatisticsCatalog(WorldIndex):
+    """
+    Statistics of a ``World`` for cardinality estimation and dataset reports.
+
+    Contains entity counts per type, degree histograms of the person relations, distinct value
+    counts of person attributes and fan-out histograms of the containment relations.
+    """
+
+    entity_counts: Counter = field(default_factory=Counter)
+    degree_histograms: Dict[str, Counter] = field(
+        default_factory=lambda: {relation: Counter() for relation in PERSON_RELATIONS}
+    )
+    values: Dict[str, Set[str]] = field(
+        default_factory=lambda: {attribute: set() for attribute in PERSON_VALUES}
+    )
+    children: Dict[str, Counter] = field(
+        default_factory=lambda: {fan_out.name: Counter() for fan_out in FAN_OUTS}
+    )
+    """
+    Number of children per parent identifier for every fan-out.
+    """
+    persons: Set[str] = field(default_factory=set)
+    """
+    Identifiers of the persons counted in the degree histograms.
+    """
+
+    @classmethod
+    def from_world(cls, world: World) -> StatisticsCatalog:
+        """
+        Collects the statistics in one pass over the world and keeps them updated on additions.
+        """
+        catalog = cls()
+        for collection in (
+            world.universities,
+            world.colleges,
+            world.departments,
+            world.research_groups,
+            world.programs,
+            world.courses,
+            world.publications,
+            world.students,
+            world.employees,
+        ):
+            for entity in collection:
+                catalog.entity_counts[type(entity).__name__] += 1
+                catalog._count_children(entity)
+        for person in world.persons:
+            catalog._add_person(person)
+        world.subscribe(catalog)
+        return catalog
+
+    def distinct_values(self, attribute: str) -> int:
+        """
+        Returns the number of distinct values of a person attribute.
+        """
+        return len(self.values[attribute])
+
+    def fan_out_histogram(self, name: str) -> Counter:
+        """
+        Returns how many parents have a given number of children in the named fan-out.
+        """
+        return Counter(self.children[name].values())
+
+    def entity_added(self, entity: Symbol, parent: Optional[Symbol]) -> None:
+        if isinstance(entity, Person):
+            self._add_person(entity)
+            return
+        self.entity_counts[type(entity).__name__] += 1
+        for fan_out in FAN_OUTS:
+            if isinstance(entity, fan_out.parent_type):
+                self.children[fan_out.name].setdefault(entity.identifier, 0)
+            if isinstance(parent, fan_out.parent_type) and isinstance(entity, fan_out.child_type):
+                self.children[fan_out.name][parent.identifier] += 1
+
+    def relation_added(self, person: Person, relation: str, other: Person) -> None:
+        if person.identifier not in self.persons:
+            return
+        histogram = self.degree_histograms[relation]
+        degree = len(attrgetter(relation)(person))
+        histogram[degree - 1] -= 1
+        if histogram[degree - 1] == 0:
+            del histogram[degree - 1]
+        histogram[degree] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns a JSON serializable representation of the catalog. Histogram keys are strings,
+        so the representation survives a JSON round trip unchanged.
+        """
+        return {
+            "entity_counts": dict(self.entity_counts),
+            "degree_histograms": {
+                relation: self._sorted(histogram)
+                for relation, histogram in self.degree_histograms.items()
+            },
+            "distinct_values": {attribute: self.distinct_values(attribute) for attribute in self.values},
+            "fan_out_histograms": {
+                name: self._sorted(self.fan_out_histogram(name)) for name in self.children
+            },
+        }
+
+    def _add_person(self, person: Person) -> None:
+        self.persons.add(person.identifier)
+        self.entity_counts[Person.__name__] += 1
+        for relation in PERSON_RELATIONS:
+            self.degree_histograms[relation][len(attrgetter(relation)(person))] += 1
+        for attribute in PERSON_VALUES:
+            value = attrgetter(attribute)(person)
+            if value is not None:
+                self.values[attribute].add(value)
+
+    def _count_children(self, entity: Symbol) -> None:
+        for fan_out in FAN_OUTS:
+            if isinstance(entity, fan_out.parent_type):
+                self.children[fan_out.name][entity.identifier] = fan_out.count(entity)
+
+    @staticmethod
+    def _sorted(histogram: Counter) -> Dict[str, int]:
+        return {str(key): count for key, count in sorted(histogram.items())}
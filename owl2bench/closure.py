@@ -0,0 +1,212 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from krrood.entity_query_language.predicate import Symbol
+
+from .models import World, WorldIndex, University, College, Department, ResearchGroup
+
+Organization = Union[University, College, Department, ResearchGroup]
+
+
+@dataclass(frozen=True)
+class IntervalLabel:
+    """
+    A closed interval of positions reserved for an organization and all of its parts.
+
+    :param begin: Position of the organization itself
+    :param end: Last position reserved for the organization and its parts
+    """
+
+    begin: int
+    end: int
+
+    def encloses(self, other: IntervalLabel) -> bool:
+        """
+        Returns whether the other interval lies strictly inside this one.
+        """
+        return self.begin < other.begin and other.end <= self.end
+
+
+@dataclass
+class ClosureEntry:
+    """
+    An organization tracked by a ``PartOfClosure`` together with its interval label.
+    """
+
+    organization: Organization
+    whole: Optional[ClosureEntry]
+    parts: List[ClosureEntry] = field(default_factory=list)
+    label: IntervalLabel = IntervalLabel(0, 0)
+    next_free: int = 0
+    """
+    First position inside the label that is not yet reserved for a part.
+    """
+
+    @property
+    def size(self) -> int:
+        """
+        The number of organizations in the subtree rooted at this entry.
+        """
+        return 1 + sum(part.size for part in self.parts)
+
+
+@dataclass
+class PartOfClosure(WorldIndex):
+    """
+    Materialized transitive closure of ``isPartOf`` over universities, colleges, departments
+    and research groups.
+
+    Every organization carries an interval label such that an organization is part of another one
+    exactly when its interval is enclosed by the other's. Labels reserve free space proportional
+    to the subtree size, so organizations added later are placed without touching the rest of
+    the closure. An exhausted interval relabels only the innermost enclosing subtree that still
+    has room.
+
+    :param slack: Free positions reserved per organization for parts added later
+    """
+
+    slack: int = 4
+    entries: Dict[str, ClosureEntry] = field(default_factory=dict)
+    roots: List[ClosureEntry] = field(default_factory=list)
+    next_root: int = 0
+    """
+    First position that is not reserved by any root.
+    """
+    relabels: int = 0
+    """
+    Number of times the labels of the whole closure were recomputed.
+    """
+
+    @classmethod
+    def from_world(cls, world: World, slack: int = 4) -> PartOfClosure:
+        """
+        Builds the closure of all organizations in the world and keeps it updated on additions.
+        """
+        closure = cls(slack=slack)
+        for organization in chain(
+            world.universities, world.colleges, world.departments, world.research_groups
+        ):
+            if organization.identifier not in closure.entries:
+                closure._attach_tree(organization, None)
+        closure._relabel()
+        world.subscribe(closure)
+        return closure
+
+    def is_part_of(self, part: Organization, whole: Organization) -> bool:
+        """
+        Returns whether ``part`` is a direct or transitive part of ``whole``.
+        """
+        part_entry = self.entries.get(part.identifier)
+        whole_entry = self.entries.get(whole.identifier)
+        if part_entry is None or whole_entry is None:
+            return False
+        return whole_entry.label.encloses(part_entry.label)
+
+    def wholes(self, part: Organization) -> Iterator[Organization]:
+        """
+        Yields every organization that ``part`` is transitively part of, innermost first.
+        """
+        entry = self.entries.get(part.identifier)
+        whole = entry.whole if entry is not None else None
+        while whole is not None:
+            yield whole.organization
+            whole = whole.whole
+
+    def pairs(self) -> Iterator[Tuple[Organization, Organization]]:
+        """
+        Yields every ``(part, whole)`` pair of the transitive closure.
+        """
+        for entry in self.entries.values():
+            for whole in self.wholes(entry.organization):
+                yield entry.organization, whole
+
+    def entity_added(self, entity: Symbol, parent: Optional[Symbol]) -> None:
+        if not isinstance(entity, (University, College, Department, ResearchGroup)):
+            return
+        if entity.identifier in self.entries:
+            return
+        whole = self.entries.get(parent.identifier) if parent is not None else None
+        entry = self._attach_tree(entity, whole)
+        if whole is None:
+            self._place_root(entry)
+        elif whole.next_free + self._width(entry) - 1 <= whole.label.end:
+            self._label_tree(entry, whole.next_free)
+            whole.next_free = entry.label.end + 1
+        else:
+            self._relabel_around(whole)
+
+    def _attach(self, organization: Organization, whole: Optional[ClosureEntry]) -> ClosureEntry:
+        entry = ClosureEntry(organization=organization, whole=whole)
+        self.entries[organization.identifier] = entry
+        if whole is None:
+            self.roots.append(entry)
+        else:
+            whole.parts.append(entry)
+        return entry
+
+    def _attach_tree(self, organization: Organization, whole: Optional[ClosureEntry]) -> ClosureEntry:
+        entry = self._attach(organization, whole)
+        for part in self._direct_parts(organization):
+            if part.identifier not in self.entries:
+                self._attach_tree(part, entry)
+        return entry
+
+    @staticmethod
+    def _direct_parts(organization: Organization) -> Sequence[Organization]:
+        if isinstance(organization, University):
+            return organization.colleges
+        if isinstance(organization, College):
+            return organization.departments
+        if isinstance(organization, Department):
+            return organization.research_groups
+        return []
+
+    def _relabel_around(self, entry: ClosureEntry) -> None:
+        """
+        Relabels the subtree of the innermost organization enclosing ``entry`` whose interval
+        still fits its parts. If not even the root fits, the root's subtree is moved behind all
+        other roots, so the rest of the closure is never touched.
+        """
+        while not self._fits(entry) and entry.whole is not None:
+            entry = entry.whole
+        if self._fits(entry):
+            self._label_parts(entry)
+        else:
+            self._place_root(entry)
+
+    def _fits(self, entry: ClosureEntry) -> bool:
+        return entry.label.end - entry.label.begin + 1 >= self._width(entry)
+
+    def _relabel(self) -> None:
+        self.relabels += 1
+        self.next_root = 0
+        for root in self.roots:
+            self._place_root(root)
+
+    def _place_root(self, entry: ClosureEntry) -> None:
+        self.next_root = self._label_tree(entry, self.next_root) + 1
+
+    def _label_tree(self, entry: ClosureEntry, begin: int) -> int:
+        """
+        Labels the subtree rooted at ``entry`` starting at ``begin`` and returns its last position.
+        """
+        entry.label = IntervalLabel(begin, begin + self._width(entry) - 1)
+        self._label_parts(entry)
+        return entry.label.end
+
+    def _label_parts(self, entry: ClosureEntry) -> None:
+        """
+        Labels the parts of ``entry`` inside its current interval.
+        """
+        position = entry.label.begin + 1
+        for part in entry.parts:
+            position = self._label_tree(part, position) + 1
+        entry.next_free = position
+
+    def _width(self, entry: ClosureEntry) -> int:
+        """
+        Returns the number of positions a fresh labeling reserves for the subtree rooted at ``entry``.
+        """
+        return 1 + sum(self._width(part) for part in entry.parts) + self.slack * entry.size
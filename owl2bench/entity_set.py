@@ -0,0 +1,162 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List
+
+from krrood.entity_query_language.predicate import Symbol
+
+from .models import World
+
+
+class NumberingMismatchError(Exception):
+    """
+    Raised when entity sets over different numberings are combined.
+    """
+
+
+@dataclass
+class EntityNumbering:
+    """
+    Dense integer numbering of individuals, keyed by their identifiers.
+
+    Individuals that are not numbered yet receive the next free number on first use.
+    """
+
+    numbers: Dict[str, int] = field(default_factory=dict)
+    individuals: List[Symbol] = field(default_factory=list)
+
+    @classmethod
+    def from_world(cls, world: World) -> EntityNumbering:
+        """
+        Numbers every individual of the world, grouped by collection.
+        """
+        numbering = cls()
+        for individual in chain(
+            world.universities,
+            world.colleges,
+            world.departments,
+            world.research_groups,
+            world.programs,
+            world.courses,
+            world.publications,
+            world.persons,
+        ):
+            numbering.number(individual)
+        return numbering
+
+    def number(self, individual: Symbol) -> int:
+        """
+        Returns the number of the individual, assigning a new one if necessary.
+        """
+        number = self.numbers.get(individual.identifier)
+        if number is None:
+            number = len(self.individuals)
+            self.numbers[individual.identifier] = number
+            self.individuals.append(individual)
+        return number
+
+    def individual(self, number: int) -> Symbol:
+        return self.individuals[number]
+
+    def entity_set(self, individuals: Iterable[Symbol]) -> EntitySet:
+        """
+        Creates an entity set containing the individuals.
+        """
+        return EntitySet.from_numbers(self, (self.number(individual) for individual in individuals))
+
+    def __len__(self) -> int:
+        return len(self.individuals)
+
+
+@dataclass
+class EntitySet:
+    """
+    A set of individuals stored as a bitset over an ``EntityNumbering``.
+
+    The bits are kept in a byte array, so testing or adding a member touches a single byte. Set
+    algebra and cardinality convert the bytes to one integer and operate on whole machine words
+    instead of hashing elements.
+    """
+
+    numbering: EntityNumbering = field(repr=False)
+    bits: bytearray = field(default_factory=bytearray)
+    """
+    Bit ``n % 8`` of byte ``n // 8`` is set if the individual numbered ``n`` is a member.
+    """
+
+    @classmethod
+    def from_numbers(cls, numbering: EntityNumbering, numbers: Iterable[int]) -> EntitySet:
+        """
+        Creates an entity set from individual numbers in linear time.
+        """
+        entity_set = cls(numbering)
+        entity_set.update(numbers)
+        return entity_set
+
+    @classmethod
+    def from_integer(cls, numbering: EntityNumbering, bits: int) -> EntitySet:
+        return cls(numbering, bytearray(bits.to_bytes(bits.bit_length() // 8 + 1, "little")))
+
+    def add(self, individual: Symbol) -> None:
+        self._set(self.numbering.number(individual))
+
+    def update(self, numbers: Iterable[int]) -> None:
+        """
+        Adds the individuals with the given numbers.
+        """
+        for number in numbers:
+            self._set(number)
+
+    def union(self, other: EntitySet) -> EntitySet:
+        return EntitySet.from_integer(self.numbering, self._integer() | self._integer_of(other))
+
+    def intersection(self, other: EntitySet) -> EntitySet:
+        return EntitySet.from_integer(self.numbering, self._integer() & self._integer_of(other))
+
+    def difference(self, other: EntitySet) -> EntitySet:
+        return EntitySet.from_integer(self.numbering, self._integer() & ~self._integer_of(other))
+
+    def numbers(self) -> Iterator[int]:
+        """
+        Yields the numbers of the members in ascending order.
+        """
+        for byte_index, byte in enumerate(self.bits):
+            while byte:
+                lowest = byte & -byte
+                yield (byte_index << 3) + lowest.bit_length() - 1
+                byte ^= lowest
+
+    def __or__(self, other: EntitySet) -> EntitySet:
+        return self.union(other)
+
+    def __and__(self, other: EntitySet) -> EntitySet:
+        return self.intersection(other)
+
+    def __sub__(self, other: EntitySet) -> EntitySet:
+        return self.difference(other)
+
+    def __contains__(self, individual: Symbol) -> bool:
+        number = self.numbering.numbers.get(individual.identifier)
+        if number is None or number >> 3 >= len(self.bits):
+            return False
+        return self.bits[number >> 3] >> (number & 7) & 1 == 1
+
+    def __iter__(self) -> Iterator[Symbol]:
+        return (self.numbering.individual(number) for number in self.numbers())
+
+    def __len__(self) -> int:
+        return self._integer().bit_count()
+
+    def _set(self, number: int) -> None:
+        byte_index = number >> 3
+        if byte_index >= len(self.bits):
+            self.bits.extend(bytes(byte_index + 1 - len(self.bits)))
+        self.bits[byte_index] |= 1 << (number & 7)
+
+    def _integer(self) -> int:
+        return int.from_bytes(self.bits, "little")
+
+    def _integer_of(self, other: EntitySet) -> int:
+        if other.numbering is not self.numbering:
+            raise NumberingMismatchError("Entity sets must share the same numbering to be combined.")
+        return other._integer()
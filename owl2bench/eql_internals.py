@@ -0,0 +1,114 @@
+"""
+The one place that reaches into the internals of krrood's entity query language.
+
+EQL offers no public way to inspect an expression, to observe the evaluation of its operators or
+to narrow the domain of a variable after it was built. Profiling queries and partitioning their
+evaluation need all three, so this module reads and replaces the private attributes that provide
+them. These attributes may change with any release of krrood, which is why the functions below
+only run against the version they were written for.
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager
+from functools import cache
+from importlib.metadata import version
+from typing import Any, Callable, Iterable, Iterator, List, Sequence
+
+from krrood.entity_query_language.hashed_data import HashedIterable
+from krrood.entity_query_language.symbolic import SymbolicExpression, Variable
+
+PINNED_KRROOD_VERSION = "1.1.4"
+"""
+The krrood version whose internals this module accesses.
+"""
+
+Evaluation = Callable[..., Iterable[Any]]
+
+
+class UnsupportedKrroodVersionError(Exception):
+    """
+    Raised when the internals of EQL are accessed with a krrood version other than the pinned one.
+    """
+
+
+@cache
+def require_pinned_krrood() -> None:
+    installed = version("krrood")
+    if installed != PINNED_KRROOD_VERSION:
+        raise UnsupportedKrroodVersionError(
+            f"Profiling and partitioning EQL queries requires krrood {PINNED_KRROOD_VERSION}, found {installed}."
+        )
+
+
+def operator_name(operator: SymbolicExpression) -> str:
+    """
+    Returns the kind of an operator together with what it operates on.
+    """
+    require_pinned_krrood()
+    return f"{type(operator).__name__} {operator._name_}"
+
+
+def operator_children(operator: SymbolicExpression) -> List[SymbolicExpression]:
+    """
+    Returns the operators an operator draws its input from.
+    """
+    require_pinned_krrood()
+    return operator._children_
+
+
+def operators(expression: SymbolicExpression) -> List[SymbolicExpression]:
+    """
+    Returns the expression and every operator below it, each once even if it has several parents.
+    """
+    require_pinned_krrood()
+    return list({id(operator): operator for operator in [expression] + expression._descendants_}.values())
+
+
+@contextmanager
+def wrapped_evaluations(
+    expression: SymbolicExpression, wrap: Callable[[SymbolicExpression, Evaluation], Evaluation]
+) -> Iterator[None]:
+    """
+    Evaluates every operator of the expression through ``wrap(operator, evaluation)`` while the
+    context is active, and restores the evaluations of the operators on exit.
+    """
+    wrapped = operators(expression)
+    for operator in wrapped:
+        operator._evaluate__ = wrap(operator, operator._evaluate__)
+    try:
+        yield
+    finally:
+        for operator in wrapped:
+            del operator._evaluate__
+
+
+def bound_variable(expression: SymbolicExpression) -> Variable:
+    """
+    Returns the variable whose binding determines the value of an expression such as ``student.person``.
+    """
+    require_pinned_krrood()
+    while not isinstance(expression, Variable):
+        expression = expression._child_
+    return expression
+
+
+def variable_domain(variable: Variable) -> List[Any]:
+    """
+    Returns the entities a variable ranges over.
+    """
+    require_pinned_krrood()
+    return variable._domain_.unwrapped_values
+
+
+@contextmanager
+def restricted_domain(variable: Variable, domain: Sequence[Any]) -> Iterator[None]:
+    """
+    Lets the variable range over ``domain`` instead of its own domain while the context is active.
+    """
+    require_pinned_krrood()
+    original = variable._domain_
+    variable._domain_ = HashedIterable(domain)
+    try:
+        yield
+    finally:
+        variable._domain_ = original
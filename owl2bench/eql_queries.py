@@ -1,18 +1,170 @@
-from dataclasses import dataclass
-from typing import Callable
+from __future__ import annotations
+import time
+from dataclasses import dataclass, field, replace
+from operator import attrgetter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Type
 
 from krrood.entity_query_language.entity import let, contains, set_of, an
-from krrood.entity_query_language.symbolic import (
-    An,
-    ResultQuantifier,
-    SymbolicExpression,
-    symbolic_mode,
-)
+from krrood.entity_query_language.predicate import Symbol
+from krrood.entity_query_language.symbolic import SymbolicExpression, symbolic_mode
 
-from owl2bench import World, Person
+from .models import (
+    World,
+    WorldIndex,
+    University,
+    College,
+    Department,
+    ResearchGroup,
+    Person,
+    Student,
+    Employee,
+)
+from .eql_internals import bound_variable, restricted_domain, variable_domain
+from .results import ResultDigest
 from . import sparql_queries
 
 
+class UnsupportedQueryError(Exception):
+    """
+    Raised when a benchmark query asks for facts that the ``World`` model does not represent.
+    """
+
+
+def identity(entity: Symbol) -> Symbol:
+    return entity
+
+
+def subject_and_other(subject: Symbol, other: Symbol) -> Tuple[Symbol, ...]:
+    return subject, other
+
+
+@dataclass(frozen=True)
+class RelationJoin:
+    """
+    A membership condition ``contains(holder.<relation>, other)`` between two variables, evaluated
+    by following the relation of every holder instead of testing every pair of holder and other.
+    Takes time linear in the number of related pairs rather than in the product of the domains.
+
+    The holders are the subjects themselves or, for a chain of memberships such as
+    ``contains(university.colleges, college), contains(college.departments, department)``,
+    the entities reached from a subject by following the ``path`` of part lists.
+
+    :param subjects: The domain of the subject variable
+    :param relation: The list attribute of the holders holding the related entities
+    :param others: The domain of the related variable
+    :param answer: Returns the selected entities for a subject and a related entity
+    :param path: The part lists followed from a subject down to the holders of the relation
+    """
+
+    subjects: Sequence[Symbol]
+    relation: str
+    others: Sequence[Symbol]
+    answer: Callable[[Symbol, Symbol], Tuple[Symbol, ...]] = subject_and_other
+    path: Tuple[Callable[[Symbol], List[Symbol]], ...] = ()
+
+    def answers(self) -> Iterator[Tuple[Symbol, ...]]:
+        for subject, other in self.pairs():
+            yield self.answer(subject, other)
+
+    def count(self) -> int:
+        """
+        Returns the number of answers without building them.
+        """
+        return sum(1 for _ in self.pairs())
+
+    def pairs(self) -> Iterator[Tuple[Symbol, Symbol]]:
+        """
+        Yields every subject together with every entity of the other domain related to it.
+        """
+        others = {id(other) for other in self.others}
+        related = attrgetter(self.relation)
+        for subject in self.subjects:
+            for holder in self.holders(subject):
+                for other in related(holder):
+                    if id(other) in others:
+                        yield subject, other
+
+    def holders(self, subject: Symbol) -> List[Symbol]:
+        holders = [subject]
+        for parts in self.path:
+            holders = [part for holder in holders for part in parts(holder)]
+        return holders
+
+
+@dataclass
+class ConjunctivePattern:
+    """
+    An EQL query for one conjunctive pattern together with the variables it selects.
+    """
+
+    selected: Tuple[Symbol, ...]
+    """
+    The selected variables in the order of the answer tuples.
+    """
+
+    expression: SymbolicExpression
+    """
+    The query over all answers of the pattern.
+    """
+
+    join: Optional[RelationJoin] = None
+    """
+    The relation membership the pattern consists of, if it selects exactly the pairs of that relation.
+    """
+
+    @classmethod
+    def select(
+        cls, selected: Tuple[Symbol, ...], *conditions: SymbolicExpression, join: Optional[RelationJoin] = None
+    ) -> ConjunctivePattern:
+        """
+        Builds the pattern selecting ``selected`` under the conditions. Has to be called in symbolic mode.
+        """
+        return cls(selected, an(set_of(selected, *conditions)), join)
+
+    def answers(self, use_join: bool = True) -> Iterator[Tuple[Symbol, ...]]:
+        """
+        Returns the selected entities of every answer.
+
+        :param use_join: Whether to evaluate the join of the pattern, if it has one, instead of the expression
+        """
+        if use_join and self.join is not None:
+            return self.join.answers()
+        return (tuple(answer[variable] for variable in self.selected) for answer in self.expression.evaluate())
+
+    def count(self, use_join: bool = True) -> int:
+        """
+        Returns the number of answers without selecting their entities.
+
+        :param use_join: Whether to evaluate the join of the pattern, if it has one, instead of the expression
+        """
+        if use_join and self.join is not None:
+            return self.join.count()
+        return sum(1 for _ in self.expression.evaluate())
+
+    def outer_domain(self, use_join: bool = True) -> List[Symbol]:
+        """
+        Returns the domain of the outer variable, the variable the first selected one is bound by.
+        Every answer binds it to exactly one entity, so disjoint parts of its domain partition the answers.
+
+        :param use_join: Whether the pattern is evaluated by its join, if it has one, whose subjects are the domain
+        """
+        if use_join and self.join is not None:
+            return list(self.join.subjects)
+        return variable_domain(bound_variable(self.selected[0]))
+
+    def answers_within(self, outer_domain: Sequence[Symbol], use_join: bool = True) -> Iterator[Tuple[Symbol, ...]]:
+        """
+        Yields the answers whose outer variable is bound to an entity of ``outer_domain``.
+
+        :param use_join: Whether to evaluate the join of the pattern, if it has one, instead of the expression
+        """
+        if use_join and self.join is not None:
+            yield from replace(self.join, subjects=outer_domain).answers()
+            return
+        with restricted_domain(bound_variable(self.selected[0]), outer_domain):
+            yield from self.answers(use_join)
+
+
 @dataclass
 class EQLQuery:
 
@@ -21,21 +173,364 @@ class EQLQuery:
     The sparql query this represents.
     """
 
-    query: Callable[[World], SymbolicExpression]
+    query: Callable[[World], List[ConjunctivePattern]]
+    """
+    A function that takes a World and returns the conjunctive patterns whose union of answers
+    answers the sparql query.
+    """
+
+    def results(self, world: World) -> Set[Tuple[str, ...]]:
+        """
+        Returns the distinct answers as tuples of identifiers in the order of the selected variables.
+        """
+        return self.prepare(world).results()
+
+    def prepare(self, world: World) -> PreparedQuery:
+        """
+        Returns the patterns of this query for the world, built on first use and reused until
+        an entity is added to the world.
+        """
+        return world.index(PreparedQueries).prepared(self)
+
+
+@dataclass
+class PreparedQuery:
+    """
+    The conjunctive patterns of an ``EQLQuery`` built for one world, ready to be evaluated repeatedly.
+    """
+
+    query: EQLQuery
+    patterns: List[ConjunctivePattern]
+    construction_seconds: float
     """
-    A function that takes a World and returns an EQL Query.
+    Seconds taken to build the patterns.
+    """
+
+    def results(self, use_joins: bool = True) -> Set[Tuple[str, ...]]:
+        """
+        Returns the distinct answers as tuples of identifiers in the order of the selected variables.
+
+        :param use_joins: Whether to evaluate relation memberships by following the relations
+        """
+        return set(self.answers(use_joins))
+
+    def answers(self, use_joins: bool = True) -> Iterator[Tuple[str, ...]]:
+        """
+        Yields the answers as tuples of identifiers one by one, without removing duplicates.
+
+        :param use_joins: Whether to evaluate relation memberships by following the relations
+        """
+        for pattern in self.patterns:
+            for answer in pattern.answers(use_joins):
+                yield tuple(entity.identifier for entity in answer)
+
+    def count(self, use_joins: bool = True) -> int:
+        """
+        Returns the number of answers ``answers`` would yield without building them.
+
+        :param use_joins: Whether to evaluate relation memberships by following the relations
+        """
+        return sum(pattern.count(use_joins) for pattern in self.patterns)
+
+    def digest(self, use_joins: bool = True) -> ResultDigest:
+        """
+        Returns the digest of the distinct answers. The answers are collected first, because
+        several patterns may produce the same answer.
+
+        :param use_joins: Whether to evaluate relation memberships by following the relations
+        """
+        return ResultDigest.of(self.results(use_joins))
+
+
+@dataclass
+class PreparedQueries(WorldIndex):
+    """
+    The prepared queries of a world keyed by query number.
+
+    The variables of a pattern copy their domain when they are built, so the prepared queries are
+    discarded whenever an entity is added. Added relations are read during evaluation and keep them valid.
     """
 
+    world: World
+    prepared_queries: Dict[int, PreparedQuery] = field(default_factory=dict)
+
+    @classmethod
+    def from_world(cls, world: World) -> PreparedQueries:
+        prepared_queries = cls(world)
+        world.subscribe(prepared_queries)
+        return prepared_queries
+
+    def prepared(self, query: EQLQuery) -> PreparedQuery:
+        """
+        Returns the prepared query, building its patterns if they are not cached.
+        """
+        number = query.sparql_query.number
+        if number not in self.prepared_queries:
+            start = time.perf_counter()
+            patterns = query.query(self.world)
+            self.prepared_queries[number] = PreparedQuery(query, patterns, time.perf_counter() - start)
+        return self.prepared_queries[number]
+
+    def entity_added(self, entity: Symbol, parent: Optional[Symbol]) -> None:
+        self.prepared_queries.clear()
+
+
+@dataclass(frozen=True)
+class OrganizationLevel:
+    """
+    A level of the organization hierarchy.
+
+    :param type: The type of the organizations on this level
+    :param collection: Returns the organizations of this level in a world
+    :param parts: Returns the direct parts of an organization of this level, if it can have any
+    """
+
+    type: Type[Symbol]
+    collection: Callable[[World], List[Symbol]]
+    parts: Optional[Callable[[Symbol], List[Symbol]]] = None
+
+
+ORGANIZATION_LEVELS = (
+    OrganizationLevel(University, attrgetter("universities"), attrgetter("colleges")),
+    OrganizationLevel(College, attrgetter("colleges"), attrgetter("departments")),
+    OrganizationLevel(Department, attrgetter("departments"), attrgetter("research_groups")),
+    OrganizationLevel(ResearchGroup, attrgetter("research_groups")),
+)
+UNIVERSITY_LEVEL, COLLEGE_LEVEL, DEPARTMENT_LEVEL, RESEARCH_GROUP_LEVEL = range(4)
+
+STUDENT_LISTS = ("undergraduate_students", "postgraduate_students", "phd_students")
+
+
+def membership_join(
+    world: World,
+    whole_level: int,
+    part_level: int,
+    relation: str,
+    members: Sequence[Symbol],
+    member_answer: Callable[[Symbol], Symbol] = attrgetter("person"),
+) -> RelationJoin:
+    """
+    Returns the join of ``contains(part.<relation>, member)`` with the ``isPartOf`` chain from the
+    organizations of the whole level down to the parts on the part level, selecting the person of
+    the member together with the whole.
+    """
+    return RelationJoin(
+        ORGANIZATION_LEVELS[whole_level].collection(world),
+        relation,
+        members,
+        lambda whole, member: (member_answer(member), whole),
+        tuple(level.parts for level in ORGANIZATION_LEVELS[whole_level:part_level]),
+    )
+
+
+@dataclass
+class OrganizationPath:
+    """
+    Variables for a chain of organizations from a whole down to one of its transitive parts,
+    joined by ``isPartOf`` conditions. Has to be created in symbolic mode.
+    """
+
+    variables: List[Symbol]
+    conditions: List[SymbolicExpression]
+
+    @classmethod
+    def between(cls, world: World, whole_level: int, part_level: int) -> OrganizationPath:
+        levels = ORGANIZATION_LEVELS[whole_level : part_level + 1]
+        variables = [let(level.type, level.collection(world)) for level in levels]
+        conditions = [
+            contains(level.parts(whole), part) for level, whole, part in zip(levels, variables, variables[1:])
+        ]
+        return cls(variables, conditions)
+
+    @property
+    def whole(self) -> Symbol:
+        return self.variables[0]
+
+    @property
+    def part(self) -> Symbol:
+        return self.variables[-1]
+
 
 def q1_generator(world: World):
     with symbolic_mode():
         p1 = let(Person, world.persons)
         p2 = let(Person, world.persons)
-        query = an(set_of((p1, p2)), contains(p1.knows, p2))
-    return query
+        query = ConjunctivePattern.select(
+            (p1, p2), contains(p1.knows, p2), join=RelationJoin(world.persons, "knows", world.persons)
+        )
+    return [query]
+
+
+def q2_generator(world: World):
+    """
+    A person is a member of the departments it studies in and the research groups it belongs to,
+    and, through the property chain with ``isPartOf``, of every organization those are part of.
+    """
+    queries = []
+    for whole_level in range(DEPARTMENT_LEVEL + 1):
+        for student_list in STUDENT_LISTS:
+            with symbolic_mode():
+                student = let(Student, world.students)
+                path = OrganizationPath.between(world, whole_level, DEPARTMENT_LEVEL)
+                condition = contains(attrgetter(student_list)(path.part), student)
+                join = membership_join(world, whole_level, DEPARTMENT_LEVEL, student_list, world.students)
+                queries.append(
+                    ConjunctivePattern.select((student.person, path.whole), condition, *path.conditions, join=join)
+                )
+        with symbolic_mode():
+            employee = let(Employee, world.employees)
+            path = OrganizationPath.between(world, whole_level, DEPARTMENT_LEVEL)
+            condition = contains(path.part.employees, employee)
+            join = membership_join(world, whole_level, DEPARTMENT_LEVEL, "employees", world.employees)
+            queries.append(
+                ConjunctivePattern.select((employee.person, path.whole), condition, *path.conditions, join=join)
+            )
+    for whole_level in range(RESEARCH_GROUP_LEVEL + 1):
+        with symbolic_mode():
+            person = let(Person, world.persons)
+            path = OrganizationPath.between(world, whole_level, RESEARCH_GROUP_LEVEL)
+            condition = contains(path.part.members, person)
+            join = membership_join(world, whole_level, RESEARCH_GROUP_LEVEL, "members", world.persons, identity)
+            queries.append(ConjunctivePattern.select((person, path.whole), condition, *path.conditions, join=join))
+    return queries
+
+
+def q3_generator(world: World):
+    """
+    ``isPartOf`` is transitive, so every pair of a whole and a part on a lower level is an answer.
+    """
+    queries = []
+    for whole_level in range(RESEARCH_GROUP_LEVEL):
+        for part_level in range(whole_level + 1, RESEARCH_GROUP_LEVEL + 1):
+            with symbolic_mode():
+                path = OrganizationPath.between(world, whole_level, part_level)
+                queries.append(ConjunctivePattern.select((path.part, path.whole), *path.conditions))
+    return queries
+
+
+def q6_generator(world: World):
+    with symbolic_mode():
+        person = let(Person, world.persons)
+        query = ConjunctivePattern.select((person,), contains(person.knows, person))
+    return [query]
+
+
+def q11_generator(world: World):
+    with symbolic_mode():
+        student = let(Student, world.students)
+        advisor = let(Person, world.persons)
+        query = ConjunctivePattern.select(
+            (student.person, advisor),
+            contains(student.advisors, advisor),
+            join=RelationJoin(
+                world.students, "advisors", world.persons, lambda student, advisor: (student.person, advisor)
+            ),
+        )
+    return [query]
+
+
+def q12_generator(world: World):
+    with symbolic_mode():
+        person = let(Person, world.persons)
+        query = ConjunctivePattern.select((person,))
+    return [query]
+
+
+def q13_generator(world: World):
+    with symbolic_mode():
+        college = let(College, world.colleges)
+        query = ConjunctivePattern.select(
+            (college,), college.is_women_only == True  # noqa: E712 (builds a symbolic comparison)
+        )
+    return [query]
+
+
+def q17_generator(world: World):
+    with symbolic_mode():
+        student = let(Student, world.students)
+        department = let(Department, world.departments)
+        enrolled = ConjunctivePattern.select(
+            (student.person,),
+            contains(department.undergraduate_students, student),
+            join=RelationJoin(
+                world.departments,
+                "undergraduate_students",
+                world.students,
+                lambda department, student: (student.person,),
+            ),
+        )
+    with symbolic_mode():
+        student = let(Student, world.students)
+        leveled = ConjunctivePattern.select((student.person,), student.level == "ug")
+    return [enrolled, leveled]
+
+
+def q19_generator(world: World):
+    with symbolic_mode():
+        employee = let(Employee, world.employees)
+        query = ConjunctivePattern.select((employee.person,), employee.role == "faculty")
+    return [query]
+
+
+def q20_generator(world: World):
+    with symbolic_mode():
+        p1 = let(Person, world.persons)
+        p2 = let(Person, world.persons)
+        query = ConjunctivePattern.select(
+            (p1, p2),
+            p1.hometown != None,  # noqa: E711 (builds a symbolic comparison)
+            p1.hometown == p2.hometown,
+            p1.identifier != p2.identifier,
+        )
+    return [query]
 
 
 q1 = EQLQuery(
     sparql_queries.q1,
     query=q1_generator,
 )
+
+q2 = EQLQuery(sparql_queries.q2, query=q2_generator)
+q3 = EQLQuery(sparql_queries.q3, query=q3_generator)
+q6 = EQLQuery(sparql_queries.q6, query=q6_generator)
+q11 = EQLQuery(sparql_queries.q11, query=q11_generator)
+q12 = EQLQuery(sparql_queries.q12, query=q12_generator)
+q13 = EQLQuery(sparql_queries.q13, query=q13_generator)
+q17 = EQLQuery(sparql_queries.q17, query=q17_generator)
+q19 = EQLQuery(sparql_queries.q19, query=q19_generator)
+q20 = EQLQuery(sparql_queries.q20, query=q20_generator)
+
+all_queries = [q1, q2, q3, q6, q11, q12, q13, q17, q19, q20]
+
+queries_by_number: Dict[int, EQLQuery] = {query.sparql_query.number: query for query in all_queries}
+"""
+The EQL queries keyed by the number of the SPARQL query they represent.
+"""
+
+unsupported_queries: Dict[int, str] = {
+    4: "Persons have no age.",
+    5: "Persons have no hobbies, so T20CricketFan cannot be derived.",
+    7: "Universities do not record their alumni.",
+    8: "Affiliations between organizations are not modeled.",
+    9: "Colleges have no discipline.",
+    10: "Collaborations between persons are not modeled.",
+    14: "Students do not record the courses they take, so LeisureStudent cannot be derived.",
+    15: "Organizations have no head.",
+    16: "Organizations have no head.",
+    18: "Persons have no hobbies, so PeopleWithManyHobbies cannot be derived.",
+    21: "Colleges have no discipline.",
+    22: "Organizations have no dean and courses record neither teachers nor students.",
+}
+"""
+The reason why each SPARQL query without an EQL counterpart cannot be answered over a ``World``.
+These queries are out of scope until the model records the facts they ask for.
+"""
+
+
+def query_for(number: int) -> EQLQuery:
+    """
+    Returns the EQL query representing the SPARQL query with the given number.
+    """
+    if number in unsupported_queries:
+        raise UnsupportedQueryError(f"Query {number} has no EQL counterpart: {unsupported_queries[number]}")
+    return queries_by_number[number]
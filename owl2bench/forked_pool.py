@@ -0,0 +1,47 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+from typing import Any, Callable, TypeVar
+
+Argument = TypeVar("Argument")
+Result = TypeVar("Result")
+
+worker_state: Any = None
+"""
+The state installed in a worker process of a ``forked_pool``, inherited from the process that created the pool.
+"""
+
+
+def install_worker_state(state: Any) -> None:
+    global worker_state
+    worker_state = state
+
+
+def call_with_worker_state(function: Callable[[Any, Argument], Result], argument: Argument) -> Result:
+    return function(worker_state, argument)
+
+
+def forked_pool(processes: int, state: Any) -> ProcessPoolExecutor:
+    """
+    Returns a pool of forked worker processes that inherit ``state`` instead of receiving a
+    serialized copy, so only task arguments and results cross process boundaries.
+    Tasks are submitted as ``with_worker_state(function)``.
+
+    :param processes: Number of worker processes
+    :param state: The state the tasks of the pool operate on, such as a world or the queries prepared for it
+    """
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=get_context("fork"),
+        initializer=install_worker_state,
+        initargs=(state,),
+    )
+
+
+def with_worker_state(function: Callable[[Any, Argument], Result]) -> Callable[[Argument], Result]:
+    """
+    Returns a task for a ``forked_pool`` that calls ``function`` with the state of the worker and
+    the argument of the task. The function has to be defined at module level.
+    """
+    return partial(call_with_worker_state, function)
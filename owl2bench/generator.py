@@ -95,8 +95,8 @@ class InstanceGenerator:
             courses.append(Course(identifier=c_id, title=title))
         return courses
 
-    def _gen_students(self, department: Department, level: str, count: int, women_only: bool) -> List[Person]:
-        people: List[Person] = []
+    def _gen_students(self, department: Department, level: str, count: int, women_only: bool) -> List[Student]:
+        students: List[Student] = []
         for i in range(1, count + 1):
             pid = f"{department.identifier}_{level.upper()}{i}"
             first = self.random.choice(self.first_names)
@@ -104,8 +104,8 @@ class InstanceGenerator:
             is_woman = women_only or (self.random.randint(0, 1) == 0)
             email = f"{pid.lower()}@bench.com"
             person = Person(identifier=pid, first_name=first, last_name=last, email=email, is_woman=is_woman)
-            people.append(person)
-        return people
+            students.append(Student(person=person, level=level))
+        return students
 
     @staticmethod
     def _default_first_names() -> Sequence[str]:
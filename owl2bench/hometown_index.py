@@ -0,0 +1,53 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from krrood.entity_query_language.predicate import Symbol
+
+from .models import World, WorldIndex, Person
+
+
+@dataclass
+class HometownIndex(WorldIndex):
+    """
+    Groups persons by hometown to answer ``hasSameHomeTownWith`` without a quadratic self-join.
+
+    Persons without a hometown do not share it with anyone.
+    """
+
+    groups: Dict[str, List[Person]] = field(default_factory=dict)
+
+    @classmethod
+    def from_world(cls, world: World) -> HometownIndex:
+        """
+        Groups all persons of the world and keeps the index updated on additions.
+        """
+        index = cls()
+        for person in world.persons:
+            index.add(person)
+        world.subscribe(index)
+        return index
+
+    def add(self, person: Person) -> None:
+        if person.hometown is not None:
+            self.groups.setdefault(person.hometown, []).append(person)
+
+    def pairs(self) -> Iterator[Tuple[Person, Person]]:
+        """
+        Yields every ordered pair of distinct persons that share a hometown.
+        """
+        for group in self.groups.values():
+            for person in group:
+                for other in group:
+                    if other is not person:
+                        yield person, other
+
+    def count(self) -> int:
+        """
+        Returns the number of pairs yielded by ``pairs`` without enumerating them.
+        """
+        return sum(len(group) * (len(group) - 1) for group in self.groups.values())
+
+    def entity_added(self, entity: Symbol, parent: Optional[Symbol]) -> None:
+        if isinstance(entity, Person):
+            self.add(entity)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterable, Iterator, List, Sequence, Set, Tuple
+
+import numpy as np
+from krrood.entity_query_language.predicate import Symbol
+from sqlalchemy import Connection
+
+from .entity_set import EntityNumbering
+from .eql_queries import PreparedQuery
+from .sql_queries import SQLQuery
+
+
+class UnnumberedIdentifierError(Exception):
+    """
+    Raised when an answer refers to an identifier that the numbering does not know.
+    """
+
+
+def index_type(numbering: EntityNumbering) -> np.dtype:
+    """
+    Returns the narrowest integer type that holds every number of the numbering.
+    """
+    return np.dtype(np.int32 if len(numbering) <= np.iinfo(np.int32).max else np.int64)
+
+
+@dataclass
+class IndexedAnswers:
+    """
+    The distinct answers of a query as an array of entity numbers with one row per answer and one
+    column per selected variable, sorted by rows. Each answer takes a few bytes per column instead of a
+    tuple of objects in a hash set, and is converted back to entities or identifiers only on demand.
+
+    :param numbering: The numbering the entries refer to
+    :param indices: The numbers of the selected entities of every answer
+    """
+
+    numbering: EntityNumbering
+    indices: np.ndarray
+
+    @classmethod
+    def from_numbers(cls, numbering: EntityNumbering, numbers: Iterable[Sequence[int]], width: int) -> IndexedAnswers:
+        """
+        Collects answers given as numbers into an array without building a tuple per answer, and
+        removes duplicates.
+
+        :param width: Number of selected variables
+        """
+        flat = np.fromiter(chain.from_iterable(numbers), dtype=index_type(numbering))
+        indices = np.unique(flat.reshape(-1, width), axis=0)
+        return cls(numbering, indices)
+
+    def entities(self) -> Iterator[Tuple[Symbol, ...]]:
+        individuals = self.numbering.individuals
+        return (tuple(individuals[number] for number in row) for row in self.indices.tolist())
+
+    def results(self) -> Set[Tuple[str, ...]]:
+        """
+        Returns the answers as tuples of identifiers, like ``PreparedQuery.results``.
+        """
+        return {tuple(entity.identifier for entity in answer) for answer in self.entities()}
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+
+def eql_indices(prepared: PreparedQuery, numbering: EntityNumbering, use_joins: bool = True) -> IndexedAnswers:
+    """
+    Evaluates a prepared EQL query into an array of entity numbers. Entities the numbering does not
+    know yet are numbered on the way.
+
+    :param use_joins: Whether to evaluate relation memberships by following the relations
+    """
+    numbers = (
+        map(numbering.number, answer) for pattern in prepared.patterns for answer in pattern.answers(use_joins)
+    )
+    return IndexedAnswers.from_numbers(numbering, numbers, len(prepared.patterns[0].selected))
+
+
+def identifier_numbers(numbering: EntityNumbering, identifiers: Sequence[str]) -> List[int]:
+    try:
+        return [numbering.numbers[identifier] for identifier in identifiers]
+    except KeyError as error:
+        raise UnnumberedIdentifierError(f"The numbering has no number for {error.args[0]!r}.") from error
+
+
+def sql_indices(query: SQLQuery, connection: Connection, numbering: EntityNumbering) -> IndexedAnswers:
+    """
+    Executes an SQL query into an array of the numbers of the identifiers it selects.
+
+    :param numbering: A numbering of the world the database was stored from
+    """
+    numbers = (identifier_numbers(numbering, row) for row in connection.execute(query.statement))
+    return IndexedAnswers.from_numbers(numbering, numbers, len(query.statement.selected_columns))
@@ -32,6 +32,29 @@ class MappingError(Exception):
 BENCH = Namespace("http://benchmark/OWL2Bench#")
 
 
+def load_graph(file_path: str | Path) -> Graph:
+    """
+    Parses an OWL/RDF file into a graph, guessing the format from the file.
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise OntologyLoadError(f"File not found: {path}")
+    graph = Graph()
+    try:
+        graph.parse(path.as_posix())
+    except Exception as exc:  # noqa: BLE001 (bubbling into custom exception)
+        raise OntologyLoadError(f"Failed to parse RDF from {path}: {exc}") from exc
+    return graph
+
+
+def local_identifier(iri: URIRef) -> str:
+    """
+    Returns the human-friendly identifier of an IRI, the part after ``#`` or the last ``/``.
+    """
+    text = str(iri)
+    return text.rsplit("#", 1)[-1] if "#" in text else text.rstrip("/").rsplit("/", 1)[-1]
+
+
 @dataclass(frozen=True)
 class WorldLoader:
     """
@@ -50,16 +73,7 @@ class WorldLoader:
     """
 
     def load(self, file_path: str | Path) -> World:
-        path = Path(file_path)
-        if not path.exists():
-            raise OntologyLoadError(f"File not found: {path}")
-
-        try:
-            g = Graph()
-            # Try to guess format by extension; rdflib can auto-detect for XML/Turtle
-            g.parse(path.as_posix())
-        except Exception as exc:  # noqa: BLE001 (bubbling into custom exception)
-            raise OntologyLoadError(f"Failed to parse RDF from {path}: {exc}") from exc
+        g = load_graph(file_path)
 
         # Build lookups progressively
         universities: List[University] = []
@@ -68,14 +82,9 @@ class WorldLoader:
         courses_index: Dict[URIRef, Course] = {}
         persons_index: Dict[URIRef, Person] = {}
 
-        # Helper to get a human-friendly identifier from an IRI
-        def ident(iri: URIRef) -> str:
-            s = str(iri)
-            return s.rsplit('#', 1)[-1] if '#' in s else s.rstrip('/').rsplit('/', 1)[-1]
-
         # Universities
         for u in g.subjects(RDF.type, BENCH.University):
-            u_id = ident(u)
+            u_id = local_identifier(u)
             u_name = self._label_or_fallback(g, u, default=u_id)
             uni = University(identifier=u_id, name=u_name)
 
@@ -90,7 +99,7 @@ class WorldLoader:
                     continue
                 college = colleges_index.get(c)
                 if college is None:
-                    c_id = ident(c)
+                    c_id = local_identifier(c)
                     c_name = self._label_or_fallback(g, c, default=c_id)
                     # women-only flag via type WomenCollege
                     is_women_only = (c, RDF.type, BENCH.WomenCollege) in g
@@ -103,7 +112,7 @@ class WorldLoader:
                             continue
                         dept = departments_index.get(d)
                         if dept is None:
-                            d_id = ident(d)
+                            d_id = local_identifier(d)
                             d_name = self._label_or_fallback(g, d, default=d_id)
                             dept = Department(identifier=d_id, name=d_name)
                             # Courses (offerCourse); also try hasCourse if present in ABox
@@ -116,7 +125,7 @@ class WorldLoader:
                                     continue
                                 course = courses_index.get(cr)
                                 if course is None:
-                                    cr_id = ident(cr)
+                                    cr_id = local_identifier(cr)
                                     title = self._label_or_warn(g, cr, default=cr_id)
                                     course = Course(identifier=cr_id, title=title)
                                     courses_index[cr] = course
@@ -160,7 +169,7 @@ class WorldLoader:
                 hometown = str(hometown_lit) if hometown_lit is not None else None
 
                 person = Person(
-                    identifier=ident(p),
+                    identifier=local_identifier(p),
                     first_name=first,
                     last_name=last,
                     email=email,
@@ -0,0 +1,515 @@
+from __future__ import annotations
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import AbstractSet, Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+from .entity_set import EntityNumbering, EntitySet
+from .models import World
+from .sparql_queries import OWLProfile, SPARQLQuery
+from . import sparql_queries
+
+
+@dataclass
+class Relation:
+    """
+    The pairs of entity numbers of one object property, indexed in both directions.
+    """
+
+    objects: Dict[int, Set[int]] = field(default_factory=lambda: defaultdict(set))
+    """
+    The objects related to every subject.
+    """
+    subjects: Dict[int, Set[int]] = field(default_factory=lambda: defaultdict(set))
+    """
+    The subjects related to every object.
+    """
+
+    def add(self, subject: int, object_: int) -> bool:
+        """
+        Adds a pair and returns whether it was new.
+        """
+        objects = self.objects[subject]
+        if object_ in objects:
+            return False
+        objects.add(object_)
+        self.subjects[object_].add(subject)
+        return True
+
+    def pairs(self) -> Iterator[Tuple[int, int]]:
+        for subject, objects in self.objects.items():
+            for object_ in objects:
+                yield subject, object_
+
+    def __len__(self) -> int:
+        return sum(map(len, self.objects.values()))
+
+
+@dataclass
+class Derivation:
+    """
+    Facts produced by rules, or asserted by a world, before they are added to ``Facts``.
+    """
+
+    pairs: Dict[str, Set[Tuple[int, int]]] = field(default_factory=lambda: defaultdict(set))
+    """
+    Pairs of entity numbers keyed by object property.
+    """
+    members: Dict[str, Set[int]] = field(default_factory=lambda: defaultdict(set))
+    """
+    Entity numbers keyed by class.
+    """
+
+    def relate(self, property_name: str, subject: int, object_: int) -> None:
+        self.pairs[property_name].add((subject, object_))
+
+    def classify(self, class_name: str, entity: int) -> None:
+        self.members[class_name].add(entity)
+
+    def pairs_of(self, property_name: str) -> Iterable[Tuple[int, int]]:
+        return self.pairs.get(property_name, ())
+
+    def members_of(self, class_name: str) -> Iterable[int]:
+        return self.members.get(class_name, ())
+
+    def __len__(self) -> int:
+        return sum(map(len, self.pairs.values())) + sum(map(len, self.members.values()))
+
+
+@dataclass
+class Facts:
+    """
+    Asserted and inferred facts about the entities of a world, stored as entity numbers.
+    """
+
+    numbering: EntityNumbering
+    relations: Dict[str, Relation] = field(default_factory=lambda: defaultdict(Relation))
+    classes: Dict[str, Set[int]] = field(default_factory=lambda: defaultdict(set))
+
+    def add(self, derivation: Derivation) -> Derivation:
+        """
+        Adds the derived facts and returns those that were not known before.
+        """
+        fresh = Derivation()
+        for property_name, pairs in derivation.pairs.items():
+            relation = self.relations[property_name]
+            for subject, object_ in pairs:
+                if relation.add(subject, object_):
+                    fresh.relate(property_name, subject, object_)
+        for class_name, members in derivation.members.items():
+            known = self.classes[class_name]
+            for member in members - known:
+                fresh.classify(class_name, member)
+            known |= members
+        return fresh
+
+    def identifier_pairs(self, property_name: str) -> Set[Tuple[str, str]]:
+        """
+        Returns the pairs of a property as pairs of identifiers.
+        """
+        individual = self.numbering.individual
+        return {
+            (individual(subject).identifier, individual(object_).identifier)
+            for subject, object_ in self.relations[property_name].pairs()
+        }
+
+    def instances(self, class_name: str) -> EntitySet:
+        return EntitySet.from_numbers(self.numbering, self.classes[class_name])
+
+
+@dataclass(frozen=True)
+class Rule(ABC):
+    """
+    An OWL RL rule evaluated semi-naively: it derives conclusions only from combinations of
+    premises in which at least one premise was new in the previous round.
+
+    :param query: The benchmark query whose answers depend on the rule
+    """
+
+    query: SPARQLQuery
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """
+        The axiom the rule implements.
+        """
+
+    @property
+    @abstractmethod
+    def premises(self) -> AbstractSet[str]:
+        """
+        The properties and classes the rule reads.
+        """
+
+    @property
+    @abstractmethod
+    def conclusions(self) -> AbstractSet[str]:
+        """
+        The properties and classes the rule derives facts of.
+        """
+
+    @abstractmethod
+    def fire(self, facts: Facts, delta: Derivation) -> Derivation:
+        """
+        Returns the conclusions of the rule that involve at least one fact of the delta.
+
+        :param facts: All known facts, including the delta
+        :param delta: The facts that were new in the previous round
+        """
+
+
+@dataclass(frozen=True)
+class TransitiveRule(Rule):
+    property_name: str
+
+    @property
+    def name(self) -> str:
+        return f"TransitiveObjectProperty({self.property_name})"
+
+    @property
+    def premises(self) -> AbstractSet[str]:
+        return {self.property_name}
+
+    @property
+    def conclusions(self) -> AbstractSet[str]:
+        return {self.property_name}
+
+    def fire(self, facts: Facts, delta: Derivation) -> Derivation:
+        conclusions = Derivation()
+        relation = facts.relations[self.property_name]
+        for subject, object_ in delta.pairs_of(self.property_name):
+            for further in relation.objects.get(object_, ()):
+                conclusions.relate(self.property_name, subject, further)
+            for earlier in relation.subjects.get(subject, ()):
+                conclusions.relate(self.property_name, earlier, object_)
+        return conclusions
+
+
+@dataclass(frozen=True)
+class ChainRule(Rule):
+    """
+    ``first o second`` is a sub property of ``result``.
+    """
+
+    first: str
+    second: str
+    result: str
+
+    @property
+    def name(self) -> str:
+        return f"SubObjectPropertyOf(ObjectPropertyChain({self.first} {self.second}) {self.result})"
+
+    @property
+    def premises(self) -> AbstractSet[str]:
+        return {self.first, self.second}
+
+    @property
+    def conclusions(self) -> AbstractSet[str]:
+        return {self.result}
+
+    def fire(self, facts: Facts, delta: Derivation) -> Derivation:
+        conclusions = Derivation()
+        first, second = facts.relations[self.first], facts.relations[self.second]
+        for subject, middle in delta.pairs_of(self.first):
+            for object_ in second.objects.get(middle, ()):
+                conclusions.relate(self.result, subject, object_)
+        for middle, object_ in delta.pairs_of(self.second):
+            for subject in first.subjects.get(middle, ()):
+                conclusions.relate(self.result, subject, object_)
+        return conclusions
+
+
+@dataclass(frozen=True)
+class SubPropertyRule(Rule):
+    sub_property: str
+    super_property: str
+
+    @property
+    def name(self) -> str:
+        return f"SubObjectPropertyOf({self.sub_property} {self.super_property})"
+
+    @property
+    def premises(self) -> AbstractSet[str]:
+        return {self.sub_property}
+
+    @property
+    def conclusions(self) -> AbstractSet[str]:
+        return {self.super_property}
+
+    def fire(self, facts: Facts, delta: Derivation) -> Derivation:
+        conclusions = Derivation()
+        for subject, object_ in delta.pairs_of(self.sub_property):
+            conclusions.relate(self.super_property, subject, object_)
+        return conclusions
+
+
+@dataclass(frozen=True)
+class InverseRule(Rule):
+    property_name: str
+    inverse: str
+
+    @property
+    def name(self) -> str:
+        return f"InverseObjectProperties({self.property_name} {self.inverse})"
+
+    @property
+    def premises(self) -> AbstractSet[str]:
+        return {self.property_name, self.inverse}
+
+    @property
+    def conclusions(self) -> AbstractSet[str]:
+        return {self.property_name, self.inverse}
+
+    def fire(self, facts: Facts, delta: Derivation) -> Derivation:
+        conclusions = Derivation()
+        for subject, object_ in delta.pairs_of(self.property_name):
+            conclusions.relate(self.inverse, object_, subject)
+        for subject, object_ in delta.pairs_of(self.inverse):
+            conclusions.relate(self.property_name, object_, subject)
+        return conclusions
+
+
+@dataclass(frozen=True)
+class ReflexiveRule(Rule):
+    """
+    Relates every instance of ``class_name`` to itself.
+    """
+
+    property_name: str
+    class_name: str
+
+    @property
+    def name(self) -> str:
+        return f"ReflexiveObjectProperty({self.property_name})"
+
+    @property
+    def premises(self) -> AbstractSet[str]:
+        return {self.class_name}
+
+    @property
+    def conclusions(self) -> AbstractSet[str]:
+        return {self.property_name}
+
+    def fire(self, facts: Facts, delta: Derivation) -> Derivation:
+        conclusions = Derivation()
+        for entity in delta.members_of(self.class_name):
+            conclusions.relate(self.property_name, entity, entity)
+        return conclusions
+
+
+@dataclass(frozen=True)
+class HasSelfRule(Rule):
+    """
+    Classifies every entity related to itself through ``property_name`` as ``class_name``.
+    """
+
+    property_name: str
+    class_name: str
+
+    @property
+    def name(self) -> str:
+        return f"EquivalentClasses({self.class_name} ObjectHasSelf({self.property_name}))"
+
+    @property
+    def premises(self) -> AbstractSet[str]:
+        return {self.property_name}
+
+    @property
+    def conclusions(self) -> AbstractSet[str]:
+        return {self.class_name}
+
+    def fire(self, facts: Facts, delta: Derivation) -> Derivation:
+        conclusions = Derivation()
+        for subject, object_ in delta.pairs_of(self.property_name):
+            if subject == object_:
+                conclusions.classify(self.class_name, subject)
+        return conclusions
+
+
+RULES: Tuple[Rule, ...] = (
+    ReflexiveRule(sparql_queries.q1, "knows", "Person"),
+    SubPropertyRule(sparql_queries.q2, "isStudentOf", "isMemberOf"),
+    SubPropertyRule(sparql_queries.q2, "isEmployeeOf", "isMemberOf"),
+    ChainRule(sparql_queries.q2, "isMemberOf", "isPartOf", "isMemberOf"),
+    InverseRule(sparql_queries.q3, "hasCollege", "isCollegeOf"),
+    InverseRule(sparql_queries.q3, "hasDepartment", "isDepartmentOf"),
+    InverseRule(sparql_queries.q3, "hasResearchGroup", "isResearchGroupOf"),
+    SubPropertyRule(sparql_queries.q3, "isCollegeOf", "isPartOf"),
+    SubPropertyRule(sparql_queries.q3, "isDepartmentOf", "isPartOf"),
+    SubPropertyRule(sparql_queries.q3, "isResearchGroupOf", "isPartOf"),
+    TransitiveRule(sparql_queries.q3, "isPartOf"),
+    HasSelfRule(sparql_queries.q6, "knows", "SelfAwarePerson"),
+)
+"""
+The rules whose conclusions the supported benchmark queries depend on, tagged with the query.
+"""
+
+
+def with_prerequisites(selected: Iterable[Rule]) -> Tuple[Rule, ...]:
+    """
+    Returns the selected rules together with every rule of ``RULES`` that derives facts they read,
+    directly or through other rules, in the order of ``RULES``.
+    """
+    chosen = {id(rule) for rule in selected}
+    needed = set().union(*(rule.premises for rule in RULES if id(rule) in chosen))
+    added = True
+    while added:
+        added = False
+        for rule in RULES:
+            if id(rule) not in chosen and rule.conclusions & needed:
+                chosen.add(id(rule))
+                needed |= rule.premises
+                added = True
+    return tuple(rule for rule in RULES if id(rule) in chosen)
+
+
+def asserted_facts(world: World, numbering: EntityNumbering) -> Derivation:
+    """
+    Returns the facts a world states explicitly, named after the OWL2Bench vocabulary.
+    """
+    number = numbering.number
+    facts = Derivation()
+    for class_name, collection in (
+        ("University", world.universities),
+        ("College", world.colleges),
+        ("Department", world.departments),
+        ("ResearchGroup", world.research_groups),
+        ("Person", world.persons),
+    ):
+        for entity in collection:
+            facts.classify(class_name, number(entity))
+    for university in world.universities:
+        for college in university.colleges:
+            facts.relate("hasCollege", number(university), number(college))
+    for college in world.colleges:
+        for department in college.departments:
+            facts.relate("hasDepartment", number(college), number(department))
+    for department in world.departments:
+        for group in department.research_groups:
+            facts.relate("hasResearchGroup", number(department), number(group))
+            for member in group.members:
+                facts.relate("isMemberOf", number(member), number(group))
+        for student in chain(
+            department.undergraduate_students, department.postgraduate_students, department.phd_students
+        ):
+            facts.relate("isStudentOf", number(student.person), number(department))
+        for employee in department.employees:
+            facts.relate("isEmployeeOf", number(employee.person), number(department))
+    for person in world.persons:
+        facts.classify("Woman" if person.is_woman else "Man", number(person))
+        for other in person.knows:
+            facts.relate("knows", number(person), number(other))
+    for student in world.students:
+        for advisor in student.advisors:
+            facts.relate("isAdvisedBy", number(student.person), number(advisor))
+    return facts
+
+
+@dataclass
+class RuleStatistics:
+    """
+    How often a rule fired during a materialization and how long it took.
+
+    :param derivations: Number of conclusions the rule produced, including known ones
+    :param new_facts: Number of conclusions that were not known before
+    :param seconds: Time spent evaluating the rule
+    """
+
+    rule: Rule
+    derivations: int = 0
+    new_facts: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rule": self.rule.name,
+            "query": self.rule.query.number,
+            "derivations": self.derivations,
+            "new_facts": self.new_facts,
+            "seconds": self.seconds,
+        }
+
+
+@dataclass
+class MaterializationReport:
+    """
+    The cost of a materialization, separate from the cost of the queries answered with it.
+
+    :param asserted: Number of facts stated by the world
+    :param rounds: Number of semi-naive rounds until no rule produced a new fact
+    """
+
+    asserted: int
+    rounds: int
+    seconds: float
+    rules: List[RuleStatistics]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "asserted": self.asserted,
+            "rounds": self.rounds,
+            "seconds": self.seconds,
+            "rules": [statistics.to_dict() for statistics in self.rules],
+        }
+
+
+@dataclass(frozen=True)
+class Materializer:
+    """
+    Forward-chaining materialization of the OWL RL rules the benchmark queries need over a ``World``.
+
+    :param rules: The rules to apply
+    """
+
+    rules: Tuple[Rule, ...] = RULES
+
+    @classmethod
+    def for_profile(cls, profile: OWLProfile) -> Materializer:
+        """
+        Returns a materializer with the rules of the queries that are applicable to the profile and
+        the rules those depend on.
+        """
+        return cls(with_prerequisites(rule for rule in RULES if profile in rule.query.profile))
+
+    @classmethod
+    def for_queries(cls, numbers: Iterable[int]) -> Materializer:
+        """
+        Returns a materializer with the rules the queries with the given numbers depend on, directly
+        or through the facts other rules derive.
+        """
+        numbers = set(numbers)
+        return cls(with_prerequisites(rule for rule in RULES if rule.query.number in numbers))
+
+    def materialize(self, world: World) -> Tuple[Facts, MaterializationReport]:
+        """
+        Returns the asserted facts of the world together with everything the rules infer from them.
+        """
+        start = time.perf_counter()
+        facts = Facts(EntityNumbering.from_world(world))
+        delta = facts.add(asserted_facts(world, facts.numbering))
+        asserted = len(delta)
+        statistics = [RuleStatistics(rule) for rule in self.rules]
+        rounds = 0
+        while len(delta):
+            rounds += 1
+            fresh = Derivation()
+            for rule_statistics in statistics:
+                rule_start = time.perf_counter()
+                conclusions = rule_statistics.rule.fire(facts, delta)
+                new_facts = facts.add(conclusions)
+                rule_statistics.seconds += time.perf_counter() - rule_start
+                rule_statistics.derivations += len(conclusions)
+                rule_statistics.new_facts += len(new_facts)
+                self._merge(fresh, new_facts)
+            delta = fresh
+        return facts, MaterializationReport(asserted, rounds, time.perf_counter() - start, statistics)
+
+    @staticmethod
+    def _merge(target: Derivation, source: Derivation) -> None:
+        for property_name, pairs in source.pairs.items():
+            target.pairs[property_name] |= pairs
+        for class_name, members in source.members.items():
+            target.members[class_name] |= members
@@ -1,6 +1,9 @@
 from __future__ import annotations
+from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Optional
+from itertools import chain
+from operator import attrgetter
+from typing import Dict, List, Optional, Set, Tuple, Type, TypeVar, Union
 
 from krrood.entity_query_language.predicate import Symbol
 
@@ -45,6 +48,12 @@ class Person(Symbol):
         return f"{self.first_name} {self.last_name}"
 
 
+PERSON_RELATIONS: Tuple[str, ...] = ("knows", "likes", "loves", "dislikes", "is_crazy_about")
+"""
+The list attributes of ``Person`` that relate it to other persons.
+"""
+
+
 @dataclass
 class Student(Symbol):
     """Represents a student with a study level and advisory links."""
@@ -141,6 +150,47 @@ class University(Symbol):
     publications: List[Publication] = field(default_factory=list)
 
 
+class WorldObserver(ABC):
+    """
+    Receives a notification for every entity and relation that is added to a ``World`` through
+    its mutation API.
+    """
+
+    @abstractmethod
+    def entity_added(self, entity: Symbol, parent: Optional[Symbol]) -> None:
+        """
+        Handles an entity that was just added to the world.
+
+        :param entity: The added entity
+        :param parent: The organization that contains the entity, if any
+        """
+
+    def relation_added(self, person: Person, relation: str, other: Person) -> None:
+        """
+        Handles a relation between two persons that was just added to the world.
+
+        :param person: The person whose relation was extended
+        :param relation: The name of the relation, one of ``PERSON_RELATIONS``
+        :param other: The related person
+        """
+
+
+class WorldIndex(WorldObserver, ABC):
+    """
+    A derived structure that is built from a ``World`` and kept up to date by observing it.
+    """
+
+    @classmethod
+    @abstractmethod
+    def from_world(cls, world: World) -> WorldIndex:
+        """
+        Builds the index for the world and subscribes it to later additions.
+        """
+
+
+IndexType = TypeVar("IndexType", bound=WorldIndex)
+
+
 @dataclass
 class World(Symbol):
     """Aggregates all generated entities for easy cross-linking and queries."""
@@ -155,3 +205,110 @@ class World(Symbol):
     employees: List[Employee] = field(default_factory=list)
     research_groups: List[ResearchGroup] = field(default_factory=list)
     publications: List[Publication] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._observers: List[WorldObserver] = []
+        self._indexes: Dict[type, WorldIndex] = {}
+        self._person_ids: Set[int] = {id(person) for person in self.persons}
+        """
+        The ``id`` of every person in ``persons``, so that a person holding several memberships is added once.
+        """
+        self.version = 0
+        """
+        Number of changes made through the mutation API since the world was created.
+        """
+
+    def subscribe(self, observer: WorldObserver) -> None:
+        """
+        Registers an observer that is notified about every entity added from now on.
+        """
+        self._observers.append(observer)
+
+    def index(self, index_type: Type[IndexType]) -> IndexType:
+        """
+        Returns the cached index of the given type, building it on first use.
+        """
+        if index_type not in self._indexes:
+            self._indexes[index_type] = index_type.from_world(self)
+        return self._indexes[index_type]
+
+    def add_university(self, university: University) -> None:
+        """
+        Adds a university together with its nested organizations, students and employees to the world.
+        """
+        self.universities.append(university)
+        self._notify(university, None)
+        for college in university.colleges:
+            self._register_college(college, university)
+
+    def add_college(self, university: University, college: College) -> None:
+        """
+        Attaches a college to a university and adds it together with its nested organizations.
+        """
+        university.colleges.append(college)
+        self._register_college(college, university)
+
+    def add_department(self, college: College, department: Department) -> None:
+        """
+        Attaches a department to a college and adds it together with its courses, programs,
+        research groups, students and employees.
+        """
+        college.departments.append(department)
+        self._register_department(department, college)
+
+    def add_person(self, person: Person) -> None:
+        """
+        Adds a person to the world unless it is already part of it.
+        """
+        if id(person) in self._person_ids:
+            return
+        self._person_ids.add(id(person))
+        self.persons.append(person)
+        self._notify(person, None)
+
+    def relate(self, person: Person, relation: str, other: Person) -> None:
+        """
+        Adds ``other`` to a relation of ``person``.
+
+        :param relation: The name of the relation, one of ``PERSON_RELATIONS``
+        """
+        attrgetter(relation)(person).append(other)
+        self.version += 1
+        for observer in self._observers:
+            observer.relation_added(person, relation, other)
+
+    def _register_college(self, college: College, university: University) -> None:
+        self.colleges.append(college)
+        self._notify(college, university)
+        for department in college.departments:
+            self._register_department(department, college)
+
+    def _register_department(self, department: Department, college: College) -> None:
+        self.departments.append(department)
+        self._notify(department, college)
+        for course in department.courses:
+            self.courses.append(course)
+            self._notify(course, department)
+        for program in department.programs:
+            self.programs.append(program)
+            self._notify(program, department)
+        for research_group in department.research_groups:
+            self.research_groups.append(research_group)
+            self._notify(research_group, department)
+        for student in chain(
+            department.undergraduate_students, department.postgraduate_students, department.phd_students
+        ):
+            self.students.append(student)
+            self._register_member(student, department)
+        for employee in department.employees:
+            self.employees.append(employee)
+            self._register_member(employee, department)
+
+    def _register_member(self, member: Union[Student, Employee], department: Department) -> None:
+        self._notify(member, department)
+        self.add_person(member.person)
+
+    def _notify(self, entity: Symbol, parent: Optional[Symbol]) -> None:
+        self.version += 1
+        for observer in self._observers:
+            observer.entity_added(entity, parent)
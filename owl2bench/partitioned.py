@@ -0,0 +1,93 @@
+from __future__ import annotations
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .eql_queries import PreparedQuery
+from .forked_pool import forked_pool, with_worker_state
+
+Partition = Tuple[int, int, int, bool]
+"""
+The index of a pattern, the start and stop of a slice of its outer domain and whether to use its join.
+"""
+
+PreparedQueriesByNumber = Dict[int, PreparedQuery]
+
+
+def answer_partition(
+    prepared_queries: PreparedQueriesByNumber, task: Tuple[int, Partition]
+) -> List[Tuple[str, ...]]:
+    """
+    Returns the answers of a pattern of the query with the given number within a slice of its
+    outer domain as tuples of identifiers.
+    """
+    number, (index, start, stop, use_join) = task
+    pattern = prepared_queries[number].patterns[index]
+    outer_domain = pattern.outer_domain(use_join)[start:stop]
+    return [tuple(entity.identifier for entity in answer) for answer in pattern.answers_within(outer_domain, use_join)]
+
+
+@dataclass(frozen=True)
+class PartitionedEvaluation:
+    """
+    Evaluates prepared queries in forked worker processes. The domain of the outer variable of every
+    pattern is split into slices that the workers answer independently against the world they
+    inherit from this process, and the answers of the slices are merged.
+
+    :param processes: Number of worker processes
+    :param chunks_per_process: Number of slices per process and pattern. More slices balance uneven
+        slices better but send more tasks and answer lists between the processes.
+    :param ordered: Whether to yield the answers slice by slice in pattern and domain order, so that
+        repeated evaluations yield the same sequence, rather than as the slices complete
+    """
+
+    processes: int = 2
+    chunks_per_process: int = 4
+    ordered: bool = False
+
+    def pool(self, prepared_queries: Sequence[PreparedQuery]) -> ProcessPoolExecutor:
+        """
+        Returns worker processes that evaluate the prepared queries, to be shared by the evaluations
+        of ``answers`` and shut down by the caller. The workers are forked on the first evaluation
+        and see the world as it is then.
+        """
+        return forked_pool(
+            self.processes, {prepared.query.sparql_query.number: prepared for prepared in prepared_queries}
+        )
+
+    def partitions(self, prepared: PreparedQuery, use_joins: bool = True) -> List[Partition]:
+        slices = self.processes * self.chunks_per_process
+        partitions = []
+        for index, pattern in enumerate(prepared.patterns):
+            size = len(pattern.outer_domain(use_joins))
+            step = max(1, math.ceil(size / slices))
+            partitions.extend((index, start, start + step, use_joins) for start in range(0, size, step))
+        return partitions
+
+    def answers(
+        self, prepared: PreparedQuery, use_joins: bool = True, pool: Optional[ProcessPoolExecutor] = None
+    ) -> Iterator[Tuple[str, ...]]:
+        """
+        Yields the answers as tuples of identifiers, without removing duplicates, like ``PreparedQuery.answers``.
+
+        :param use_joins: Whether to evaluate relation memberships by following the relations
+        :param pool: The ``pool`` of the prepared queries, or None to start and stop one for this evaluation
+        """
+        with self.pool([prepared]) if pool is None else nullcontext(pool) as workers:
+            number = prepared.query.sparql_query.number
+            futures = [
+                workers.submit(with_worker_state(answer_partition), (number, partition))
+                for partition in self.partitions(prepared, use_joins)
+            ]
+            for future in futures if self.ordered else as_completed(futures):
+                yield from future.result()
+
+    def results(self, prepared: PreparedQuery, use_joins: bool = True) -> Set[Tuple[str, ...]]:
+        """
+        Returns the distinct answers as tuples of identifiers in the order of the selected variables.
+
+        :param use_joins: Whether to evaluate relation memberships by following the relations
+        """
+        return set(self.answers(prepared, use_joins))
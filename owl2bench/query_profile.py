@@ -0,0 +1,143 @@
+from __future__ import annotations
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from krrood.entity_query_language.predicate import Symbol
+from krrood.entity_query_language.symbolic import SymbolicExpression
+
+from .eql_internals import operator_children, operator_name, wrapped_evaluations
+from .eql_queries import ConjunctivePattern, PreparedQuery
+
+
+@dataclass
+class OperatorProfile:
+    """
+    The cost of one operator of an evaluated query and of the operators it draws its input from.
+
+    :param name: The kind of the operator and what it operates on
+    :param calls: Number of times the operator was evaluated, one per input binding from its parent
+    :param answers: Number of bindings the operator produced over all calls
+    :param seconds: Time spent producing the bindings, including the time of the children
+    :param children: The profiles of the operators this one consumes
+    """
+
+    name: str
+    calls: int = 0
+    answers: int = 0
+    seconds: float = 0.0
+    children: List[OperatorProfile] = field(default_factory=list)
+
+    @property
+    def own_seconds(self) -> float:
+        """
+        The time spent in this operator without the time of its children. Children shared with
+        other parents count fully against each parent, which can make this negative.
+        """
+        return self.seconds - sum(child.seconds for child in self.children)
+
+    def counted(self, produce: Callable[..., Iterable[Any]]) -> Callable[..., Iterator[Any]]:
+        """
+        Wraps a function returning bindings so that every call and binding is recorded in this profile.
+        """
+
+        def produce_counted(*arguments: Any, **keywords: Any) -> Iterator[Any]:
+            self.calls += 1
+            start = time.perf_counter()
+            values = iter(produce(*arguments, **keywords))
+            self.seconds += time.perf_counter() - start
+            while True:
+                start = time.perf_counter()
+                try:
+                    value = next(values)
+                except StopIteration:
+                    self.seconds += time.perf_counter() - start
+                    return
+                self.seconds += time.perf_counter() - start
+                self.answers += 1
+                yield value
+
+        return produce_counted
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "answers": self.answers,
+            "seconds": self.seconds,
+            "own_seconds": self.own_seconds,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+def expression_profiles(expression: SymbolicExpression) -> Dict[int, OperatorProfile]:
+    """
+    Returns empty profiles for the operators of an expression keyed by their ``id``, linked into a
+    tree mirroring the operators. An operator shared by several parents, such as a variable used in
+    several conditions, has one profile that appears under each of them.
+    """
+    profiles: Dict[int, OperatorProfile] = {}
+
+    def profile_of(operator: SymbolicExpression) -> OperatorProfile:
+        if id(operator) not in profiles:
+            profiles[id(operator)] = OperatorProfile(operator_name(operator))
+            profiles[id(operator)].children = [profile_of(child) for child in operator_children(operator)]
+        return profiles[id(operator)]
+
+    profile_of(expression)
+    return profiles
+
+
+@contextmanager
+def instrumented(expression: SymbolicExpression) -> Iterator[OperatorProfile]:
+    """
+    Records the evaluation of every operator of the expression while the context is active.
+
+    :return: The profile of the expression
+    """
+    profiles = expression_profiles(expression)
+    with wrapped_evaluations(expression, lambda operator, evaluation: profiles[id(operator)].counted(evaluation)):
+        yield profiles[id(expression)]
+
+
+def profiled_answers(
+    index: int, pattern: ConjunctivePattern, use_join: bool, parent: OperatorProfile
+) -> Iterator[Tuple[Symbol, ...]]:
+    """
+    Yields the answers of a pattern while recording the evaluation of its operators in a new child
+    of the parent profile. A pattern evaluated by its join consists of the join alone.
+    """
+    pattern_profile = OperatorProfile(f"ConjunctivePattern {index}")
+    parent.children.append(pattern_profile)
+    if use_join and pattern.join is not None:
+        join_profile = OperatorProfile(f"RelationJoin {pattern.join.relation}")
+        pattern_profile.children.append(join_profile)
+        yield from pattern_profile.counted(join_profile.counted(pattern.join.answers))()
+        return
+    with instrumented(pattern.expression) as expression_profile:
+        pattern_profile.children.append(expression_profile)
+        yield from pattern_profile.counted(pattern.answers)(use_join)
+
+
+def profile(prepared: PreparedQuery, use_joins: bool = True) -> OperatorProfile:
+    """
+    Evaluates a prepared query once with every operator instrumented and returns the profile tree.
+
+    The root covers building the distinct answers, its children the conjunctive patterns, and their
+    children the operators of the EQL expressions down to the variables that enumerate their domains.
+    Instrumentation adds a constant cost to every binding, so the times are meant to be compared
+    with each other rather than with the latencies of the benchmark.
+
+    :param use_joins: Whether to evaluate relation memberships by following the relations
+    """
+    root = OperatorProfile(f"EQLQuery q{prepared.query.sparql_query.number}", calls=1)
+    start = time.perf_counter()
+    distinct = {
+        tuple(entity.identifier for entity in answer)
+        for index, pattern in enumerate(prepared.patterns)
+        for answer in profiled_answers(index, pattern, use_joins, root)
+    }
+    root.seconds = time.perf_counter() - start
+    root.answers = len(distinct)
+    return root
@@ -0,0 +1,170 @@
+from __future__ import annotations
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from itertools import count
+from pathlib import Path
+from typing import Callable, FrozenSet, Iterable, Optional, Tuple
+
+from krrood.entity_query_language.predicate import Symbol
+from rdflib import Graph
+from sqlalchemy import Connection
+
+from .eql_queries import EQLQuery
+from .models import World, WorldIndex
+from .results import normalized
+from .sparql_queries import SPARQLQuery
+from .sql_queries import SQLQuery
+
+Answers = FrozenSet[Tuple[str, ...]]
+
+world_serials = count()
+"""
+Source of the serial numbers that tell worlds apart for the lifetime of the process.
+"""
+
+
+@dataclass
+class WorldSerial(WorldIndex):
+    """
+    A serial number of a world that, unlike its ``id``, is never reused by another world.
+    """
+
+    serial: int = field(default_factory=lambda: next(world_serials))
+
+    @classmethod
+    def from_world(cls, world: World) -> WorldSerial:
+        return cls()
+
+    def entity_added(self, entity: Symbol, parent: Optional[Symbol]) -> None:
+        pass
+
+
+def file_fingerprint(path: Path) -> str:
+    """
+    Returns a fingerprint of the content of a dataset file.
+    """
+    digest = blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        while chunk := file.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """
+    Identifies the answers of a query by one engine over one state of a dataset.
+
+    :param number: The number of the query
+    :param engine: The engine that computed the answers
+    :param fingerprint: Identifies the dataset
+    :param version: The version of the dataset, advanced by every change
+    :param persistent: Whether the fingerprint stays valid across processes, so the answers may be stored on disk
+    """
+
+    number: int
+    engine: str
+    fingerprint: str
+    version: int = 0
+    persistent: bool = True
+
+    @property
+    def file_name(self) -> str:
+        return f"q{self.number}-{self.engine}-{self.fingerprint}-{self.version}.json"
+
+    def supersedes(self, other: CacheKey) -> bool:
+        """
+        Returns whether this key belongs to a newer version of the dataset of the other key.
+        """
+        return (self.number, self.engine, self.fingerprint) == (
+            other.number,
+            other.engine,
+            other.fingerprint,
+        ) and self.version > other.version
+
+
+@dataclass
+class ResultCache:
+    """
+    Bounded cache of distinct query answers that evicts the least recently used entry.
+
+    Answers over a world are keyed by its serial and version, so changes made through the mutation
+    API of the world are never answered from the cache. Answers over files are keyed by the
+    fingerprint of their content and are also stored in ``directory`` if one is given.
+
+    :param capacity: Maximum number of answer sets held in memory
+    :param directory: Directory to store the answers of persistent keys in, memory only if None
+    """
+
+    capacity: int = 64
+    directory: Optional[Path] = None
+    entries: OrderedDict[CacheKey, Answers] = field(default_factory=OrderedDict)
+    hits: int = 0
+    misses: int = 0
+
+    def answers(
+        self, key: CacheKey, compute: Callable[[], Iterable[Tuple[str, ...]]], bypass: bool = False
+    ) -> Answers:
+        """
+        Returns the cached answers of the key, computing and caching them if they are not known.
+
+        :param compute: Returns the answers as tuples of identifiers
+        :param bypass: Whether to compute the answers without reading or filling the cache, as for benchmarks
+        """
+        if bypass:
+            return frozenset(compute())
+        answers = self.entries.get(key)
+        if answers is None:
+            answers = self._load(key)
+        if answers is None:
+            self.misses += 1
+            answers = frozenset(compute())
+            self._save(key, answers)
+        else:
+            self.hits += 1
+        self._remember(key, answers)
+        return answers
+
+    def eql_answers(self, query: EQLQuery, world: World, bypass: bool = False) -> Answers:
+        key = CacheKey(
+            query.sparql_query.number, "eql", str(world.index(WorldSerial).serial), world.version, persistent=False
+        )
+        return self.answers(key, lambda: query.results(world), bypass)
+
+    def sparql_answers(self, query: SPARQLQuery, graph: Graph, fingerprint: str, bypass: bool = False) -> Answers:
+        """
+        :param fingerprint: Identifies the graph, such as the ``file_fingerprint`` of the file it was loaded from
+        """
+        key = CacheKey(query.number, "sparql", fingerprint)
+        return self.answers(key, lambda: (tuple(map(normalized, row)) for row in query.rows(graph)), bypass)
+
+    def sql_answers(self, query: SQLQuery, connection: Connection, fingerprint: str, bypass: bool = False) -> Answers:
+        """
+        :param fingerprint: Identifies the data in the database
+        """
+        key = CacheKey(query.sparql_query.number, "sql", fingerprint)
+        return self.answers(key, lambda: query.results(connection), bypass)
+
+    def _remember(self, key: CacheKey, answers: Answers) -> None:
+        for superseded in [cached for cached in self.entries if key.supersedes(cached)]:
+            del self.entries[superseded]
+        self.entries[key] = answers
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def _load(self, key: CacheKey) -> Optional[Answers]:
+        if self.directory is None or not key.persistent:
+            return None
+        path = self.directory / key.file_name
+        if not path.exists():
+            return None
+        return frozenset(map(tuple, json.loads(path.read_text(encoding="utf-8"))))
+
+    def _save(self, key: CacheKey, answers: Answers) -> None:
+        if self.directory is None or not key.persistent:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / key.file_name).write_text(json.dumps(sorted(answers)), encoding="utf-8")
@@ -0,0 +1,104 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from enum import Enum
+from hashlib import blake2b
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from rdflib import URIRef
+
+from .loader import local_identifier
+
+DIGEST_MODULUS = 1 << 128
+
+
+class ResultMode(Enum):
+    """
+    How a benchmark consumes the answers of a query.
+
+    The SPARQL queries select distinct answers in every mode. An EQL query consisting of several
+    patterns can produce an answer once per pattern, so only ``SET`` counts its distinct answers as
+    ``result_count``; the streaming modes report the number of answers produced as ``produced``.
+    """
+
+    SET = "set"
+    """
+    Collects the distinct answers in memory.
+    """
+    ITERATE = "iterate"
+    """
+    Builds every answer and drops it right away.
+    """
+    COUNT = "count"
+    """
+    Counts the answers without building them.
+    """
+    WRITE = "write"
+    """
+    Writes the answers to a file in chunks.
+    """
+
+
+def write_chunked(rows: Iterable[Sequence[Any]], path: Path, chunk_size: int = 10_000) -> int:
+    """
+    Writes rows as tab separated lines, holding at most ``chunk_size`` rows in memory at a time.
+    Missing values are written as empty fields.
+
+    :return: The number of rows written
+    """
+    rows = iter(rows)
+    count = 0
+    with open(path, "w", encoding="utf-8") as file:
+        while chunk := list(islice(rows, chunk_size)):
+            file.writelines("\t".join("" if value is None else str(value) for value in row) + "\n" for row in chunk)
+            count += len(chunk)
+    return count
+
+
+def normalized(value: Any) -> str:
+    """
+    Returns the identifier an answer value stands for, so that IRIs and entity identifiers agree.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, URIRef):
+        return local_identifier(value)
+    return str(value)
+
+
+@dataclass
+class ResultDigest:
+    """
+    An order-independent digest of the answers of a query that is updated as the answers stream by.
+
+    Every answer is normalized to its identifiers, hashed to 128 bits with BLAKE2b and added modulo
+    2**128. Adding instead of XOR-ing keeps repeated answers from cancelling out, so, barring hash
+    collisions, two digests are equal exactly when the same answers occurred equally often, in any
+    order. Comparing two engines therefore takes constant memory, as long as neither repeats answers.
+
+    :param value: The sum of the answer hashes
+    :param count: The number of answers folded in
+    """
+
+    value: int = 0
+    count: int = 0
+
+    @classmethod
+    def of(cls, rows: Iterable[Sequence[Any]]) -> ResultDigest:
+        digest = cls()
+        digest.update(rows)
+        return digest
+
+    def add(self, row: Sequence[Any]) -> None:
+        data = "\x1f".join(map(normalized, row)).encode("utf-8")
+        answer_hash = int.from_bytes(blake2b(data, digest_size=16).digest(), "little")
+        self.value = (self.value + answer_hash) % DIGEST_MODULUS
+        self.count += 1
+
+    def update(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            self.add(row)
+
+    def hexdigest(self) -> str:
+        return f"{self.value:032x}"
@@ -1,6 +1,28 @@
-from dataclasses import dataclass
+from __future__ import annotations
+import time
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from typing import Collection, Dict, Iterator, List, Optional, Tuple
+
+from rdflib import Graph, RDF
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.evaluate import evalQuery
+from rdflib.plugins.sparql.sparql import Query
+from rdflib.term import Identifier
+
+from .loader import BENCH
+from .results import ResultDigest
+
+NAMESPACES = {"": BENCH, "rdf": RDF}
+"""
+The prefixes the benchmark queries are written against.
+"""
+
+
+class DigestMismatchError(Exception):
+    """
+    Raised when the answers of a query differ from the answers recorded for a dataset.
+    """
 
 
 class OWLProfile(Enum):
@@ -53,6 +75,74 @@ class SPARQLQuery:
     The OWL 2 profiles to which the SPARQL Query is applicable.
     """
 
+    expected_digests: Dict[str, str] = field(default_factory=dict)
+    """
+    Hex digests of the answers on reference datasets, keyed by the name of the dataset.
+    """
+
+    prepared_query: Optional[PreparedQuery] = field(default=None, init=False, repr=False, compare=False)
+    """
+    The parsed and algebrized query, once it was prepared in this process.
+    """
+
+    def prepare(self) -> PreparedQuery:
+        """
+        Returns the query parsed and translated to SPARQL algebra with the benchmark prefixes bound,
+        doing so only on the first call in this process.
+        """
+        if self.prepared_query is None:
+            start = time.perf_counter()
+            query = prepareQuery(self.query, initNs=NAMESPACES)
+            self.prepared_query = PreparedQuery(query, time.perf_counter() - start)
+        return self.prepared_query
+
+    def rows(self, graph: Graph) -> Iterator[Tuple[Optional[Identifier], ...]]:
+        """
+        Yields the answers over the graph one by one in the order of the selected variables.
+        Unlike iterating the result of ``Graph.query``, the answers are not retained here, although
+        RDFLib still remembers the answers of a ``DISTINCT`` query to remove duplicates.
+        """
+        result = evalQuery(graph, self.prepare().query, {})
+        variables = result["vars_"]
+        for bindings in result["bindings"]:
+            if bindings:
+                yield tuple(bindings.get(variable) for variable in variables)
+
+    def count(self, graph: Graph) -> int:
+        """
+        Returns the number of answers over the graph without building rows for them.
+        """
+        return sum(1 for bindings in evalQuery(graph, self.prepare().query, {})["bindings"] if bindings)
+
+    def digest(self, graph: Graph) -> ResultDigest:
+        """
+        Returns the digest of the answers over the graph, computed while they stream by.
+        """
+        return ResultDigest.of(self.rows(graph))
+
+    def verify_digest(self, dataset: str, digest: ResultDigest) -> None:
+        """
+        Raises ``DigestMismatchError`` if a digest is recorded for the dataset and differs from the given one.
+        """
+        expected = self.expected_digests.get(dataset)
+        if expected is not None and expected != digest.hexdigest():
+            raise DigestMismatchError(
+                f"Query {self.number} on {dataset} has digest {digest.hexdigest()}, expected {expected}."
+            )
+
+
+@dataclass(frozen=True)
+class PreparedQuery:
+    """
+    A SPARQL query that is ready to be evaluated repeatedly.
+
+    :param query: The algebra of the query
+    :param preparation_seconds: Seconds taken to parse the query and translate it to algebra
+    """
+
+    query: Query
+    preparation_seconds: float
+
 
 q1 = SPARQLQuery(
     number=1,
@@ -299,3 +389,17 @@ all_queries = [
     q21,
     q22,
 ]
+
+
+def suite(profile: Optional[OWLProfile] = None, numbers: Optional[Collection[int]] = None) -> List[SPARQLQuery]:
+    """
+    Returns the queries that are applicable to the profile and have one of the numbers.
+
+    :param profile: The profile of the dataset, all profiles if None
+    :param numbers: The numbers of the queries, all numbers if None
+    """
+    return [
+        query
+        for query in all_queries
+        if (profile is None or profile in query.profile) and (numbers is None or query.number in numbers)
+    ]
@@ -0,0 +1,215 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import Connection, CTE, Select, literal, select, union
+from sqlalchemy.orm import aliased
+
+from .eql_queries import UnsupportedQueryError, unsupported_queries
+from .orm.ormatic_interface import (
+    CollegeDAO,
+    DepartmentDAO,
+    EmployeeDAO,
+    PersonDAO,
+    ResearchGroupDAO,
+    StudentDAO,
+    UniversityDAO,
+)
+from .results import ResultDigest
+from . import sparql_queries
+
+
+@dataclass
+class SQLQuery:
+
+    sparql_query: sparql_queries.SPARQLQuery
+    """
+    The sparql query this represents.
+    """
+
+    statement: Select
+    """
+    A SQLAlchemy Core statement over the ORMatic schema that selects the identifiers of the answers.
+    """
+
+    def results(self, connection: Connection) -> Set[Tuple[str, ...]]:
+        """
+        Returns the distinct answers as tuples of identifiers in the order of the selected columns.
+        """
+        return {tuple(row) for row in connection.execute(self.statement)}
+
+    def digest(self, connection: Connection) -> ResultDigest:
+        """
+        Returns the digest of the answers, computed while they stream by. The statements select distinct answers.
+        """
+        return ResultDigest.of(connection.execute(self.statement))
+
+
+STUDENT_DEPARTMENTS = (
+    StudentDAO.departmentdao_undergraduate_students_id,
+    StudentDAO.departmentdao_postgraduate_students_id,
+    StudentDAO.departmentdao_phd_students_id,
+)
+
+
+def part_of_edges() -> CTE:
+    """
+    The direct ``isPartOf`` relation between organizations as pairs of identifiers.
+    """
+    university = aliased(UniversityDAO)
+    college = aliased(CollegeDAO)
+    department = aliased(DepartmentDAO)
+    group = aliased(ResearchGroupDAO)
+    return union(
+        select(college.identifier.label("part"), university.identifier.label("whole")).join(
+            university, college.universitydao_colleges_id == university.database_id
+        ),
+        select(department.identifier, college.identifier).join(
+            college, department.collegedao_departments_id == college.database_id
+        ),
+        select(group.identifier, department.identifier).join(
+            department, group.departmentdao_research_groups_id == department.database_id
+        ),
+    ).cte("part_of_edges")
+
+
+def part_of_closure() -> CTE:
+    """
+    The transitive closure of ``isPartOf`` as a recursive common table expression.
+    """
+    edges = part_of_edges()
+    closure = select(edges.c.part, edges.c.whole).cte("part_of", recursive=True)
+    step = select(closure.c.part, edges.c.whole).join(edges, edges.c.part == closure.c.whole)
+    return closure.union(step)
+
+
+def direct_memberships() -> CTE:
+    """
+    The persons that study or work in a department or belong to a research group, paired with
+    the identifier of that organization.
+    """
+    person = aliased(PersonDAO)
+    department = aliased(DepartmentDAO)
+    members = [
+        select(person.identifier.label("member"), department.identifier.label("organization"))
+        .join(StudentDAO, StudentDAO.person_id == person.database_id)
+        .join(department, student_department == department.database_id)
+        for student_department in STUDENT_DEPARTMENTS
+    ]
+    members.append(
+        select(person.identifier, department.identifier)
+        .join(EmployeeDAO, EmployeeDAO.person_id == person.database_id)
+        .join(department, EmployeeDAO.departmentdao_employees_id == department.database_id)
+    )
+    members.append(
+        select(person.identifier, ResearchGroupDAO.identifier).join(
+            ResearchGroupDAO, person.researchgroupdao_members_id == ResearchGroupDAO.database_id
+        )
+    )
+    return union(*members).cte("direct_memberships")
+
+
+def q1_statement() -> Select:
+    knower = aliased(PersonDAO, name="knower")
+    known = aliased(PersonDAO, name="known")
+    return (
+        select(knower.identifier, known.identifier)
+        .join(known, known.persondao_knows_id == knower.database_id)
+        .distinct()
+    )
+
+
+def q2_statement() -> Select:
+    memberships = direct_memberships()
+    closure = part_of_closure()
+    inherited = select(memberships.c.member, closure.c.whole).join(
+        closure, closure.c.part == memberships.c.organization
+    )
+    return union(select(memberships.c.member, memberships.c.organization), inherited)
+
+
+def q3_statement() -> Select:
+    closure = part_of_closure()
+    return select(closure.c.part, closure.c.whole).distinct()
+
+
+def q6_statement() -> Select:
+    return select(PersonDAO.identifier).where(PersonDAO.persondao_knows_id == PersonDAO.database_id).distinct()
+
+
+def q11_statement() -> Select:
+    student = aliased(PersonDAO, name="student")
+    advisor = aliased(PersonDAO, name="advisor")
+    return (
+        select(student.identifier, advisor.identifier)
+        .join(StudentDAO, StudentDAO.person_id == student.database_id)
+        .join(advisor, advisor.studentdao_advisors_id == StudentDAO.database_id)
+        .distinct()
+    )
+
+
+def q12_statement() -> Select:
+    return select(PersonDAO.identifier).distinct()
+
+
+def q13_statement() -> Select:
+    return select(CollegeDAO.identifier).where(CollegeDAO.is_women_only == literal(True)).distinct()
+
+
+def q17_statement() -> Select:
+    return (
+        select(PersonDAO.identifier)
+        .join(StudentDAO, StudentDAO.person_id == PersonDAO.database_id)
+        .where(
+            StudentDAO.departmentdao_undergraduate_students_id.is_not(None) | (StudentDAO.level == "ug")
+        )
+        .distinct()
+    )
+
+
+def q19_statement() -> Select:
+    return (
+        select(PersonDAO.identifier)
+        .join(EmployeeDAO, EmployeeDAO.person_id == PersonDAO.database_id)
+        .where(EmployeeDAO.role == "faculty")
+        .distinct()
+    )
+
+
+def q20_statement() -> Select:
+    first = aliased(PersonDAO, name="first")
+    second = aliased(PersonDAO, name="second")
+    return (
+        select(first.identifier, second.identifier)
+        .join(second, first.hometown == second.hometown)
+        .where(first.hometown.is_not(None), first.identifier != second.identifier)
+        .distinct()
+    )
+
+
+q1 = SQLQuery(sparql_queries.q1, q1_statement())
+q2 = SQLQuery(sparql_queries.q2, q2_statement())
+q3 = SQLQuery(sparql_queries.q3, q3_statement())
+q6 = SQLQuery(sparql_queries.q6, q6_statement())
+q11 = SQLQuery(sparql_queries.q11, q11_statement())
+q12 = SQLQuery(sparql_queries.q12, q12_statement())
+q13 = SQLQuery(sparql_queries.q13, q13_statement())
+q17 = SQLQuery(sparql_queries.q17, q17_statement())
+q19 = SQLQuery(sparql_queries.q19, q19_statement())
+q20 = SQLQuery(sparql_queries.q20, q20_statement())
+
+all_queries: List[SQLQuery] = [q1, q2, q3, q6, q11, q12, q13, q17, q19, q20]
+
+queries_by_number: Dict[int, SQLQuery] = {query.sparql_query.number: query for query in all_queries}
+"""
+The SQL queries keyed by the number of the SPARQL query they represent.
+"""
+
+
+def query_for(number: int) -> SQLQuery:
+    """
+    Returns the SQL query representing the SPARQL query with the given number.
+    """
+    if number in unsupported_queries:
+        raise UnsupportedQueryError(f"Query {number} has no SQL counterpart: {unsupported_queries[number]}")
+    return queries_by_number[number]
@@ -0,0 +1,160 @@
+from __future__ import annotations
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from krrood.entity_query_language.predicate import Symbol
+
+from .models import (
+    World,
+    WorldIndex,
+    University,
+    College,
+    Department,
+    Program,
+    Course,
+    Publication,
+    Person,
+    Student,
+    Employee,
+    ResearchGroup,
+)
+from .entity_set import EntityNumbering, EntitySet
+
+
+class UnknownClassError(Exception):
+    """
+    Raised when a class name is not defined in the type index.
+    """
+
+
+@dataclass(frozen=True)
+class ClassDefinition:
+    """
+    Derives membership of an OWL2Bench class from model attributes.
+
+    :param name: The OWL2Bench class name
+    :param entity_types: Model types whose instances may belong to the class
+    :param condition: Additional condition an instance has to satisfy
+    """
+
+    name: str
+    entity_types: Tuple[Type[Symbol], ...]
+    condition: Callable[[Symbol], bool] = lambda entity: True
+
+
+OWL2BENCH_CLASSES: Tuple[ClassDefinition, ...] = (
+    ClassDefinition("Organization", (University, College, Department, ResearchGroup)),
+    ClassDefinition("University", (University,)),
+    ClassDefinition("College", (College,)),
+    ClassDefinition("WomanCollege", (College,), lambda college: college.is_women_only),
+    ClassDefinition("Department", (Department,)),
+    ClassDefinition("ResearchGroup", (ResearchGroup,)),
+    ClassDefinition("Program", (Program,)),
+    ClassDefinition("Course", (Course,)),
+    ClassDefinition("Publication", (Publication,)),
+    ClassDefinition("Person", (Person,)),
+    ClassDefinition("Woman", (Person,), lambda person: person.is_woman),
+    ClassDefinition("Man", (Person,), lambda person: not person.is_woman),
+    ClassDefinition(
+        "SelfAwarePerson",
+        (Person,),
+        lambda person: any(known is person for known in person.knows),
+    ),
+    ClassDefinition("Student", (Student,)),
+    ClassDefinition("UGStudent", (Student,), lambda student: student.level == "ug"),
+    ClassDefinition("PGStudent", (Student,), lambda student: student.level == "pg"),
+    ClassDefinition("PhDStudent", (Student,), lambda student: student.level == "phd"),
+    ClassDefinition("Employee", (Employee,)),
+    ClassDefinition("Faculty", (Employee,), lambda employee: employee.role == "faculty"),
+)
+"""
+The OWL2Bench classes whose membership can be derived from the ``World`` model.
+"""
+
+
+@dataclass
+class TypeIndex(WorldIndex):
+    """
+    Precomputed ``rdf:type`` answers that map OWL2Bench class names to their individuals.
+
+    Students and employees are roles of persons, hence their individuals are the persons
+    playing them. Additions are buffered per class and merged into its set when it is read,
+    so a batch of additions copies each bitset once.
+    """
+
+    numbering: EntityNumbering = field(default_factory=EntityNumbering)
+    definitions: Tuple[ClassDefinition, ...] = OWL2BENCH_CLASSES
+    classes: Dict[str, EntitySet] = field(default_factory=dict)
+    pending: Dict[str, List[int]] = field(default_factory=lambda: defaultdict(list), repr=False)
+    """
+    Numbers of individuals added to each class since the class was last read.
+    """
+    _definitions_by_type: Dict[type, List[ClassDefinition]] = field(
+        default_factory=dict, repr=False
+    )
+
+    @classmethod
+    def from_world(cls, world: World) -> TypeIndex:
+        """
+        Classifies every entity of the world in one pass and keeps the index updated on additions.
+        """
+        index = cls(numbering=EntityNumbering.from_world(world))
+        members: Dict[str, List[int]] = {definition.name: [] for definition in index.definitions}
+        for entity in chain(
+            world.universities,
+            world.colleges,
+            world.departments,
+            world.research_groups,
+            world.programs,
+            world.courses,
+            world.publications,
+            world.persons,
+            world.students,
+            world.employees,
+        ):
+            number = index.numbering.number(index._individual_of(entity))
+            for class_name in index._classes_of(entity):
+                members[class_name].append(number)
+        index.classes = {
+            class_name: EntitySet.from_numbers(index.numbering, numbers)
+            for class_name, numbers in members.items()
+        }
+        world.subscribe(index)
+        return index
+
+    def instances(self, class_name: str) -> EntitySet:
+        """
+        Returns the individuals that belong to the class.
+        """
+        if class_name not in self.classes:
+            raise UnknownClassError(f"Class {class_name} is not defined in the type index.")
+        if class_name in self.pending:
+            self.classes[class_name].update(self.pending.pop(class_name))
+        return self.classes[class_name]
+
+    def entity_added(self, entity: Symbol, parent: Optional[Symbol]) -> None:
+        number = self.numbering.number(self._individual_of(entity))
+        for class_name in self._classes_of(entity):
+            self.pending[class_name].append(number)
+
+    def relation_added(self, person: Person, relation: str, other: Person) -> None:
+        self.entity_added(person, None)
+
+    def _classes_of(self, entity: Symbol) -> Iterator[str]:
+        if type(entity) not in self._definitions_by_type:
+            self._definitions_by_type[type(entity)] = [
+                definition
+                for definition in self.definitions
+                if isinstance(entity, definition.entity_types)
+            ]
+        for definition in self._definitions_by_type[type(entity)]:
+            if definition.condition(entity):
+                yield definition.name
+
+    @staticmethod
+    def _individual_of(entity: Symbol) -> Symbol:
+        if isinstance(entity, (Student, Employee)):
+            return entity.person
+        return entity
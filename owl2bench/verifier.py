@@ -1,8 +1,30 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Set
+import os
+import random
+from abc import ABC, abstractmethod
+from contextlib import closing
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import islice
+from statistics import NormalDist
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Type
 
-from .models import World, University, College, Department, Course, Person
+from krrood.entity_query_language.predicate import Symbol
+
+from .forked_pool import forked_pool, with_worker_state
+from .models import (
+    World,
+    WorldObserver,
+    University,
+    College,
+    Department,
+    Course,
+    Person,
+    PERSON_RELATIONS,
+)
+
+identifier_of = attrgetter("identifier")
 
 
 class RelationshipError(Exception):
@@ -11,148 +33,680 @@ class RelationshipError(Exception):
     """
 
 
+class ProblemKind(Enum):
+    """
+    The invariants checked by the verifiers.
+    """
+
+    DUPLICATE_IDENTIFIER = "duplicate identifier"
+    EMPTY_FIELD = "empty field"
+    NON_BOOLEAN_FIELD = "non-boolean field"
+    DUPLICATE_CHILD = "duplicate child"
+    MULTIPLE_PARENTS = "multiple parents"
+    MISSING_CHILD = "missing child"
+    MISSING_REFERENCE = "missing reference"
+    SELF_REFERENCE = "self reference"
+
+
+IDENTIFIER_SECTION, FIELD_SECTION, CONTAINMENT_SECTION, PRESENCE_SECTION, REFERENCE_SECTION = range(5)
+
+REPORT_ORDER: Dict[ProblemKind, int] = {
+    ProblemKind.DUPLICATE_IDENTIFIER: IDENTIFIER_SECTION,
+    ProblemKind.EMPTY_FIELD: FIELD_SECTION,
+    ProblemKind.NON_BOOLEAN_FIELD: FIELD_SECTION,
+    ProblemKind.DUPLICATE_CHILD: CONTAINMENT_SECTION,
+    ProblemKind.MULTIPLE_PARENTS: CONTAINMENT_SECTION,
+    ProblemKind.MISSING_CHILD: PRESENCE_SECTION,
+    ProblemKind.MISSING_REFERENCE: REFERENCE_SECTION,
+    ProblemKind.SELF_REFERENCE: REFERENCE_SECTION,
+}
+"""
+The section of a ``RelationshipError`` each kind of problem is reported in. The sections follow the
+order in which the checks used to run one after another: identifiers, fields, containment, presence
+of children and person references.
+"""
+
+
+@dataclass(frozen=True)
+class Problem:
+    """
+    A violated invariant.
+
+    :param kind: The violated invariant
+    :param entity: Identifier of the entity that violates it
+    :param relation: Name of the collection, relation or field involved, if any
+    :param message: Human readable description
+    """
+
+    kind: ProblemKind
+    entity: str
+    relation: Optional[str]
+    message: str
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def report_lines(problems: Iterable[Problem]) -> List[str]:
+    """
+    Returns the messages of the problems grouped into the sections of ``REPORT_ORDER``, keeping the
+    order of the problems within a section.
+    """
+    return [problem.message for problem in sorted(problems, key=lambda problem: REPORT_ORDER[problem.kind])]
+
+
+@dataclass(frozen=True)
+class Containment:
+    """
+    A containment relation whose children have to be unique, have a single parent and be
+    present in the world.
+
+    :param parent_kind: Singular name of the parent type
+    :param parent_kind_plural: Plural name of the parent type
+    :param child_kind: Name of the child type
+    :param collection: Name of the world collection holding the children
+    :param children: Returns the children of a parent
+    """
+
+    parent_kind: str
+    parent_kind_plural: str
+    child_kind: str
+    collection: str
+    children: Callable[[Symbol], Sequence[Symbol]]
+
+
+@dataclass(frozen=True)
+class EntityKind:
+    """
+    A type of entity together with the invariants checked for each of its instances.
+
+    :param name: Name of the type used in problem descriptions
+    :param collection: Name of the world collection holding the instances
+    :param display_field: Returns the field that must not be empty
+    :param display_field_name: Name of the field that must not be empty
+    :param containment: The containment relation of its children, if any
+    """
+
+    name: str
+    collection: str
+    display_field: Callable[[Symbol], str]
+    display_field_name: str
+    containment: Optional[Containment] = None
+
+
+UNIVERSITY = EntityKind(
+    "University",
+    "universities",
+    attrgetter("name"),
+    "name",
+    Containment("university", "universities", "College", "colleges", attrgetter("colleges")),
+)
+COLLEGE = EntityKind(
+    "College",
+    "colleges",
+    attrgetter("name"),
+    "name",
+    Containment("college", "colleges", "Department", "departments", attrgetter("departments")),
+)
+DEPARTMENT = EntityKind(
+    "Department",
+    "departments",
+    attrgetter("name"),
+    "name",
+    Containment("department", "departments", "Course", "courses", attrgetter("courses")),
+)
+COURSE = EntityKind("Course", "courses", attrgetter("title"), "title")
+ORGANIZATION_KINDS = (UNIVERSITY, COLLEGE, DEPARTMENT, COURSE)
+KIND_OF_TYPE: Dict[Type[Symbol], EntityKind] = {
+    University: UNIVERSITY,
+    College: COLLEGE,
+    Department: DEPARTMENT,
+    Course: COURSE,
+}
+
+person_relations = attrgetter(*PERSON_RELATIONS)
+
+
+@dataclass
+class VerificationPass:
+    """
+    A single verification of one world that builds every identifier set exactly once. It is the
+    engine shared by every verifier of this module: the tasks it splits into are sharded across
+    processes, checked only for additions, sampled or stopped after a number of problems.
+
+    It checks the same invariants in the same time as the verifier that walked each collection
+    several times. Most of that time goes to following the references between persons, which the
+    single pass does not reduce.
+    """
+
+    world: World
+    identifiers: Dict[str, Set[str]]
+    """
+    The identifiers of every collection of the world, keyed by collection name.
+    """
+    parents: Dict[str, Dict[str, Symbol]] = field(default_factory=dict)
+    """
+    The parent of every contained child seen so far, keyed by the collection name of the children.
+    """
+
+    @classmethod
+    def prepare(cls, world: World) -> VerificationPass:
+        return cls(
+            world,
+            {
+                "universities": set(map(identifier_of, world.universities)),
+                "colleges": set(map(identifier_of, world.colleges)),
+                "departments": set(map(identifier_of, world.departments)),
+                "courses": set(map(identifier_of, world.courses)),
+                "persons": set(map(identifier_of, world.persons)),
+            },
+        )
+
+    def problems(self) -> Iterator[Problem]:
+        """
+        Yields a description of every violated invariant in the order of the report, section by
+        section, so that the first problems are the first lines of the full report.
+        """
+        yield from self.identity_problems()
+        for task in self.tasks(len(self.world.persons) or 1):
+            yield from task.problems(self)
+
+    def identity_problems(self) -> Iterator[Problem]:
+        """
+        Yields the duplicate identifiers of every collection.
+        """
+        for kind in ORGANIZATION_KINDS:
+            yield from self.duplicates(attrgetter(kind.collection)(self.world), kind.name, kind.collection)
+        yield from self.duplicates(self.world.persons, "Person", "persons")
+
+    def tasks(self, shard_size: int) -> List[VerificationTask]:
+        """
+        Splits the checks after the identifiers into independent tasks whose problems, concatenated
+        in order, equal those of a sequential pass and follow the sections of the report.
+
+        :param shard_size: Maximum number of persons checked by one task
+        """
+        shards = [
+            (start, min(start + shard_size, len(self.world.persons)))
+            for start in range(0, len(self.world.persons), shard_size)
+        ]
+        return [
+            *(OrganizationCheck(kind, FIELD_SECTION) for kind in ORGANIZATION_KINDS),
+            *(PersonShard(start, stop, FIELD_SECTION) for start, stop in shards),
+            *(OrganizationCheck(kind, CONTAINMENT_SECTION) for kind in ORGANIZATION_KINDS),
+            *(OrganizationCheck(kind, PRESENCE_SECTION) for kind in ORGANIZATION_KINDS),
+            *(PersonShard(start, stop, REFERENCE_SECTION) for start, stop in shards),
+        ]
+
+    def duplicates(self, entities: Sequence[Symbol], name: str, collection: str) -> Iterator[Problem]:
+        if len(self.identifiers[collection]) == len(entities):
+            return
+        seen: Set[str] = set()
+        for identifier in map(identifier_of, entities):
+            if identifier in seen:
+                yield self.duplicate_identifier(identifier, name, collection)
+            seen.add(identifier)
+
+    @staticmethod
+    def duplicate_identifier(identifier: str, name: str, collection: str) -> Problem:
+        return Problem(
+            ProblemKind.DUPLICATE_IDENTIFIER, identifier, collection, f"Duplicate {name} identifier: {identifier}"
+        )
+
+    def organizations(self, entities: Sequence[Symbol], kind: EntityKind, section: int) -> Iterator[Problem]:
+        """
+        Yields the problems of the organizations that belong to one section of the report.
+        """
+        if section == FIELD_SECTION:
+            for entity in entities:
+                if not kind.display_field(entity):
+                    yield self.empty_display_field(entity, kind)
+        elif kind.containment is not None:
+            for entity in entities:
+                yield from self.children(entity, kind.containment, section)
+
+    @staticmethod
+    def empty_display_field(entity: Symbol, kind: EntityKind) -> Problem:
+        return Problem(
+            ProblemKind.EMPTY_FIELD,
+            entity.identifier,
+            kind.display_field_name,
+            f"{kind.name} {entity.identifier} has empty {kind.display_field_name}",
+        )
+
+    def children(self, parent: Symbol, containment: Containment, section: int) -> Iterator[Problem]:
+        if section == PRESENCE_SECTION:
+            for child in containment.children(parent):
+                yield from self.presence(parent, child, containment)
+            return
+        seen: Set[str] = set()
+        for child in containment.children(parent):
+            yield from self.placement(parent, child, containment, child.identifier in seen)
+            seen.add(child.identifier)
+
+    def child(self, parent: Symbol, child: Symbol, containment: Containment, repeated: bool) -> Iterator[Problem]:
+        """
+        Yields the problems of one occurrence of a child under a parent.
+
+        :param repeated: Whether the child occurred under the same parent before
+        """
+        yield from self.placement(parent, child, containment, repeated)
+        yield from self.presence(parent, child, containment)
+
+    def placement(self, parent: Symbol, child: Symbol, containment: Containment, repeated: bool) -> Iterator[Problem]:
+        """
+        Yields the problems of a child occurring twice under a parent or under several parents.
+
+        :param repeated: Whether the child occurred under the same parent before
+        """
+        parents = self.parents.setdefault(containment.collection, {})
+        child_name = containment.child_kind
+        if repeated:
+            yield Problem(
+                ProblemKind.DUPLICATE_CHILD,
+                parent.identifier,
+                containment.collection,
+                f"Duplicate {child_name.lower()} {child.identifier} "
+                f"under {containment.parent_kind} {parent.identifier}",
+            )
+        if child.identifier in parents:
+            yield Problem(
+                ProblemKind.MULTIPLE_PARENTS,
+                child.identifier,
+                containment.collection,
+                f"{child_name} {child.identifier} appears under multiple {containment.parent_kind_plural}: "
+                f"{parents[child.identifier].identifier} and {parent.identifier}",
+            )
+        else:
+            parents[child.identifier] = parent
+
+    def presence(self, parent: Symbol, child: Symbol, containment: Containment) -> Iterator[Problem]:
+        child_name = containment.child_kind
+        if child.identifier not in self.identifiers[containment.collection]:
+            yield Problem(
+                ProblemKind.MISSING_CHILD,
+                parent.identifier,
+                containment.collection,
+                f"{child_name} {child.identifier} under {containment.parent_kind} {parent.identifier} "
+                f"is not in world.{containment.collection}",
+            )
+
+    def persons(self, persons: Sequence[Person]) -> Iterator[Problem]:
+        """
+        Yields the problems of the fields of persons, then those of their references.
+        """
+        yield from self.person_fields(persons)
+        yield from self.person_references(persons)
+
+    @staticmethod
+    def person_fields(persons: Sequence[Person]) -> Iterator[Problem]:
+        for person in persons:
+            identifier = person.identifier
+            if not person.first_name or not person.last_name or not person.email:
+                yield Problem(
+                    ProblemKind.EMPTY_FIELD, identifier, None, f"Person {identifier} has missing required fields"
+                )
+            if not isinstance(person.is_woman, bool):
+                yield Problem(
+                    ProblemKind.NON_BOOLEAN_FIELD,
+                    identifier,
+                    "is_woman",
+                    f"Person {identifier} has non-boolean is_woman",
+                )
+
+    def person_references(self, persons: Sequence[Person]) -> Iterator[Problem]:
+        """
+        Yields the problems of references of persons, describing references only for persons that have invalid ones.
+        """
+        person_identifiers = self.identifiers["persons"]
+        for person in persons:
+            if self.has_invalid_reference(person, person.identifier, person_identifiers):
+                yield from self.references(person)
+
+    @staticmethod
+    def has_invalid_reference(person: Person, identifier: str, person_identifiers: Set[str]) -> bool:
+        for others in person_relations(person):
+            for other in others:
+                other_identifier = other.identifier
+                if other_identifier not in person_identifiers or other_identifier == identifier:
+                    return True
+        return False
+
+    def references(self, person: Person) -> Iterator[Problem]:
+        """
+        Describes every invalid reference of a person to other persons.
+        """
+        for relation, others in zip(PERSON_RELATIONS, person_relations(person)):
+            for other in others:
+                yield from self.reference(person, relation, other)
+
+    def reference(self, person: Person, relation: str, other: Person) -> Iterator[Problem]:
+        if other.identifier not in self.identifiers["persons"]:
+            yield Problem(
+                ProblemKind.MISSING_REFERENCE,
+                person.identifier,
+                relation,
+                f"Person {person.identifier} has {relation} that is not in world.persons: "
+                f"{other.identifier}",
+            )
+        if other.identifier == person.identifier:
+            yield Problem(
+                ProblemKind.SELF_REFERENCE,
+                person.identifier,
+                relation,
+                f"Person {person.identifier} has self in {relation}",
+            )
+
+
+class VerificationTask(ABC):
+    """
+    A part of a verification pass that can be checked independently of the other parts.
+    """
+
+    @abstractmethod
+    def problems(self, verification: VerificationPass) -> Iterator[Problem]:
+        """
+        Yields the problems found by this task.
+        """
+
+
+@dataclass(frozen=True)
+class OrganizationCheck(VerificationTask):
+    """
+    Checks the invariants of one section of the report for every instance of an entity kind.
+    """
+
+    kind: EntityKind
+    section: int
+
+    def problems(self, verification: VerificationPass) -> Iterator[Problem]:
+        entities = attrgetter(self.kind.collection)(verification.world)
+        return verification.organizations(entities, self.kind, self.section)
+
+
+@dataclass(frozen=True)
+class PersonShard(VerificationTask):
+    """
+    Checks either the fields or the references of the persons at the positions ``[start, stop)``
+    of ``world.persons``.
+    """
+
+    start: int
+    stop: int
+    section: int
+
+    def problems(self, verification: VerificationPass) -> Iterator[Problem]:
+        persons = verification.world.persons[self.start : self.stop]
+        if self.section == FIELD_SECTION:
+            return verification.person_fields(persons)
+        return verification.person_references(persons)
+
+
 @dataclass(frozen=True)
 class WorldVerifier:
     """
     Verifies referential integrity and basic invariants across a ``World``.
 
-    Raises ``RelationshipError`` if any violation is found.
+    Raises ``RelationshipError`` if any violation is found. Problems are found lazily in the order
+    of the report, so a bounded verification stops as soon as the limit is reached and reports the
+    first lines of the full report.
+
+    :param max_problems: Maximum number of problems to report, all if ``None``
+    :param fail_fast: Whether to stop at the first problem
     """
 
+    max_problems: Optional[int] = None
+    fail_fast: bool = False
+
     def verify(self, world: World) -> None:
-        problems: List[str] = []
-
-        # 1) Uniqueness per type
-        problems += self._check_unique([u.identifier for u in world.universities], "University")
-        problems += self._check_unique([c.identifier for c in world.colleges], "College")
-        problems += self._check_unique([d.identifier for d in world.departments], "Department")
-        problems += self._check_unique([c.identifier for c in world.courses], "Course")
-        problems += self._check_unique([p.identifier for p in world.persons], "Person")
-
-        # 2) Non-empty display fields
-        for u in world.universities:
-            if not u.name:
-                problems.append(f"University {u.identifier} has empty name")
-        for c in world.colleges:
-            if not c.name:
-                problems.append(f"College {c.identifier} has empty name")
-        for d in world.departments:
-            if not d.name:
-                problems.append(f"Department {d.identifier} has empty name")
-        for crs in world.courses:
-            if not crs.title:
-                problems.append(f"Course {crs.identifier} has empty title")
-        for p in world.persons:
-            if not p.first_name or not p.last_name or not p.email:
-                problems.append(f"Person {p.identifier} has missing required fields")
-            if not isinstance(p.is_woman, bool):
-                problems.append(f"Person {p.identifier} has non-boolean is_woman")
-
-        # 3) Build parent maps from containment
-        college_parent: Dict[str, University] = {}
-        department_parent: Dict[str, College] = {}
-        course_parent: Dict[str, Department] = {}
-
-        # Universities → Colleges
-        for u in world.universities:
-            seen: Set[str] = set()
-            for c in u.colleges:
-                if c.identifier in seen:
-                    problems.append(f"Duplicate college {c.identifier} under university {u.identifier}")
-                seen.add(c.identifier)
-                if c.identifier in college_parent:
-                    problems.append(
-                        f"College {c.identifier} appears under multiple universities: "
-                        f"{college_parent[c.identifier].identifier} and {u.identifier}"
-                    )
-                else:
-                    college_parent[c.identifier] = u
-
-        # Colleges → Departments
-        for c in world.colleges:
-            seen: Set[str] = set()
-            for d in c.departments:
-                if d.identifier in seen:
-                    problems.append(f"Duplicate department {d.identifier} under college {c.identifier}")
-                seen.add(d.identifier)
-                if d.identifier in department_parent:
-                    problems.append(
-                        f"Department {d.identifier} appears under multiple colleges: "
-                        f"{department_parent[d.identifier].identifier} and {c.identifier}"
-                    )
-                else:
-                    department_parent[d.identifier] = c
-
-        # Departments → Courses
-        for d in world.departments:
-            seen: Set[str] = set()
-            for crs in d.courses:
-                if crs.identifier in seen:
-                    problems.append(f"Duplicate course {crs.identifier} under department {d.identifier}")
-                seen.add(crs.identifier)
-                if crs.identifier in course_parent:
-                    problems.append(
-                        f"Course {crs.identifier} appears under multiple departments: "
-                        f"{course_parent[crs.identifier].identifier} and {d.identifier}"
-                    )
-                else:
-                    course_parent[crs.identifier] = d
-
-        # 4) Cross-collection presence
-        def idset(xs):
-            return {x.identifier for x in xs}
-
-        world_colleges = idset(world.colleges)
-        world_depts = idset(world.departments)
-        world_courses = idset(world.courses)
-        for u in world.universities:
-            for c in u.colleges:
-                if c.identifier not in world_colleges:
-                    problems.append(
-                        f"College {c.identifier} under university {u.identifier} is not in world.colleges"
-                    )
-        for c in world.colleges:
-            for d in c.departments:
-                if d.identifier not in world_depts:
-                    problems.append(
-                        f"Department {d.identifier} under college {c.identifier} is not in world.departments"
-                    )
-        for d in world.departments:
-            for crs in d.courses:
-                if crs.identifier not in world_courses:
-                    problems.append(
-                        f"Course {crs.identifier} under department {d.identifier} is not in world.courses"
-                    )
-
-        # 5) Person relationship sanity
-        person_ids = idset(world.persons)
-
-        def check_person_list(owner: Person, rel_name: str, lst: Iterable[Person]) -> None:
-            for other in lst:
-                if other.identifier not in person_ids:
-                    problems.append(
-                        f"Person {owner.identifier} has {rel_name} that is not in world.persons: {other.identifier}"
-                    )
-                if other.identifier == owner.identifier:
-                    problems.append(f"Person {owner.identifier} has self in {rel_name}")
-
-        for p in world.persons:
-            check_person_list(p, "knows", p.knows)
-            check_person_list(p, "likes", p.likes)
-            check_person_list(p, "loves", p.loves)
-            check_person_list(p, "dislikes", p.dislikes)
-            check_person_list(p, "is_crazy_about", p.is_crazy_about)
+        limit = 1 if self.fail_fast else self.max_problems
+        with closing(self.problems(world)) as problems:
+            reported = list(islice(problems, limit))
+            truncated = limit is not None and next(problems, None) is not None
+        if not reported:
+            return
+        lines = [problem.message for problem in reported]
+        if truncated:
+            lines.append(f"Stopped after {limit} problems")
+        raise RelationshipError("\n".join(lines))
+
+    def problems(self, world: World) -> Iterator[Problem]:
+        """
+        Yields every violated invariant of the world as soon as it is found, in the order of the report.
+        """
+        return VerificationPass.prepare(world).problems()
+
+
+def wilson_upper_bound(violations: int, trials: int, confidence: float) -> float:
+    """
+    Returns the one-sided Wilson score upper bound of a binomial proportion, so the true
+    proportion lies below it with the given confidence.
+    """
+    if trials == 0:
+        return 1.0
+    z = NormalDist().inv_cdf(confidence)
+    rate = violations / trials
+    center = rate + z * z / (2 * trials)
+    spread = z * (rate * (1 - rate) / trials + z * z / (4 * trials * trials)) ** 0.5
+    return min(1.0, (center + spread) / (1 + z * z / trials))
+
+
+@dataclass(frozen=True)
+class SampleReport:
+    """
+    The outcome of a sampled verification.
+
+    The sample is a cluster sample of persons with all of their relations, so the bound is on the
+    fraction of persons with problems, not on the fraction of relations.
+
+    :param sample_size: Number of persons whose fields and relations were checked
+    :param edges: Number of person relations checked
+    :param violations: Number of sampled persons with at least one problem
+    :param confidence: Confidence level of the upper bound
+    :param upper_bound: Upper confidence bound on the fraction of persons with problems
+    :param problems: Problems found in the organizations and the sampled persons
+    """
+
+    sample_size: int
+    edges: int
+    violations: int
+    confidence: float
+    upper_bound: float
+    problems: List[Problem]
+
+    @property
+    def violation_rate(self) -> float:
+        return self.violations / self.sample_size if self.sample_size else 0.0
 
+
+@dataclass(frozen=True)
+class SampledWorldVerifier:
+    """
+    Verifies a ``World`` by checking a seeded random sample of persons together with all of their
+    relations.
+
+    Identifier uniqueness and containment are checked exhaustively, since they only need the
+    identifier sets and the comparatively few organizations. The person relations, which hold the
+    bulk of the edges, are only checked for the sample.
+
+    :param sample_size: Maximum number of persons to check
+    :param seed: Seed of the random sample
+    :param confidence: Confidence level of the reported upper bound on the violation rate
+    """
+
+    sample_size: int = 10_000
+    seed: int = 0
+    confidence: float = 0.95
+
+    def verify(self, world: World) -> SampleReport:
+        """
+        Returns the report of a sampled verification, or raises ``RelationshipError`` if any problem
+        was found.
+        """
+        sample_report = self.sample(world)
+        if sample_report.problems:
+            lines = report_lines(sample_report.problems)
+            lines.append(
+                f"Sampled {sample_report.sample_size} persons, {sample_report.violations} with problems; "
+                f"violation rate at most {sample_report.upper_bound:.6f} with confidence {sample_report.confidence}"
+            )
+            raise RelationshipError("\n".join(lines))
+        return sample_report
+
+    def sample(self, world: World) -> SampleReport:
+        verification = VerificationPass.prepare(world)
+        problems = list(verification.identity_problems())
+        for section in (FIELD_SECTION, CONTAINMENT_SECTION, PRESENCE_SECTION):
+            for kind in ORGANIZATION_KINDS:
+                problems.extend(OrganizationCheck(kind, section).problems(verification))
+        sample = random.Random(self.seed).sample(world.persons, min(self.sample_size, len(world.persons)))
+        edges = 0
+        violations = 0
+        for person in sample:
+            person_problems = list(verification.persons([person]))
+            edges += sum(map(len, person_relations(person)))
+            violations += bool(person_problems)
+            problems.extend(person_problems)
+        return SampleReport(
+            sample_size=len(sample),
+            edges=edges,
+            violations=violations,
+            confidence=self.confidence,
+            upper_bound=wilson_upper_bound(violations, len(sample), self.confidence),
+            problems=problems,
+        )
+
+
+def run_task(verification: VerificationPass, task: VerificationTask) -> List[Problem]:
+    return list(task.problems(verification))
+
+
+@dataclass(frozen=True)
+class ParallelWorldVerifier(WorldVerifier):
+    """
+    Verifies a ``World`` by distributing the containment checks and shards of persons across
+    worker processes.
+
+    The identifier sets are built once and inherited by forked workers instead of being
+    serialized; only task descriptions and problem lists cross process boundaries. Problems are
+    merged in task order, so the report equals the one of ``WorldVerifier``.
+
+    :param processes: Number of worker processes
+    :param shard_size: Maximum number of persons checked by one task
+    """
+
+    processes: int = field(default_factory=os.cpu_count)
+    shard_size: int = 100_000
+
+    def problems(self, world: World) -> Iterator[Problem]:
+        verification = VerificationPass.prepare(world)
+        yield from verification.identity_problems()
+        pool = forked_pool(self.processes, verification)
+        try:
+            for problems in pool.map(with_worker_state(run_task), verification.tasks(self.shard_size)):
+                yield from problems
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+
+@dataclass
+class IncrementalWorldVerifier(WorldObserver):
+    """
+    Verifies a ``World`` in full once and afterwards only the entities and relations that were
+    added through its mutation API since the last successful verification.
+
+    New identifiers are checked against the identifier sets of the last pass, new children against
+    its parent assignments and new relations against the person identifiers, which are all the
+    invariants an addition can break in a world that verified before. Changes made by mutating
+    entities or world lists directly are not tracked, and a failed verification makes the next
+    one a full verification again.
+    """
+
+    world: World
+    baseline: Optional[VerificationPass] = None
+    """
+    The last successful pass, kept up to date with every verified addition.
+    """
+    verified_version: Optional[int] = None
+    entities: List[Tuple[Symbol, Optional[Symbol]]] = field(default_factory=list)
+    relations: List[Tuple[Person, str, Person]] = field(default_factory=list)
+
+    @classmethod
+    def for_world(cls, world: World) -> IncrementalWorldVerifier:
+        """
+        Creates a verifier that observes the additions to the world.
+        """
+        verifier = cls(world)
+        world.subscribe(verifier)
+        return verifier
+
+    def verify(self) -> None:
+        """
+        Raises ``RelationshipError`` if the world violates any invariant checked by ``WorldVerifier``.
+        """
+        if self.world.version == self.verified_version:
+            return
+        if self.baseline is None:
+            verification = VerificationPass.prepare(self.world)
+            problems = list(verification.problems())
+        else:
+            verification = self.baseline
+            problems = list(self.changed_problems())
+        self.entities.clear()
+        self.relations.clear()
         if problems:
-            raise RelationshipError("\n".join(problems))
+            self.baseline = None
+            self.verified_version = None
+            raise RelationshipError("\n".join(report_lines(problems)))
+        self.baseline = verification
+        self.verified_version = self.world.version
+
+    def changed_problems(self) -> Iterator[Problem]:
+        """
+        Yields the problems introduced by the additions since the last successful verification.
+        """
+        persons = [entity for entity, _ in self.entities if isinstance(entity, Person)]
+        organizations = [
+            (entity, parent) for entity, parent in self.entities if type(entity) in KIND_OF_TYPE
+        ]
+        for entity, _ in organizations:
+            kind = KIND_OF_TYPE[type(entity)]
+            yield from self.new_identifier(entity, kind.name, kind.collection)
+        for person in persons:
+            yield from self.new_identifier(person, "Person", "persons")
+        for entity, parent in organizations:
+            yield from self.new_organization(entity, parent)
+        yield from self.baseline.persons(persons)
+        added = set(map(id, persons))
+        for person, relation, other in self.relations:
+            if id(person) not in added:
+                yield from self.baseline.reference(person, relation, other)
+
+    def new_identifier(self, entity: Symbol, name: str, collection: str) -> Iterator[Problem]:
+        identifiers = self.baseline.identifiers[collection]
+        if entity.identifier in identifiers:
+            yield VerificationPass.duplicate_identifier(entity.identifier, name, collection)
+        identifiers.add(entity.identifier)
+
+    def new_organization(self, entity: Symbol, parent: Optional[Symbol]) -> Iterator[Problem]:
+        kind = KIND_OF_TYPE[type(entity)]
+        if not kind.display_field(entity):
+            yield VerificationPass.empty_display_field(entity, kind)
+        if type(parent) not in KIND_OF_TYPE:
+            return
+        containment = KIND_OF_TYPE[type(parent)].containment
+        if containment is None or containment.child_kind != kind.name:
+            return
+        parents = self.baseline.parents.setdefault(containment.collection, {})
+        repeated = parents.get(entity.identifier) is parent and self.occurrences(entity, parent, containment) > 1
+        yield from self.baseline.child(parent, entity, containment, repeated)
 
     @staticmethod
-    def _check_unique(ids: List[str], kind: str) -> List[str]:
-        seen: Set[str] = set()
-        dupes: List[str] = []
-        for x in ids:
-            if x in seen:
-                dupes.append(f"Duplicate {kind} identifier: {x}")
-            else:
-                seen.add(x)
-        return dupes
+    def occurrences(entity: Symbol, parent: Symbol, containment: Containment) -> int:
+        return sum(child.identifier == entity.identifier for child in containment.children(parent))
+
+    def entity_added(self, entity: Symbol, parent: Optional[Symbol]) -> None:
+        self.entities.append((entity, parent))
+
+    def relation_added(self, person: Person, relation: str, other: Person) -> None:
+        self.relations.append((person, relation, other))
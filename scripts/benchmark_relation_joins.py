@@ -0,0 +1,74 @@
+import argparse
+import random
+
+from owl2bench import InstanceGenerator, InstanceConfig, eql_queries
+from owl2bench.benchmark import EQLBenchmark
+from owl2bench.models import World
+
+from benchmark_worlds import make_population
+
+
+def build_world(persons: int, known: int, seed: int) -> World:
+    """
+    Builds a world of persons that each know ``known`` random other persons.
+    """
+    population = make_population(persons)
+    rng = random.Random(seed)
+    for person in population:
+        person.knows = rng.sample(population, known)
+    return World(persons=population)
+
+
+def build_organizations(universities: int, seed: int) -> World:
+    """
+    Builds a world of generated universities with their organizations and members.
+    """
+    world = World()
+    for university in InstanceGenerator(InstanceConfig(), seed=seed).generate(universities):
+        world.add_university(university)
+    return world
+
+
+def compare(query: eql_queries.EQLQuery, world: World, iterations: int) -> str:
+    """
+    Returns the best latencies of the query with and without join-aware evaluation and whether they agree.
+    """
+    timings = {}
+    for use_joins in (True, False):
+        benchmark = EQLBenchmark(0, iterations, [query], use_joins)
+        timings[use_joins] = min(benchmark.run(world).queries[0].latencies)
+    identical = query.prepare(world).results(True) == query.prepare(world).results(False)
+    return (
+        f"join={timings[True]:.4f}s cartesian={timings[False]:.4f}s "
+        f"speedup={timings[False] / timings[True]:.1f} identical={identical}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measures q1 with and without join-aware evaluation for growing numbers of persons, "
+        "and q2 and q17 for growing numbers of universities."
+    )
+    parser.add_argument("--persons", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--known", type=int, default=3)
+    parser.add_argument("--universities", type=int, nargs="+", default=[1, 3, 8])
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    arguments = parser.parse_args()
+
+    for persons in arguments.persons:
+        world = build_world(persons, arguments.known, arguments.seed)
+        print(
+            f"q1 persons={persons} edges={persons * arguments.known} "
+            f"{compare(eql_queries.q1, world, arguments.iterations)}"
+        )
+    for universities in arguments.universities:
+        world = build_organizations(universities, arguments.seed)
+        for query in (eql_queries.q2, eql_queries.q17):
+            print(
+                f"q{query.sparql_query.number} universities={universities} students={len(world.students)} "
+                f"{compare(query, world, arguments.iterations)}"
+            )
+
+if __name__ == "__main__":
+    main()
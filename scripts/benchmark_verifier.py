@@ -0,0 +1,105 @@
+import argparse
+import importlib.util
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Optional, Tuple, Type
+
+from owl2bench import InstanceGenerator, InstanceConfig, WorldVerifier, ParallelWorldVerifier, RelationshipError
+from owl2bench.models import World
+
+from benchmark_worlds import make_population
+
+
+def build_world(persons: int, universities: int, seed: int) -> World:
+    """
+    Builds a world with generated organizations and randomly related persons.
+    """
+    world = World()
+    for university in InstanceGenerator(InstanceConfig(), seed=seed).generate(universities):
+        world.add_university(university)
+    population = make_population(persons)
+    rng = random.Random(seed)
+    for person in population:
+        person.knows = [other for other in rng.sample(population, 4) if other is not person][:3]
+        person.likes = [other for other in rng.sample(population, 2) if other is not person][:1]
+    world.persons = population
+    return world
+
+
+def baseline_verifier(revision: str) -> ModuleType:
+    """
+    Returns ``owl2bench/verifier.py`` as of a git revision, loaded as a module of the current package
+    so that its relative imports resolve.
+    """
+    source = subprocess.run(
+        ["git", "show", f"{revision}:owl2bench/verifier.py"], check=True, capture_output=True, text=True
+    ).stdout
+    path = Path(tempfile.mkdtemp()) / "baseline_verifier.py"
+    path.write_text(source, encoding="utf-8")
+    specification = importlib.util.spec_from_file_location("owl2bench.baseline_verifier", path)
+    module = importlib.util.module_from_spec(specification)
+    sys.modules[specification.name] = module
+    specification.loader.exec_module(module)
+    return module
+
+
+def measure(
+    verifier, world: World, repetitions: int, error_type: Type[Exception] = RelationshipError
+) -> Tuple[float, Optional[str]]:
+    """
+    Returns the best run time of the verifier and the content of the error it raised, if any.
+
+    :param error_type: The ``RelationshipError`` class of the verifier's module
+    """
+    timings = []
+    content = None
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        try:
+            verifier.verify(world)
+        except error_type as error:
+            content = str(error)
+        timings.append(time.perf_counter() - start)
+    return min(timings), content
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures the run time of WorldVerifier.verify against an optional baseline revision.")
+    parser.add_argument("--persons", type=int, default=1_000_000)
+    parser.add_argument("--universities", type=int, default=50)
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--processes", type=int, default=0, help="Worker processes; 0 verifies in the calling process."
+    )
+    parser.add_argument(
+        "--baseline-revision",
+        help="Git revision whose WorldVerifier is measured as well, e.g. the revision before a change.",
+    )
+    arguments = parser.parse_args()
+
+    world = build_world(arguments.persons, arguments.universities, arguments.seed)
+    verifier = (
+        ParallelWorldVerifier(processes=arguments.processes) if arguments.processes else WorldVerifier()
+    )
+    best, content = measure(verifier, world, arguments.repetitions)
+    problems = 0 if content is None else content.count("\n") + 1
+    print(f"persons={arguments.persons} problems={problems} best={best:.3f}s")
+    if arguments.baseline_revision is not None:
+        baseline = baseline_verifier(arguments.baseline_revision)
+        baseline_best, baseline_content = measure(
+            baseline.WorldVerifier(), world, arguments.repetitions, baseline.RelationshipError
+        )
+        print(
+            f"baseline={arguments.baseline_revision} best={baseline_best:.3f}s "
+            f"speedup={baseline_best / best:.2f} identical={baseline_content == content}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+from typing import List
+
+from owl2bench.models import Person
+
+
+def make_population(persons: int) -> List[Person]:
+    """
+    Returns the persons ``P0`` to ``P<persons - 1>`` without relations, every second one a woman.
+    """
+    return [
+        Person(
+            identifier=f"P{index}",
+            first_name="First",
+            last_name="Last",
+            email=f"p{index}@bench.com",
+            is_woman=index % 2 == 0,
+        )
+        for index in range(persons)
+    ]
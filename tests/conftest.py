@@ -1,9 +1,11 @@
 import sys
 from pathlib import Path
+from typing import List
 
 import pytest
 
 from owl2bench import WorldLoader
+from owl2bench.models import World, University, College, Department, ResearchGroup, Person, Student, Employee
 
 # Ensure project root is on sys.path for imports during tests
 ROOT = Path(__file__).resolve().parents[1]
@@ -21,3 +23,46 @@ def owl2_dl1():
     loader = WorldLoader()
     world = loader.load(path)
     return world
+
+
+def make_person(identifier: str, hometown=None, is_woman: bool = False, knows=()) -> Person:
+    """
+    Returns a person with valid required fields, the shared factory of the tests.
+    """
+    return Person(
+        identifier=identifier,
+        first_name="First",
+        last_name=identifier,
+        email=f"{identifier.lower()}@bench.com",
+        is_woman=is_woman,
+        hometown=hometown,
+        knows=list(knows),
+    )
+
+
+def make_persons(count: int) -> List[Person]:
+    """
+    Returns the persons ``P0`` to ``P<count - 1>``, every second one a woman.
+    """
+    return [make_person(f"P{index}", is_woman=index % 2 == 0) for index in range(count)]
+
+
+@pytest.fixture
+def query_world() -> World:
+    """
+    A small world with one answer or more for every query that has an EQL and SQL counterpart.
+    """
+    ada, bo, cy = make_person("P1", "Bremen"), make_person("P2", "Bremen"), make_person("P3")
+    ada.knows = [ada, bo]
+    group = ResearchGroup(identifier="G1", name="AI", members=[cy])
+    department = Department(
+        identifier="D1",
+        name="Physics",
+        undergraduate_students=[Student(person=ada, level="ug")],
+        employees=[Employee(person=bo, role="faculty")],
+        research_groups=[group],
+    )
+    college = College(identifier="C1", name="College", is_women_only=True, departments=[department])
+    world = World(persons=[cy], students=[Student(person=cy, level="ug", advisors=[bo])])
+    world.add_university(University(identifier="U1", name="University", colleges=[college]))
+    return world
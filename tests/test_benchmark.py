@@ -0,0 +1,169 @@
+import json
+import os
+from pathlib import Path
+import textwrap
+import time
+
+import pytest
+
+from owl2bench.benchmark import (
+    Isolation,
+    Outcome,
+    SPARQLBenchmark,
+    main,
+    measure,
+    peak_memory_of_run,
+    percentile,
+)
+from owl2bench.config import ConfigurationError
+from owl2bench.loader import OntologyLoadError
+from owl2bench.results import ResultMode, write_chunked
+from owl2bench.sparql_queries import OWLProfile, all_queries, q1, q12, suite
+
+
+def write_ontology(tmp_path: Path) -> Path:
+    ttl = textwrap.dedent(
+        """
+        @prefix : <http://benchmark/OWL2Bench#> .
+
+        :P1 a :Person ; :knows :P2, :P3 .
+        :P2 a :Person ; :knows :P1 .
+        :P3 a :Person .
+        """
+    )
+    path = tmp_path / "benchmark.ttl"
+    path.write_text(ttl, encoding="utf-8")
+    return path
+
+
+def test_benchmark_measures_queries(tmp_path: Path):
+    report = SPARQLBenchmark(warmup=1, iterations=3, queries=[q1, q12]).run(write_ontology(tmp_path))
+
+    assert [(measurement.number, measurement.result_count) for measurement in report.queries] == [(1, 3), (12, 3)]
+    assert all(len(measurement.latencies) == 3 for measurement in report.queries)
+    assert report.peak_memory_bytes > 0
+    assert json.loads(json.dumps(report.to_dict()))["queries"][0]["p50"] > 0
+    assert report.queries[0].preparation_seconds == q1.prepare().preparation_seconds > 0
+
+
+def test_every_query_is_prepared_once():
+    for query in all_queries:
+        assert query.prepare() is query.prepare()
+
+
+def test_benchmark_command_writes_json(tmp_path: Path):
+    output = tmp_path / "report.json"
+    main([str(write_ontology(tmp_path)), "--queries", "1", "--iterations", "2", "--output", str(output)])
+
+    assert json.loads(output.read_text())["queries"][0]["result_count"] == 3
+    assert "catalog" not in json.loads(output.read_text())
+
+    main([str(write_ontology(tmp_path)), "--queries", "1", "12", "--profile", "QL", "--timeout", "30", "--output", str(output)])
+    assert json.loads(output.read_text())["queries"][0]["outcome"] == "COMPLETED"
+    assert json.loads(output.read_text())["queries"][0]["result_count"] == 3
+
+
+def test_benchmark_command_reports_the_catalog(tmp_path: Path):
+    ttl = textwrap.dedent(
+        """
+        @prefix : <http://benchmark/OWL2Bench#> .
+
+        :P1 a :Woman ; :hasFirstName "Ada" ; :hasLastName "A" ; :hasEmailAddress "a@bench.com" ; :knows :P2 .
+        :P2 a :Man ; :hasFirstName "Bo" ; :hasLastName "B" ; :hasEmailAddress "b@bench.com" .
+        """
+    )
+    ontology = tmp_path / "catalog.ttl"
+    ontology.write_text(ttl, encoding="utf-8")
+    output = tmp_path / "report.json"
+    main([str(ontology), "--queries", "1", "--catalog", "--materialize", "QL", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    assert [rule["new_facts"] for rule in report["materialization"]["rules"]] == [2]
+    catalog = report["catalog"]
+    assert catalog["entity_counts"]["Person"] == 2
+    assert catalog["distinct_values"]["first_name"] == 2
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.0
+    assert percentile([4.0, 1.0, 3.0, 2.0], 99) == 4.0
+
+
+def test_benchmark_rejects_missing_files_and_empty_measurements(tmp_path: Path):
+    with pytest.raises(OntologyLoadError):
+        SPARQLBenchmark().run(tmp_path / "missing.ttl")
+    with pytest.raises(ConfigurationError):
+        measure(1, lambda: 0, warmup=0, iterations=0)
+    with pytest.raises(SystemExit):
+        main([str(write_ontology(tmp_path)), "--iterations", "0"])
+
+
+def test_isolation_records_runaway_queries():
+    isolation = Isolation(timeout=2, memory_bytes=2**39)
+
+    assert isolation.measure(1, lambda: 7, warmup=0, iterations=2).result_count == 7
+    timeout = Isolation(timeout=0.2).measure(2, lambda: time.sleep(10) or 0, warmup=0, iterations=1)
+    assert (timeout.outcome, timeout.latencies) == (Outcome.TIMEOUT, [])
+    assert isolation.measure(3, lambda: len(bytearray(2**40)), warmup=0, iterations=1).outcome is Outcome.OUT_OF_MEMORY
+    failed = isolation.measure(4, lambda: os._exit(3), warmup=0, iterations=1)
+    assert failed.outcome is Outcome.FAILED
+    assert failed.to_dict() == {
+        "number": 4,
+        "outcome": "FAILED",
+        "result_count": 0,
+        "preparation_seconds": 0.0,
+        "peak_memory_bytes": 0,
+        "latencies": [],
+    }
+
+
+def test_memory_of_queries_in_workers_is_reported(tmp_path: Path):
+    allocation = 256 * 2**20
+    measurement = Isolation(timeout=30).measure(1, lambda: len(b"x" * allocation), warmup=0, iterations=1)
+
+    assert measurement.peak_memory_bytes > allocation
+    assert peak_memory_of_run() > allocation
+    report = SPARQLBenchmark(0, 1, [q1], processes=2).run(write_ontology(tmp_path))
+    assert all(query.peak_memory_bytes > 0 for query in report.queries)
+
+
+def test_suites_select_queries_by_profile_and_number():
+    assert [query.number for query in suite(OWLProfile.EL, [1, 6, 7, 12])] == [1, 6]
+    assert [query.number for query in suite(numbers=[17, 4])] == [4, 17]
+    assert len(suite()) == 22
+
+
+def test_benchmark_spreads_queries_over_processes(tmp_path: Path):
+    ontology = write_ontology(tmp_path)
+    sequential = SPARQLBenchmark(warmup=0, iterations=2, queries=[q1, q12]).run(ontology)
+    parallel = SPARQLBenchmark(warmup=0, iterations=2, queries=[q1, q12], processes=2).run(ontology)
+    isolated = SPARQLBenchmark(0, 2, [q1, q12], Isolation(timeout=30), processes=2).run(ontology)
+
+    for report in (parallel, isolated):
+        assert [(measurement.number, measurement.result_count) for measurement in report.queries] == [
+            (measurement.number, measurement.result_count) for measurement in sequential.queries
+        ]
+        assert all(len(measurement.latencies) == 2 for measurement in report.queries)
+
+
+def test_benchmark_streams_counts_and_writes_answers(tmp_path: Path):
+    ontology = write_ontology(tmp_path)
+    counts = {
+        mode: SPARQLBenchmark(0, 1, [q1], mode=mode, result_directory=tmp_path).run(ontology).queries[0].result_count
+        for mode in ResultMode
+    }
+
+    assert set(counts.values()) == {3}
+    assert sorted((tmp_path / "q1.tsv").read_text().splitlines()) == [
+        "http://benchmark/OWL2Bench#P1\thttp://benchmark/OWL2Bench#P2",
+        "http://benchmark/OWL2Bench#P1\thttp://benchmark/OWL2Bench#P3",
+        "http://benchmark/OWL2Bench#P2\thttp://benchmark/OWL2Bench#P1",
+    ]
+    with pytest.raises(ConfigurationError):
+        SPARQLBenchmark(0, 1, [q1], mode=ResultMode.WRITE).run(ontology)
+
+
+def test_chunked_writer_writes_every_row(tmp_path: Path):
+    path = tmp_path / "rows.tsv"
+    assert write_chunked(((str(index), None) for index in range(5)), path, chunk_size=2) == 5
+    assert path.read_text().splitlines() == [f"{index}\t" for index in range(5)]
@@ -0,0 +1,52 @@
+import json
+
+from conftest import make_person
+from owl2bench import StatisticsCatalog
+from owl2bench.models import World, University, College, Department, Course
+
+
+def make_world() -> World:
+    alice = make_person("P1", "Bremen")
+    bob = make_person("P2", "Bremen", knows=[alice])
+    carol = make_person("P3", None, knows=[alice, bob])
+    world = World(persons=[alice, bob, carol])
+    department = Department(identifier="D1", name="Physics", courses=[Course("CRS1", "Intro")])
+    college = College(identifier="C1", name="College", is_women_only=False, departments=[department])
+    world.add_university(University(identifier="U1", name="University", colleges=[college]))
+    return world
+
+
+def test_catalog_collects_statistics():
+    world = make_world()
+    catalog = world.index(StatisticsCatalog)
+
+    assert catalog.entity_counts["Person"] == 3
+    assert catalog.entity_counts["Course"] == 1
+    assert catalog.degree_histograms["knows"] == {0: 1, 1: 1, 2: 1}
+    assert catalog.distinct_values("hometown") == 1
+    assert catalog.distinct_values("last_name") == 3
+    assert catalog.fan_out_histogram("College.departments") == {1: 1}
+    assert json.loads(json.dumps(catalog.to_dict())) == catalog.to_dict()
+    assert catalog.to_dict()["degree_histograms"]["knows"] == {"0": 1, "1": 1, "2": 1}
+
+
+def test_catalog_is_cached_and_updated_incrementally():
+    world = make_world()
+    catalog = world.index(StatisticsCatalog)
+    world.add_college(world.universities[0], College(identifier="C2", name="New", is_women_only=True))
+    world.add_person(make_person("P4", "Berlin"))
+    world.relate(world.persons[0], "knows", world.persons[3])
+
+    assert world.index(StatisticsCatalog) is catalog
+    assert catalog.to_dict() == StatisticsCatalog.from_world(world).to_dict()
+    assert catalog.fan_out_histogram("University.colleges") == {2: 1}
+    assert catalog.fan_out_histogram("College.departments") == {0: 1, 1: 1}
+
+
+def test_catalog_ignores_relations_of_unknown_persons():
+    world = make_world()
+    catalog = world.index(StatisticsCatalog)
+    stranger = make_person("P9", None)
+    world.relate(stranger, "knows", world.persons[0])
+
+    assert catalog.degree_histograms["knows"] == {0: 1, 1: 1, 2: 1}
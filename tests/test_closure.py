@@ -0,0 +1,101 @@
+from owl2bench import InstanceGenerator, InstanceConfig, Range, PartOfClosure
+from owl2bench.models import World, University, College, Department, ResearchGroup
+
+
+def generated_world() -> World:
+    config = InstanceConfig(
+        colleges=Range(2, 3),
+        departments=Range(2, 3),
+        undergraduate_students=Range(0, 0),
+        postgraduate_students=Range(0, 0),
+        phd_students=Range(0, 0),
+        courses=Range(1, 1),
+    )
+    world = World()
+    for university in InstanceGenerator(config=config, seed=3).generate(universities=2):
+        world.add_university(university)
+    return world
+
+
+def expected_pairs(world: World):
+    pairs = set()
+    for university in world.universities:
+        for college in university.colleges:
+            pairs.add((college.identifier, university.identifier))
+            for department in college.departments:
+                pairs.add((department.identifier, college.identifier))
+                pairs.add((department.identifier, university.identifier))
+                for group in department.research_groups:
+                    pairs.add((group.identifier, department.identifier))
+                    pairs.add((group.identifier, college.identifier))
+                    pairs.add((group.identifier, university.identifier))
+    return pairs
+
+
+def closure_pairs(closure: PartOfClosure):
+    return {(part.identifier, whole.identifier) for part, whole in closure.pairs()}
+
+
+def test_closure_is_transitive():
+    world = generated_world()
+    closure = PartOfClosure.from_world(world)
+    university = world.universities[0]
+    college = university.colleges[0]
+    department = college.departments[0]
+
+    assert closure.is_part_of(department, college)
+    assert closure.is_part_of(department, university)
+    assert closure.is_part_of(college, university)
+    assert not closure.is_part_of(university, department)
+    assert not closure.is_part_of(college, college)
+    assert not closure.is_part_of(department, world.universities[1])
+    assert [whole.identifier for whole in closure.wholes(department)] == [
+        college.identifier,
+        university.identifier,
+    ]
+    assert closure_pairs(closure) == expected_pairs(world)
+
+
+def test_closure_is_maintained_incrementally():
+    world = generated_world()
+    closure = PartOfClosure.from_world(world, slack=1)
+    university = world.universities[1]
+
+    college = College(identifier="U2_NEW", name="New College", is_women_only=False)
+    world.add_college(university, college)
+    for index in range(10):
+        group = ResearchGroup(identifier=f"U2_NEW_D{index}_RG", name="Group")
+        department = Department(
+            identifier=f"U2_NEW_D{index}", name="Department", research_groups=[group]
+        )
+        world.add_department(college, department)
+        assert closure.is_part_of(group, university)
+    world.add_university(University(identifier="U3", name="University 3"))
+
+    assert closure_pairs(closure) == expected_pairs(world)
+    assert closure_pairs(PartOfClosure.from_world(world)) == expected_pairs(world)
+    for entry in closure.entries.values():
+        for other in closure.entries.values():
+            if entry is not other:
+                assert closure.is_part_of(entry.organization, other.organization) == (
+                    other.organization in list(closure.wholes(entry.organization))
+                )
+
+
+def test_closure_additions_relabel_locally():
+    world = generated_world()
+    closure = PartOfClosure.from_world(world)
+    college = world.colleges[0]
+    relabels = closure.relabels
+
+    group = ResearchGroup(identifier="U1_NEW_D_RG", name="Group")
+    world.add_department(college, Department(identifier="U1_NEW_D", name="Department", research_groups=[group]))
+    assert closure.relabels == relabels
+
+    for index in range(200):
+        group = ResearchGroup(identifier=f"U1_NEW_D{index}_RG", name="Group")
+        world.add_department(
+            college, Department(identifier=f"U1_NEW_D{index}", name="Department", research_groups=[group])
+        )
+    assert closure.relabels == relabels
+    assert closure_pairs(closure) == expected_pairs(world)
@@ -0,0 +1,55 @@
+import pytest
+
+from conftest import make_persons
+from owl2bench import EntityNumbering, EntitySet, NumberingMismatchError
+from owl2bench.models import World
+
+
+def test_entity_set_algebra_matches_python_sets():
+    persons = make_persons(100)
+    numbering = EntityNumbering.from_world(World(persons=persons))
+    women = numbering.entity_set(person for person in persons if person.is_woman)
+    multiples_of_three = numbering.entity_set(persons[::3])
+
+    def identifiers(entity_set: EntitySet):
+        return {person.identifier for person in entity_set}
+
+    women_ids = {person.identifier for person in persons if person.is_woman}
+    three_ids = {person.identifier for person in persons[::3]}
+    assert identifiers(women | multiples_of_three) == women_ids | three_ids
+    assert identifiers(women & multiples_of_three) == women_ids & three_ids
+    assert identifiers(women - multiples_of_three) == women_ids - three_ids
+    assert len(women & multiples_of_three) == len(women_ids & three_ids)
+    assert persons[0] in women and persons[1] not in women
+    assert list(multiples_of_three.numbers()) == list(range(0, 100, 3))
+
+
+def test_entity_set_grows_with_numbering():
+    persons = make_persons(3)
+    numbering = EntityNumbering()
+    entity_set = numbering.entity_set(persons[:1])
+    entity_set.add(persons[2])
+
+    assert numbering.number(persons[2]) == 1
+    assert [person.identifier for person in entity_set] == ["P0", "P2"]
+    assert persons[1] not in entity_set
+    numbering.number(persons[1])
+    numbering.numbers.update({f"X{index}": index for index in range(3, 100)})
+    assert persons[1] not in entity_set
+    assert len(entity_set.bits) == 1
+
+
+def test_entity_sets_over_different_numberings_cannot_be_combined():
+    persons = make_persons(2)
+    with pytest.raises(NumberingMismatchError):
+        EntityNumbering().entity_set(persons) | EntityNumbering().entity_set(persons)
+
+
+def test_entity_set_numbers_unnumbered_individuals():
+    persons = make_persons(20)
+    numbering = EntityNumbering()
+    entity_set = numbering.entity_set(persons)
+    entity_set.update([numbering.number(person) for person in make_persons(30)[20:]])
+
+    assert len(entity_set) == 30
+    assert list(entity_set.numbers()) == list(range(30))
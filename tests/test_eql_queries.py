@@ -0,0 +1,86 @@
+import pytest
+
+from conftest import make_person
+from owl2bench import eql_queries
+from owl2bench.benchmark import EQLBenchmark
+from owl2bench.eql_queries import UnsupportedQueryError, query_for
+from owl2bench.models import Student
+from owl2bench.results import ResultMode
+
+
+def test_eql_queries_answer_the_benchmark_queries(query_world):
+    world = query_world
+
+    assert eql_queries.q1.results(world) == {("P1", "P1"), ("P1", "P2")}
+    assert eql_queries.q3.results(world) == {
+        ("C1", "U1"),
+        ("D1", "C1"),
+        ("D1", "U1"),
+        ("G1", "D1"),
+        ("G1", "C1"),
+        ("G1", "U1"),
+    }
+    assert eql_queries.q2.results(world) == {
+        (person, organization) for person in ("P1", "P2", "P3") for organization in ("D1", "C1", "U1")
+    } | {("P3", "G1")}
+    assert eql_queries.q6.results(world) == {("P1",)}
+    assert eql_queries.q11.results(world) == {("P3", "P2")}
+    assert eql_queries.q13.results(world) == {("C1",)}
+    assert eql_queries.q17.results(world) == {("P1",), ("P3",)}
+    assert eql_queries.q19.results(world) == {("P2",)}
+    assert eql_queries.q20.results(world) == {("P1", "P2"), ("P2", "P1")}
+
+
+def test_eql_queries_are_looked_up_by_number():
+    assert query_for(12) is eql_queries.q12
+    with pytest.raises(UnsupportedQueryError):
+        query_for(4)
+    assert set(eql_queries.queries_by_number) | set(eql_queries.unsupported_queries) == set(range(1, 23))
+
+
+def test_eql_queries_are_prepared_once_per_world(query_world):
+    prepared = eql_queries.q12.prepare(query_world)
+    assert eql_queries.q12.prepare(query_world) is prepared
+    assert prepared.construction_seconds > 0
+
+    query_world.add_person(make_person("P4", is_woman=True))
+    assert eql_queries.q12.prepare(query_world) is not prepared
+    assert ("P4",) in eql_queries.q12.results(query_world)
+
+
+def test_eql_benchmark_reports_preparation_separately(query_world):
+    report = EQLBenchmark(warmup=0, iterations=2, queries=[eql_queries.q1, eql_queries.q3]).run(query_world)
+
+    assert [(measurement.number, measurement.result_count) for measurement in report.queries] == [(1, 2), (3, 6)]
+    assert all(measurement.preparation_seconds > 0 for measurement in report.queries)
+    assert report.to_dict()["queries"][0]["preparation_seconds"] == report.queries[0].preparation_seconds
+
+
+def test_streaming_modes_report_produced_answers_apart_from_distinct_ones(query_world):
+    def measurement(mode: ResultMode):
+        return EQLBenchmark(warmup=0, iterations=1, queries=[eql_queries.q17], mode=mode).run(query_world).queries[0]
+
+    assert (measurement(ResultMode.SET).result_count, measurement(ResultMode.SET).produced) == (2, None)
+    for mode in (ResultMode.ITERATE, ResultMode.COUNT):
+        assert (measurement(mode).result_count, measurement(mode).produced) == (None, 3)
+        assert "result_count" not in measurement(mode).to_dict()
+
+
+def test_relation_joins_agree_with_the_expressions(query_world):
+    ghost = make_person("P9")
+    query_world.persons[0].knows.append(ghost)
+    query_world.students[0].advisors.append(ghost)
+    query_world.departments[0].phd_students.append(Student(person=ghost, level="phd"))
+
+    for query in (eql_queries.q1, eql_queries.q2, eql_queries.q11, eql_queries.q17):
+        prepared = query.prepare(query_world)
+        assert prepared.results(use_joins=True) == prepared.results(use_joins=False)
+    assert eql_queries.q11.results(query_world) == {("P3", "P2")}
+
+
+def test_eql_answers_are_streamed_and_counted(query_world):
+    for query in eql_queries.all_queries:
+        prepared = query.prepare(query_world)
+        answers = list(prepared.answers())
+        assert set(answers) == prepared.results()
+        assert prepared.count() == len(answers) == prepared.count(use_joins=False)
@@ -1,5 +1,20 @@
 import re
-from owl2bench import InstanceGenerator, InstanceConfig, Range
+
+from conftest import make_person
+from owl2bench import (
+    College,
+    Department,
+    Employee,
+    HometownIndex,
+    InstanceConfig,
+    InstanceGenerator,
+    Range,
+    StatisticsCatalog,
+    Student,
+    University,
+    World,
+    WorldVerifier,
+)
 
 
 def test_determinism_fixed_seed():
@@ -112,3 +127,42 @@ def test_email_and_full_name_format():
 
     assert person.full_name == f"{person.first_name} {person.last_name}"
     assert re.match(r"^[a-z0-9_]+@bench\.com$", person.email)
+
+
+def test_world_registers_generated_students():
+    config = InstanceConfig(
+        colleges=Range(1, 1),
+        departments=Range(2, 2),
+        undergraduate_students=Range(2, 2),
+        postgraduate_students=Range(1, 1),
+        phd_students=Range(1, 1),
+        courses=Range(1, 1),
+    )
+    world = World()
+    for university in InstanceGenerator(config=config, seed=7).generate(universities=1):
+        world.add_university(university)
+
+    assert len(world.students) == 8
+    assert all(isinstance(student, Student) for student in world.students)
+    assert [person.identifier for person in world.persons] == [student.identifier for student in world.students]
+
+
+def test_world_adds_a_person_with_several_memberships_once():
+    ada, bo = make_person("P1", "Bremen"), make_person("P2", "Bremen")
+    department = Department(
+        identifier="D1",
+        name="Physics",
+        phd_students=[Student(person=ada, level="phd")],
+        undergraduate_students=[Student(person=bo, level="ug")],
+        employees=[Employee(person=ada, role="faculty")],
+    )
+    second = Department(identifier="D2", name="Chemistry", employees=[Employee(person=bo, role="staff")])
+    college = College(identifier="C1", name="College", is_women_only=False, departments=[department, second])
+    world = World()
+    hometowns = world.index(HometownIndex)
+    world.add_university(University(identifier="U1", name="University", colleges=[college]))
+
+    assert world.persons == [bo, ada]
+    assert hometowns.count() == 2
+    assert world.index(StatisticsCatalog).entity_counts["Person"] == 2
+    WorldVerifier().verify(world)
@@ -0,0 +1,32 @@
+from conftest import make_person
+from owl2bench import HometownIndex
+from owl2bench.models import World
+
+
+def naive_pairs(world: World):
+    return {
+        (person.identifier, other.identifier)
+        for person in world.persons
+        for other in world.persons
+        if person is not other and person.hometown is not None and person.hometown == other.hometown
+    }
+
+
+def test_hometown_index_matches_self_join():
+    towns = ["Bremen", "Berlin", None, "Bremen", "Hamburg", "Bremen", "Berlin"]
+    world = World(persons=[make_person(f"P{index}", town) for index, town in enumerate(towns)])
+    index = HometownIndex.from_world(world)
+
+    pairs = {(person.identifier, other.identifier) for person, other in index.pairs()}
+    assert pairs == naive_pairs(world)
+    assert index.count() == len(pairs) == 8
+
+
+def test_hometown_index_follows_added_persons():
+    world = World(persons=[make_person("P1", "Bremen")])
+    index = HometownIndex.from_world(world)
+    world.add_person(make_person("P2", "Bremen"))
+    world.add_person(make_person("P3", None))
+
+    assert index.count() == 2
+    assert {(person.identifier, other.identifier) for person, other in index.pairs()} == naive_pairs(world)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+
+from owl2bench import eql_queries, sql_queries
+from owl2bench.benchmark import SQLBenchmark
+from owl2bench.entity_set import EntityNumbering
+from owl2bench.index_arrays import UnnumberedIdentifierError, eql_indices, sql_indices
+
+
+def test_eql_answers_as_index_arrays(query_world):
+    numbering = EntityNumbering.from_world(query_world)
+    for query in eql_queries.all_queries:
+        prepared = query.prepare(query_world)
+        answers = eql_indices(prepared, numbering)
+        assert answers.indices.dtype == np.int32
+        assert answers.indices.shape == (len(prepared.results()), len(prepared.patterns[0].selected))
+        assert answers.results() == prepared.results()
+
+    pairs = eql_indices(eql_queries.q1.prepare(query_world), numbering)
+    assert [tuple(person.identifier for person in answer) for answer in pairs.entities()] == [
+        ("P1", "P1"),
+        ("P1", "P2"),
+    ]
+
+
+def test_sql_answers_as_index_arrays(query_world):
+    engine = create_engine("sqlite://")
+    SQLBenchmark.store(query_world, engine)
+    numbering = EntityNumbering.from_world(query_world)
+    with engine.connect() as connection:
+        for query in sql_queries.all_queries:
+            eql_answers = eql_indices(eql_queries.query_for(query.sparql_query.number).prepare(query_world), numbering)
+            assert np.array_equal(sql_indices(query, connection, numbering).indices, eql_answers.indices)
+        with pytest.raises(UnnumberedIdentifierError):
+            sql_indices(sql_queries.all_queries[0], connection, EntityNumbering())
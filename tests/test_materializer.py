@@ -0,0 +1,39 @@
+from owl2bench import eql_queries
+from owl2bench.materializer import Materializer
+from owl2bench.sparql_queries import OWLProfile
+
+
+def test_materializer_infers_the_facts_of_the_queries(query_world):
+    facts, report = Materializer().materialize(query_world)
+
+    assert facts.identifier_pairs("isPartOf") == eql_queries.q3.results(query_world)
+    assert facts.identifier_pairs("isMemberOf") == eql_queries.q2.results(query_world)
+    assert facts.identifier_pairs("isCollegeOf") == {("C1", "U1")}
+    assert facts.identifier_pairs("knows") == eql_queries.q1.results(query_world) | {
+        (person.identifier, person.identifier) for person in query_world.persons
+    }
+    assert {person.identifier for person in facts.instances("SelfAwarePerson")} == {"P1", "P2", "P3"}
+
+    statistics = {statistics.rule.name: statistics for statistics in report.rules}
+    assert statistics["TransitiveObjectProperty(isPartOf)"].new_facts == 3
+    assert statistics["ReflexiveObjectProperty(knows)"].new_facts == 2
+    assert all(rule_statistics.seconds > 0 for rule_statistics in report.rules)
+    assert report.to_dict()["rules"][0]["query"] == 1
+
+
+def test_materializer_selects_the_rules_by_profile_and_query():
+    assert {rule.query.number for rule in Materializer.for_profile(OWLProfile.RL).rules} == {2, 3}
+    assert {rule.query.number for rule in Materializer.for_profile(OWLProfile.QL).rules} == {1}
+    assert {rule.name for rule in Materializer.for_queries([6]).rules} == {
+        "EquivalentClasses(SelfAwarePerson ObjectHasSelf(knows))",
+        "ReflexiveObjectProperty(knows)",
+    }
+
+
+def test_materializer_selects_the_rules_a_query_depends_on(query_world):
+    materializer = Materializer.for_queries([2])
+    facts, _ = materializer.materialize(query_world)
+
+    assert {rule.query.number for rule in materializer.rules} == {2, 3}
+    assert facts.identifier_pairs("isMemberOf") == eql_queries.q2.results(query_world)
+    assert {("P1", "D1"), ("P1", "C1"), ("P1", "U1")} <= facts.identifier_pairs("isMemberOf")
@@ -0,0 +1,65 @@
+import pytest
+
+from owl2bench import eql_queries
+from owl2bench.benchmark import EQLBenchmark
+from owl2bench.config import ConfigurationError
+from owl2bench.partitioned import PartitionedEvaluation
+
+
+@pytest.mark.parametrize("use_joins", [True, False])
+def test_partitioned_evaluation_merges_to_the_sequential_answers(query_world, use_joins):
+    evaluation = PartitionedEvaluation(processes=2, chunks_per_process=1)
+    for query in eql_queries.all_queries:
+        prepared = query.prepare(query_world)
+        assert evaluation.results(prepared, use_joins) == prepared.results(use_joins)
+
+
+def test_ordered_partitioned_answers_repeat(query_world):
+    prepared = eql_queries.q2.prepare(query_world)
+    evaluation = PartitionedEvaluation(processes=2, ordered=True)
+
+    answers = list(evaluation.answers(prepared))
+    assert answers == list(evaluation.answers(prepared))
+    assert sorted(answers) == sorted(prepared.answers())
+
+
+def test_outer_domain_is_restored_after_a_partition(query_world):
+    (pattern,) = eql_queries.q20.prepare(query_world).patterns
+    domain = pattern.outer_domain(use_join=False)
+
+    assert len(list(pattern.answers_within(domain[:1], use_join=False))) < 2
+    assert pattern.outer_domain(use_join=False) == domain
+
+
+def test_benchmark_partitions_queries(query_world):
+    queries = [eql_queries.q1, eql_queries.q17]
+    sequential = EQLBenchmark(warmup=0, iterations=1, queries=queries).run(query_world)
+    partitioned = EQLBenchmark(
+        warmup=0, iterations=1, queries=queries, partitioned=PartitionedEvaluation(processes=2)
+    ).run(query_world)
+
+    assert [measurement.result_count for measurement in partitioned.queries] == [
+        measurement.result_count for measurement in sequential.queries
+    ]
+
+
+def test_benchmark_starts_the_partition_workers_once_per_run(query_world, monkeypatch):
+    pools = []
+    start_pool = PartitionedEvaluation.pool
+
+    def counted_pool(evaluation, prepared_queries):
+        pools.append(prepared_queries)
+        return start_pool(evaluation, prepared_queries)
+
+    monkeypatch.setattr(PartitionedEvaluation, "pool", counted_pool)
+    queries = [eql_queries.q1, eql_queries.q2, eql_queries.q17]
+    EQLBenchmark(warmup=1, iterations=2, queries=queries, partitioned=PartitionedEvaluation(processes=2)).run(
+        query_world
+    )
+
+    assert [[prepared.query for prepared in prepared_queries] for prepared_queries in pools] == [queries]
+
+
+def test_partitioned_benchmarks_measure_in_the_benchmark_process(query_world):
+    with pytest.raises(ConfigurationError):
+        EQLBenchmark(queries=[eql_queries.q1], processes=2, partitioned=PartitionedEvaluation()).run(query_world)
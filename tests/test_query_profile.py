@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from owl2bench import eql_internals, eql_queries
+from owl2bench.benchmark import EQLBenchmark
+from owl2bench.eql_internals import UnsupportedKrroodVersionError
+from owl2bench.query_profile import profile
+
+
+def test_profiles_count_the_bindings_of_every_operator(query_world):
+    prepared = eql_queries.q20.prepare(query_world)
+    root = profile(prepared)
+
+    assert root.name == "EQLQuery q20"
+    assert root.answers == len(prepared.results())
+    (pattern,) = root.children
+    (expression,) = pattern.children
+    assert pattern.answers == expression.answers == 2
+    assert expression.seconds <= pattern.seconds <= root.seconds
+    names = []
+    pending = [expression]
+    while pending:
+        operator = pending.pop()
+        names.append(operator.name)
+        pending.extend(operator.children)
+    assert any(name.startswith("Variable") for name in names)
+    assert any(name.startswith("Comparator") for name in names)
+    prepared.results(use_joins=False)
+    assert (expression.calls, expression.answers) == (1, 2)
+    assert eql_queries.q20.results(query_world) == {("P1", "P2"), ("P2", "P1")}
+
+
+def test_patterns_evaluated_by_joins_profile_the_join(query_world):
+    root = profile(eql_queries.q1.prepare(query_world))
+
+    (join,) = root.children[0].children
+    assert (join.name, join.calls, join.answers) == ("RelationJoin knows", 1, 2)
+
+
+def test_benchmark_reports_explained_queries(query_world):
+    report = EQLBenchmark(warmup=0, iterations=1, queries=[eql_queries.q1, eql_queries.q17], explain=True).run(
+        query_world
+    )
+
+    profiles = json.loads(json.dumps(report.to_dict()))["profiles"]
+    assert [root["name"] for root in profiles] == ["EQLQuery q1", "EQLQuery q17"]
+    assert [root["answers"] for root in profiles] == [2, 2]
+    assert len(profiles[1]["children"]) == 2
+
+
+def test_eql_internals_require_the_pinned_krrood_version(query_world, monkeypatch):
+    monkeypatch.setattr(eql_internals, "version", lambda distribution: "0.0.0")
+    eql_internals.require_pinned_krrood.cache_clear()
+    try:
+        with pytest.raises(UnsupportedKrroodVersionError):
+            profile(eql_queries.q20.prepare(query_world))
+    finally:
+        eql_internals.require_pinned_krrood.cache_clear()
@@ -0,0 +1,59 @@
+from pathlib import Path
+import textwrap
+
+from rdflib import Graph
+
+from owl2bench import eql_queries
+from owl2bench.result_cache import CacheKey, ResultCache, file_fingerprint
+from owl2bench.sparql_queries import q1
+
+
+def test_world_answers_are_cached_until_the_world_changes(query_world):
+    cache = ResultCache()
+    query = eql_queries.query_for(1)
+
+    answers = cache.eql_answers(query, query_world)
+    assert cache.eql_answers(query, query_world) is answers
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    ada, bo = query_world.persons[1], query_world.persons[2]
+    query_world.relate(bo, "knows", ada)
+    assert cache.eql_answers(query, query_world) == answers | {(bo.identifier, ada.identifier)}
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(cache.entries) == 1
+
+    cache.eql_answers(query, query_world, bypass=True)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_answers_are_evicted():
+    cache = ResultCache(capacity=2)
+    first, second, third = (CacheKey(number, "eql", "dataset") for number in (1, 2, 3))
+    cache.answers(first, lambda: [("A",)])
+    cache.answers(second, lambda: [("B",)])
+    cache.answers(first, lambda: [("A",)])
+    cache.answers(third, lambda: [("C",)])
+
+    assert list(cache.entries) == [first, third]
+
+
+def test_file_answers_are_kept_on_disk(tmp_path: Path):
+    path = tmp_path / "knows.ttl"
+    path.write_text(
+        textwrap.dedent(
+            """
+            @prefix : <http://benchmark/OWL2Bench#> .
+            :P1 :knows :P2 .
+            """
+        ),
+        encoding="utf-8",
+    )
+    graph = Graph().parse(path)
+    directory = tmp_path / "cache"
+
+    answers = ResultCache(directory=directory).sparql_answers(q1, graph, file_fingerprint(path))
+    assert answers == {("P1", "P2")}
+
+    restarted = ResultCache(directory=directory)
+    assert restarted.sparql_answers(q1, Graph(), file_fingerprint(path)) == answers
+    assert (restarted.hits, restarted.misses) == (1, 0)
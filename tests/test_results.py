@@ -0,0 +1,53 @@
+import dataclasses
+from pathlib import Path
+import textwrap
+
+import pytest
+from rdflib import Graph
+from sqlalchemy import create_engine
+
+from owl2bench import eql_queries, sql_queries
+from owl2bench.benchmark import SQLBenchmark
+from owl2bench.results import ResultDigest
+from owl2bench.sparql_queries import DigestMismatchError, q1
+
+
+def test_digests_ignore_order_but_not_repetition():
+    answers = [("P1", "P2"), ("P2", "P1"), ("P1", "P3")]
+
+    assert ResultDigest.of(answers) == ResultDigest.of(reversed(answers))
+    assert ResultDigest.of(answers + [("P1", "P3")]) != ResultDigest.of(answers + [("P1", "P3"), ("P1", "P3")])
+    assert ResultDigest.of([("P1", "P2")]) != ResultDigest.of([("P2", "P1")])
+    assert len(ResultDigest.of(answers).hexdigest()) == 32
+
+
+def test_engines_agree_on_digests(query_world):
+    engine = create_engine("sqlite://")
+    SQLBenchmark.store(query_world, engine)
+    with engine.connect() as connection:
+        for query in sql_queries.all_queries:
+            eql_query = eql_queries.query_for(query.sparql_query.number)
+            assert eql_query.prepare(query_world).digest() == query.digest(connection)
+
+
+def test_sparql_digests_are_verified_against_recorded_ones(tmp_path: Path):
+    path = tmp_path / "knows.ttl"
+    path.write_text(
+        textwrap.dedent(
+            """
+            @prefix : <http://benchmark/OWL2Bench#> .
+            :P1 :knows :P2, :P3 .
+            :P2 :knows :P1 .
+            """
+        ),
+        encoding="utf-8",
+    )
+    graph = Graph().parse(path)
+    digest = q1.digest(graph)
+    assert digest == ResultDigest.of([("P2", "P1"), ("P1", "P3"), ("P1", "P2")])
+
+    recorded = dataclasses.replace(q1, expected_digests={"knows": digest.hexdigest()})
+    recorded.verify_digest("knows", digest)
+    recorded.verify_digest("other", ResultDigest())
+    with pytest.raises(DigestMismatchError):
+        recorded.verify_digest("knows", ResultDigest.of([("P1", "P2")]))
@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import create_engine
+
+from owl2bench import eql_queries, sql_queries
+from owl2bench.benchmark import ExistingSchemaError, SQLBenchmark
+from owl2bench.eql_queries import UnsupportedQueryError
+from owl2bench.sql_queries import query_for
+
+
+@pytest.fixture
+def engine(query_world):
+    engine = create_engine("sqlite://")
+    SQLBenchmark.store(query_world, engine)
+    return engine
+
+
+def test_sql_queries_agree_with_eql(engine, query_world):
+    with engine.connect() as connection:
+        for query in sql_queries.all_queries:
+            expected = eql_queries.queries_by_number[query.sparql_query.number].results(query_world)
+            assert query.results(connection) == expected, query.sparql_query.number
+
+
+def test_sql_benchmark_measures_queries(query_world):
+    benchmark = SQLBenchmark(warmup=0, iterations=2, queries=[sql_queries.q3, sql_queries.q12])
+    report = benchmark.run(query_world, create_engine("sqlite://"))
+
+    assert [(measurement.number, measurement.result_count) for measurement in report.queries] == [(3, 6), (12, 3)]
+    assert report.load_seconds > 0
+    assert report.to_dict()["catalog"]["entity_counts"]["Person"] == 3
+
+
+def test_sql_benchmark_keeps_existing_tables_unless_reset(engine, query_world):
+    with pytest.raises(ExistingSchemaError):
+        SQLBenchmark.store(query_world, engine)
+    SQLBenchmark.store(query_world, engine, reset=True)
+
+
+def test_unsupported_sql_queries_raise():
+    assert query_for(3) is sql_queries.q3
+    with pytest.raises(UnsupportedQueryError):
+        query_for(4)
@@ -0,0 +1,55 @@
+import pytest
+
+from conftest import make_person
+from owl2bench import TypeIndex, UnknownClassError
+from owl2bench.models import World, University, College, Department, Student, Employee
+
+
+def make_world() -> World:
+    ada, alan, grace = make_person("P1", is_woman=True), make_person("P2"), make_person("P3", is_woman=True)
+    ada.knows = [ada, alan]
+    return World(
+        colleges=[
+            College(identifier="C1", name="Women", is_women_only=True),
+            College(identifier="C2", name="Mixed", is_women_only=False),
+        ],
+        persons=[ada, alan, grace],
+        students=[Student(person=ada, level="ug"), Student(person=alan, level="phd")],
+        employees=[Employee(person=grace, role="faculty"), Employee(person=alan, role="staff")],
+    )
+
+
+def identifiers(instances):
+    return {individual.identifier for individual in instances}
+
+
+def test_type_index_derives_classes_from_attributes():
+    index = TypeIndex.from_world(make_world())
+
+    assert identifiers(index.instances("WomanCollege")) == {"C1"}
+    assert identifiers(index.instances("Woman")) == {"P1", "P3"}
+    assert identifiers(index.instances("SelfAwarePerson")) == {"P1"}
+    assert identifiers(index.instances("UGStudent")) == {"P1"}
+    assert identifiers(index.instances("Student")) == {"P1", "P2"}
+    assert identifiers(index.instances("Faculty")) == {"P3"}
+    assert identifiers(index.instances("Woman") | index.instances("Man")) == identifiers(
+        index.instances("Person")
+    )
+    assert identifiers(index.instances("Student") & index.instances("Employee")) == {"P2"}
+
+
+def test_type_index_follows_world_additions():
+    world = make_world()
+    index = TypeIndex.from_world(world)
+    university = University(identifier="U1", name="University")
+    world.add_university(university)
+    world.add_college(university, College(identifier="C3", name="New", is_women_only=True))
+    world.add_department(world.colleges[-1], Department(identifier="D1", name="Physics"))
+
+    assert identifiers(index.instances("WomanCollege")) == {"C1", "C3"}
+    assert identifiers(index.instances("Organization")) == {"C1", "C2", "C3", "U1", "D1"}
+
+
+def test_type_index_rejects_unknown_class():
+    with pytest.raises(UnknownClassError):
+        TypeIndex.from_world(World()).instances("T20CricketFan")
@@ -1,10 +1,21 @@
+from multiprocessing import active_children
 from pathlib import Path
 import textwrap
 import pytest
 
+from conftest import make_person, make_persons
 from owl2bench.loader import WorldLoader
-from owl2bench.models import World, University, College
-from owl2bench.verifier import WorldVerifier, RelationshipError
+from owl2bench.models import World, University, College, Department, Course, Person
+from owl2bench.verifier import (
+    WorldVerifier,
+    ParallelWorldVerifier,
+    IncrementalWorldVerifier,
+    SampledWorldVerifier,
+    wilson_upper_bound,
+    RelationshipError,
+    Problem,
+    ProblemKind,
+)
 
 
 def write_temp_ttl(tmp_path: Path) -> Path:
@@ -44,3 +55,150 @@ def test_verifier_detects_duplicate_parentage():
 
 def test_verifier_on_instances_owl(owl2_dl1):
     WorldVerifier().verify(owl2_dl1)  # should not raise
+
+
+def broken_world() -> World:
+    course = Course(identifier="CRS1", title="")
+    stray = Course(identifier="CRS2", title="Stray")
+    department = Department(identifier="D1", name="Physics", courses=[course, course, stray])
+    college = College(identifier="C1", name="", is_women_only=False, departments=[department])
+    first = University(identifier="U1", name="U1", colleges=[college])
+    second = University(identifier="U1", name="U2", colleges=[college])
+    ada = Person(identifier="P1", first_name="Ada", last_name="", email="ada@bench.com", is_woman=True)
+    ghost = make_person("P9")
+    ada.knows = [ada, ghost]
+    ada.likes = [ghost]
+    return World(
+        universities=[first, second],
+        colleges=[college],
+        departments=[department, department],
+        courses=[course],
+        persons=[ada],
+    )
+
+
+def test_verifier_reports_every_problem():
+    with pytest.raises(RelationshipError) as exc:
+        WorldVerifier().verify(broken_world())
+    assert str(exc.value).split("\n") == [
+        "Duplicate University identifier: U1",
+        "Duplicate Department identifier: D1",
+        "College C1 has empty name",
+        "Course CRS1 has empty title",
+        "Person P1 has missing required fields",
+        "College C1 appears under multiple universities: U1 and U1",
+        "Duplicate course CRS1 under department D1",
+        "Course CRS1 appears under multiple departments: D1 and D1",
+        "Course CRS1 appears under multiple departments: D1 and D1",
+        "Duplicate course CRS1 under department D1",
+        "Course CRS1 appears under multiple departments: D1 and D1",
+        "Course CRS2 appears under multiple departments: D1 and D1",
+        "Course CRS2 under department D1 is not in world.courses",
+        "Course CRS2 under department D1 is not in world.courses",
+        "Person P1 has self in knows",
+        "Person P1 has knows that is not in world.persons: P9",
+        "Person P1 has likes that is not in world.persons: P9",
+    ]
+
+
+def test_parallel_verifier_reports_the_same_problems_in_order():
+    world = broken_world()
+    world.persons.append(make_person("P2"))
+    sequential = list(WorldVerifier().problems(world))
+    assert list(ParallelWorldVerifier(processes=2, shard_size=1).problems(world)) == sequential
+
+
+def verified_world() -> World:
+    course = Course(identifier="CRS1", title="Intro")
+    department = Department(identifier="D1", name="Physics", courses=[course])
+    college = College(identifier="C1", name="College", is_women_only=False, departments=[department])
+    world = World()
+    world.add_university(University(identifier="U1", name="U1", colleges=[college]))
+    world.add_person(make_person("P1", is_woman=True))
+    return world
+
+
+def test_incremental_verifier_checks_additions():
+    world = verified_world()
+    verifier = IncrementalWorldVerifier.for_world(world)
+    verifier.verify()
+    ada = world.persons[0]
+    bo = make_person("P2")
+    world.add_person(bo)
+    world.relate(ada, "knows", bo)
+    world.add_university(University(identifier="U2", name="U2"))
+    verifier.verify()
+
+    world.add_college(world.universities[1], world.colleges[0])
+    world.relate(bo, "likes", bo)
+    with pytest.raises(RelationshipError) as incremental:
+        verifier.verify()
+    with pytest.raises(RelationshipError) as full:
+        WorldVerifier().verify(world)
+    assert str(incremental.value).split("\n") == str(full.value).split("\n")
+
+
+def test_parallel_verifier_stops_its_workers_when_bounded():
+    world = verified_world()
+    for index in range(4):
+        world.add_person(Person(identifier=f"P{index + 2}", first_name="", last_name="L", email="e", is_woman=True))
+
+    with pytest.raises(RelationshipError) as exc:
+        ParallelWorldVerifier(processes=2, shard_size=1, fail_fast=True).verify(world)
+    assert exc.value.__traceback__ is not None
+    assert active_children() == []
+
+
+def test_incremental_verifier_yields_problem_records():
+    world = verified_world()
+    verifier = IncrementalWorldVerifier.for_world(world)
+    verifier.verify()
+    world.add_university(University(identifier="U1", name=""))
+
+    problems = list(verifier.changed_problems())
+    assert all(isinstance(problem, Problem) for problem in problems)
+    assert [problem.kind for problem in problems] == [ProblemKind.DUPLICATE_IDENTIFIER, ProblemKind.EMPTY_FIELD]
+
+
+def test_verifier_bounds_and_streams_problems():
+    with pytest.raises(RelationshipError) as exc:
+        WorldVerifier(fail_fast=True).verify(broken_world())
+    assert str(exc.value).split("\n") == ["Duplicate University identifier: U1", "Stopped after 1 problems"]
+
+    with pytest.raises(RelationshipError) as exc:
+        WorldVerifier().verify(broken_world())
+    full_report = str(exc.value).split("\n")
+    for limit in range(1, len(full_report)):
+        for verifier in (WorldVerifier(max_problems=limit), ParallelWorldVerifier(processes=2, max_problems=limit)):
+            with pytest.raises(RelationshipError) as exc:
+                verifier.verify(broken_world())
+            assert str(exc.value).split("\n") == full_report[:limit] + [f"Stopped after {limit} problems"]
+
+    self_references = [
+        problem
+        for problem in WorldVerifier().problems(broken_world())
+        if problem.kind is ProblemKind.SELF_REFERENCE
+    ]
+    assert [(problem.entity, problem.relation) for problem in self_references] == [("P1", "knows")]
+
+
+def test_sampled_verifier_bounds_the_violation_rate():
+    world = World(persons=make_persons(1000))
+    for index, person in enumerate(world.persons):
+        person.knows = [world.persons[(index + 1) % 1000]]
+    report = SampledWorldVerifier(sample_size=200, seed=3).verify(world)
+    assert (report.sample_size, report.edges, report.violations) == (200, 200, 0)
+    assert 0 < report.upper_bound < 0.02
+
+    for person in world.persons[::10]:
+        person.likes = [person]
+    with pytest.raises(RelationshipError) as exc:
+        SampledWorldVerifier(sample_size=200, seed=3).verify(world)
+    report = SampledWorldVerifier(sample_size=200, seed=3).sample(world)
+    assert report.violation_rate <= 0.1 <= report.upper_bound
+    assert "Sampled 200 persons" in str(exc.value)
+
+
+def test_wilson_upper_bound_is_one_sided():
+    z = 1.6448536269514722
+    assert wilson_upper_bound(0, 200, 0.95) == pytest.approx(z * z / (200 + z * z))